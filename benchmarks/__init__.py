@@ -0,0 +1 @@
+"""Benchmark suite for the stimpool package."""
@@ -0,0 +1,69 @@
+"""Fixtures of the benchmark suite.
+
+Benchmarks run on the words of the default pool (55k words) and, when
+requested with ``--pool-sizes``, on synthetic pools created by repeating them
+(e.g., ``--pool-sizes 55k,1M,10M``). The words are passed as a list, so pools
+are created from a user-supplied list of every size.
+"""
+
+from itertools import islice
+from typing import Any, List
+
+import pytest
+from _pytest.config.argparsing import Parser
+
+from stimpool.compiled import load_default_pool
+
+SIZES = {"55k": None, "1M": 1_000_000, "10M": 10_000_000}
+
+
+def pytest_addoption(parser: Parser) -> None:
+    """Add the option that sets the pool sizes."""
+
+    parser.addoption(
+        "--pool-sizes",
+        default="55k",
+        help=f"Comma separated pool sizes to benchmark: {', '.join(SIZES)}",
+    )
+
+
+def pytest_generate_tests(metafunc: Any) -> None:
+    """Parametrize the benchmarks that use a pool size."""
+
+    if "pool_size" in metafunc.fixturenames:
+        sizes = metafunc.config.getoption("pool_sizes").split(",")
+        for size in sizes:
+            if size not in SIZES:
+                raise pytest.UsageError(f"Pool sizes must be one of {list(SIZES)}")
+        metafunc.parametrize("pool_size", sizes, scope="session")
+
+
+def get_synthetic_pool(size: int) -> List[str]:
+    """Create a pool of the size by repeating the words of the default pool.
+
+    The words keep their conjugation suffixes, so they also have to be
+    cleaned.
+    """
+
+    words = load_default_pool().original.to_list()
+    n_repeats = -(-size // len(words))
+
+    return list(islice(words * n_repeats, size))
+
+
+@pytest.fixture(scope="session")
+def words(pool_size: str) -> List[str]:
+    """Words of the pool, with their conjugation suffixes."""
+
+    size = SIZES[pool_size]
+    if size is None:
+        return load_default_pool().original.to_list()
+
+    return get_synthetic_pool(size)
+
+
+@pytest.fixture
+def rounds(pool_size: str) -> int:
+    """Number of rounds of each benchmark, fewer for larger pools."""
+
+    return {"55k": 5, "1M": 3, "10M": 1}[pool_size]
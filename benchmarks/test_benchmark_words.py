@@ -0,0 +1,197 @@
+"""Benchmarks for `words` module.
+
+Run them with ``inv benchmarks`` or ``pytest benchmarks``. Results are saved
+by pytest-benchmark (``--benchmark-autosave``) and can be compared with
+previous runs (``--benchmark-compare``).
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from stimpool import WordPool
+from stimpool.cache import ResultCache
+
+SELECTIONS: List[Tuple[str, Dict[str, Any]]] = [
+    ("select_words_of_length", {"min_len": 4, "max_len": 6}),
+    ("select_words_without_accented_characters", {}),
+    ("select_words_of_syllables", {"max_syl": 2}),
+    ("select_words_of_neighbors", {"min_neighbors": 2}),
+    ("select_words_with_synonyms", {"min_synonyms": 1}),
+    ("select_words_not_synonyms_of", {"targets": ["perro", "casa", "rápido"]}),
+    ("select_words_dissimilar_to", {"targets": ["perro", "casa"], "min_distance": 3}),
+    ("select_words_starting_with", {"prefix": "des"}),
+    ("select_words_ending_with", {"suffix": "ción"}),
+    ("select_words_containing", {"substring": "rr"}),
+    ("select_words_matching", {"pattern": "^[aeiou].*s$"}),
+]
+
+
+def test_default_construction(benchmark: Any) -> None:
+    """Benchmark creating the default word pool."""
+
+    word_pool = benchmark(WordPool)
+
+    assert len(word_pool.words) > 0
+
+
+@pytest.mark.parametrize("compact", [False, True], ids=["objects", "compact"])
+def test_construction(
+    benchmark: Any, words: List[str], rounds: int, compact: bool
+) -> None:
+    """Benchmark creating a word pool from a list of words."""
+
+    word_pool = benchmark.pedantic(
+        WordPool, args=(words,), kwargs={"compact": compact}, rounds=rounds
+    )
+
+    assert len(word_pool.words) > 0
+
+
+def test_clean_conjugation_suffixes(
+    benchmark: Any, words: List[str], rounds: int
+) -> None:
+    """Benchmark removing the conjugation suffixes of the words."""
+
+    word_pool = WordPool(words, clean_conjugation_suffix=False)
+    pool = word_pool.words
+
+    pool_clean = benchmark.pedantic(
+        word_pool._clean_conjugation_suffixes, args=(pool,), rounds=rounds
+    )
+
+    assert len(pool_clean) == len(pool)
+
+
+@pytest.mark.parametrize("compact", [False, True], ids=["objects", "compact"])
+@pytest.mark.parametrize(
+    ("method", "kwargs"), SELECTIONS, ids=[method for method, _ in SELECTIONS]
+)
+def test_select(
+    benchmark: Any,
+    words: List[str],
+    rounds: int,
+    method: str,
+    kwargs: Dict[str, Any],
+    compact: bool,
+) -> None:
+    """Benchmark each selection method on a new word pool."""
+
+    def setup() -> Tuple[tuple, dict]:
+        return (WordPool(words, compact=compact),), {}
+
+    def select(word_pool: WordPool) -> WordPool:
+        getattr(word_pool, method)(**kwargs)
+        return word_pool
+
+    benchmark.pedantic(select, setup=setup, rounds=rounds)
+
+
+def test_select_cached(
+    benchmark: Any, words: List[str], rounds: int, tmp_path: Path
+) -> None:
+    """Benchmark rebuilding a subpool whose selections are in the result cache."""
+
+    cache = ResultCache(tmp_path)
+
+    def setup() -> Tuple[tuple, dict]:
+        return (WordPool(words, cache=cache),), {}
+
+    def select(word_pool: WordPool) -> WordPool:
+        for method, kwargs in SELECTIONS[:5]:
+            getattr(word_pool, method)(**kwargs)
+        return word_pool
+
+    select(*setup()[0])
+    benchmark.pedantic(select, setup=setup, rounds=rounds)
+
+    assert cache.misses == 5
+
+
+def test_add_words(benchmark: Any, words: List[str], rounds: int) -> None:
+    """Benchmark adding words to a pool, which updates its indexes."""
+
+    words_added = [f"{word}x" for word in WordPool(words).words.tolist()[:1000]]
+
+    def setup() -> Tuple[tuple, dict]:
+        word_pool = WordPool(words)
+        word_pool.select_words_of_length(4, 6)
+        return (word_pool,), {}
+
+    def add(word_pool: WordPool) -> WordPool:
+        word_pool.add_words(words_added)
+        word_pool.select_words_starting_with("des")
+        return word_pool
+
+    benchmark.pedantic(add, setup=setup, rounds=rounds)
+
+
+def test_sample_pool(benchmark: Any, words: List[str], rounds: int) -> None:
+    """Benchmark sampling from the word pool."""
+
+    def setup() -> Tuple[tuple, dict]:
+        return (WordPool(words),), {}
+
+    def sample(word_pool: WordPool) -> None:
+        word_pool.sample_pool(1000)
+
+    benchmark.pedantic(sample, setup=setup, rounds=rounds)
+
+
+def test_sample_stratified(benchmark: Any, words: List[str], rounds: int) -> None:
+    """Benchmark a sample balanced across length bins and accented words."""
+
+    def setup() -> Tuple[tuple, dict]:
+        return (WordPool(words),), {}
+
+    def sample(word_pool: WordPool) -> None:
+        word_pool.sample_stratified(
+            1000, by=["length", "accented"], bins={"length": [4, 7, 10]}
+        )
+
+    benchmark.pedantic(sample, setup=setup, rounds=rounds)
+
+
+def test_match_lists(benchmark: Any, words: List[str], rounds: int) -> None:
+    """Benchmark matching 4 lists of 250 words on length and syllables."""
+
+    word_pool = WordPool(words)
+
+    matched = benchmark.pedantic(
+        word_pool.match_lists, args=(4, 250), kwargs={"time_budget": 5}, rounds=rounds
+    )
+
+    assert all(len(words) == 250 for words in matched.lists)
+
+
+@pytest.mark.parametrize("overlap", [True, False], ids=["independent", "disjoint"])
+def test_draw_samples(
+    benchmark: Any, words: List[str], rounds: int, overlap: bool
+) -> None:
+    """Benchmark drawing 1000 samples (e.g., one list per participant)."""
+
+    word_pool = WordPool(words)
+
+    samples = benchmark.pedantic(
+        word_pool.draw_samples,
+        args=(20, 1000),
+        kwargs={"overlap": overlap},
+        rounds=rounds,
+    )
+
+    assert len(samples) == 1000
+
+
+@pytest.mark.parametrize("file_format", ["csv", "csv.gz", "jsonl"])
+def test_save_pool(
+    benchmark: Any, words: List[str], rounds: int, file_format: str, tmp_path: Path
+) -> None:
+    """Benchmark saving the word pool."""
+
+    word_pool = WordPool(words)
+    filename = str(tmp_path / "word pool")
+
+    benchmark.pedantic(word_pool.save_pool, args=(filename, file_format), rounds=rounds)
+
+    assert (tmp_path / f"word pool.{file_format}").exists()
@@ -58,6 +58,15 @@ def tests(session: Session) -> None:
             session.notify("coverage")
 
 
+@nox.session
+def benchmarks(session: Session) -> None:
+    """Run the benchmarks."""
+    args = session.posargs or ["--sizes=55k"]
+    session.install(".")
+    install_with_constraints(session, "invoke", "pytest", "pytest-benchmark")
+    session.run("inv", "benchmarks", *args)
+
+
 @nox.session
 def coverage(session: Session) -> None:
     """Produce the coverage report."""
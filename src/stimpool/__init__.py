@@ -1,7 +1,28 @@
-"""Top-level package for stimpool."""
+"""Top-level package for stimpool.
 
-from .words import WordPool  # noqa: F401
+:class:`~stimpool.words.WordPool` is imported when it is first accessed, so
+importing stimpool (e.g., to get its version) doesn't load NumPy.
+"""
+
+import sys
+from typing import Any
 
 __author__ = """Mario E. Bermonti Pérez"""
 __email__ = "mbermonti1132@gmail.com"
 __version__ = "0.2.4"
+__all__ = ["WordPool"]
+
+if sys.version_info >= (3, 7):
+
+    def __getattr__(name: str) -> Any:
+        """Import WordPool when it is first accessed (PEP 562)."""
+
+        if name == "WordPool":
+            from .words import WordPool
+
+            return WordPool
+
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+else:  # pragma: no cover
+    from .words import WordPool  # noqa: F401
@@ -0,0 +1,418 @@
+"""Expand hunspell dictionaries into every inflected form of their words.
+
+The entries of a hunspell dictionary (e.g., ``es_PR.dic``) are stems followed
+by the flags of the affix rules that apply to them. The rules are defined in
+the affix file (e.g., ``es_PR.aff``). :class:`AffixRules` compiles the rules
+once, indexed by flag, and generates the forms of each entry.
+:func:`expand_dictionary` streams the forms of a whole dictionary, optionally
+using several worker processes.
+"""
+
+import multiprocessing
+import re
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import (
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+)
+
+ROOT_DIR = Path(__file__).resolve().parent
+DEFAULT_AFFIX_PATH = ROOT_DIR / "words" / "es_PR.aff"
+DEFAULT_DICTIONARY_PATH = ROOT_DIR / "words" / "es_PR.dic"
+
+PATTERN_CONDITION_TOKEN = re.compile(r"\[[^\]]*\]|.")
+
+_WORKER_RULES: Optional["AffixRules"] = None
+
+
+class Condition(NamedTuple):
+    """Compiled hunspell affix condition.
+
+    Attributes
+    ----------
+    pattern : Pattern
+        Pattern that matches the characters checked by the condition
+    length : int
+        Number of characters checked by the condition
+    last_characters : str
+        Characters accepted by the last position of the condition (None if
+        any character is accepted)
+    """
+
+    pattern: Pattern
+    length: int
+    last_characters: Optional[str]
+
+
+class AffixRule(NamedTuple):
+    """Hunspell prefix or suffix rule.
+
+    Attributes
+    ----------
+    kind : str
+        "PFX" for prefixes or "SFX" for suffixes
+    flag : str
+        Flag that identifies the words the rule applies to
+    strip : str
+        Characters removed from the word
+    add : str
+        Characters added to the word
+    continuation : str
+        Flags of rules that also apply to the affixed word
+    condition : Condition
+        Compiled condition the word has to meet
+    cross_product : bool
+        Specifies if the rule can be combined with affixes of the other kind
+    """
+
+    kind: str
+    flag: str
+    strip: str
+    add: str
+    continuation: str
+    condition: Condition
+    cross_product: bool
+
+    def apply(self, word: str) -> Optional[str]:
+        """Apply the rule to a word.
+
+        Parameters
+        ----------
+        word : str
+            word to be affixed
+
+        Returns
+        -------
+        str
+            Affixed word or None if the rule doesn't apply to the word.
+        """
+
+        pattern, length, _ = self.condition
+        if len(word) < length or len(word) <= len(self.strip):
+            return None
+
+        if self.kind == "SFX":
+            start = len(word) - length
+            if not word.endswith(self.strip) or not pattern.match(word, start):
+                return None
+            return word[: len(word) - len(self.strip)] + self.add
+
+        if not word.startswith(self.strip) or not pattern.match(word):
+            return None
+        return self.add + word[len(self.strip) :]
+
+
+def compile_condition(condition: str) -> Condition:
+    """Compile a hunspell affix condition.
+
+    Conditions are sequences of characters, character classes (e.g.,
+    ``[^aeiou]``) or ``.`` (any character).
+
+    Parameters
+    ----------
+    condition : str
+        hunspell condition
+
+    Returns
+    -------
+    Condition
+    """
+
+    if condition == ".":
+        return Condition(re.compile(""), 0, None)
+
+    tokens = PATTERN_CONDITION_TOKEN.findall(condition)
+    parts = []
+    last_characters: Optional[str] = None
+    for token in tokens:
+        if token.startswith("[^"):
+            parts.append(f"[^{re.escape(token[2:-1])}]")
+            last_characters = None
+        elif token.startswith("["):
+            parts.append(f"[{re.escape(token[1:-1])}]")
+            last_characters = token[1:-1]
+        elif token == ".":
+            parts.append(".")
+            last_characters = None
+        else:
+            parts.append(re.escape(token))
+            last_characters = token
+
+    return Condition(re.compile("".join(parts)), len(tokens), last_characters)
+
+
+class AffixRules(object):
+    """Affix rules of a hunspell affix file, indexed by flag."""
+
+    def __init__(self, rules: Iterable[AffixRule]) -> None:
+        """Create the affix rules.
+
+        Parameters
+        ----------
+        rules : Iterable[AffixRule]
+            prefix and suffix rules
+        """
+
+        self.prefixes: Dict[str, List[AffixRule]] = {}
+        # suffixes are indexed by flag and by the last character they accept,
+        # so only rules that could match the end of the word are tried
+        self._suffixes: Dict[str, Dict[str, List[AffixRule]]] = {}
+        self._suffixes_any: Dict[str, List[AffixRule]] = {}
+
+        for rule in rules:
+            if rule.kind == "PFX":
+                self.prefixes.setdefault(rule.flag, []).append(rule)
+                continue
+
+            if rule.strip:
+                last_characters: Optional[str] = rule.strip[-1]
+            else:
+                last_characters = rule.condition.last_characters
+            if last_characters is None:
+                self._suffixes_any.setdefault(rule.flag, []).append(rule)
+            else:
+                suffixes_flag = self._suffixes.setdefault(rule.flag, {})
+                for character in last_characters:
+                    suffixes_flag.setdefault(character, []).append(rule)
+
+    @classmethod
+    def from_file(cls, path: Path = DEFAULT_AFFIX_PATH) -> "AffixRules":
+        """Read and compile the rules of a hunspell affix file.
+
+        Parameters
+        ----------
+        path : Path
+            hunspell affix file (the default is es_PR.aff)
+
+        Returns
+        -------
+        AffixRules
+        """
+
+        content = Path(path).read_bytes()
+        match = re.search(rb"^SET\s+(\S+)", content, flags=re.MULTILINE)
+        encoding = match.group(1).decode("ascii") if match else "ISO8859-1"
+        lines = content.decode(encoding).splitlines()
+
+        cross_products: Dict[Tuple[str, str], bool] = {}
+        conditions: Dict[str, Condition] = {}
+        rules: List[AffixRule] = []
+        for line in lines:
+            fields = line.split()
+            if len(fields) < 4 or fields[0] not in ("PFX", "SFX"):
+                continue
+
+            kind, flag = fields[0], fields[1]
+            if len(fields) == 4:
+                # header of the rules of a flag
+                cross_products[(kind, flag)] = fields[2] == "Y"
+                continue
+
+            strip = "" if fields[2] == "0" else fields[2]
+            add, _, continuation = fields[3].partition("/")
+            add = "" if add == "0" else add
+            if fields[4] not in conditions:
+                conditions[fields[4]] = compile_condition(fields[4])
+
+            rule = AffixRule(
+                kind=kind,
+                flag=flag,
+                strip=strip,
+                add=add,
+                continuation=continuation,
+                condition=conditions[fields[4]],
+                cross_product=cross_products.get((kind, flag), False),
+            )
+            rules.append(rule)
+
+        return cls(rules)
+
+    def get_suffixes(self, flag: str, word: str) -> List[AffixRule]:
+        """Get the suffix rules of a flag that could apply to the word.
+
+        Parameters
+        ----------
+        flag : str
+            affix flag
+        word : str
+            word to be affixed
+
+        Returns
+        -------
+        List[AffixRule]
+        """
+
+        rules = self._suffixes_any.get(flag, [])
+        if word and flag in self._suffixes:
+            rules = rules + self._suffixes[flag].get(word[-1], [])
+
+        return rules
+
+    def expand(self, word: str, flags: str = "") -> Iterator[str]:
+        """Generate every form of a word.
+
+        The word itself is generated first, followed by its suffixed forms
+        (including those of continuation flags), its prefixed forms and the
+        combination of both for rules that allow cross products.
+
+        Parameters
+        ----------
+        word : str
+            stem
+        flags : str
+            affix flags of the stem
+
+        Yields
+        ------
+        str
+            Forms of the word.
+        """
+
+        yield word
+
+        suffixed: List[str] = []
+        for flag in flags:
+            for rule in self.get_suffixes(flag, word):
+                form = rule.apply(word)
+                if form is None:
+                    continue
+                yield form
+                if rule.cross_product:
+                    suffixed.append(form)
+                for flag_continuation in rule.continuation:
+                    for rule_continuation in self.get_suffixes(flag_continuation, form):
+                        form_continuation = rule_continuation.apply(form)
+                        if form_continuation is not None:
+                            yield form_continuation
+
+        for flag in flags:
+            for rule in self.prefixes.get(flag, []):
+                form = rule.apply(word)
+                if form is None:
+                    continue
+                yield form
+                if not rule.cross_product:
+                    continue
+                for form_suffixed in suffixed:
+                    form_combined = rule.apply(form_suffixed)
+                    if form_combined is not None:
+                        yield form_combined
+
+
+@lru_cache(maxsize=None)
+def load_affix_rules(path: Path = DEFAULT_AFFIX_PATH) -> AffixRules:
+    """Load the compiled rules of an affix file (once per process).
+
+    Parameters
+    ----------
+    path : Path
+        hunspell affix file (the default is es_PR.aff)
+
+    Returns
+    -------
+    AffixRules
+    """
+
+    return AffixRules.from_file(path)
+
+
+def read_dictionary(path: Path = DEFAULT_DICTIONARY_PATH) -> Iterator[Tuple[str, str]]:
+    """Read the entries of a hunspell dictionary one at a time.
+
+    Parameters
+    ----------
+    path : Path
+        hunspell dictionary. Its first line is the number of words.
+        (the default is es_PR.dic)
+
+    Yields
+    ------
+    Tuple[str, str]
+        Stem and its affix flags.
+    """
+
+    with open(path, encoding="utf-8") as file:
+        next(file, None)
+        for line in file:
+            entry = line.strip()
+            if not entry:
+                continue
+            word, _, flags = entry.partition("/")
+            yield word, flags
+
+
+def _init_worker(rules: AffixRules) -> None:
+    """Store the affix rules in a worker process."""
+
+    global _WORKER_RULES
+    _WORKER_RULES = rules
+
+
+def _expand_entries(entries: List[Tuple[str, str]]) -> List[str]:
+    """Expand a chunk of dictionary entries in a worker process."""
+
+    rules: AffixRules = _WORKER_RULES  # type: ignore
+
+    return [form for word, flags in entries for form in rules.expand(word, flags)]
+
+
+def expand_dictionary(
+    path: Path = DEFAULT_DICTIONARY_PATH,
+    rules: Optional[AffixRules] = None,
+    processes: Optional[int] = None,
+    chunksize: int = 2000,
+) -> Iterator[str]:
+    """Generate every form of every word in a hunspell dictionary.
+
+    The forms are streamed in dictionary order and are not deduplicated.
+    When several processes are used, only a few chunks of entries are
+    expanded ahead of the consumer, so memory use stays bounded.
+
+    Parameters
+    ----------
+    path : Path
+        hunspell dictionary (the default is es_PR.dic)
+    rules : AffixRules
+        affix rules (the default is None, use the rules of es_PR.aff)
+    processes : int
+        Number of worker processes (the default is None, expand in the
+        current process)
+    chunksize : int
+        Number of entries sent to a worker at once (Default=2000)
+
+    Yields
+    ------
+    str
+        Forms of the words.
+    """
+
+    if rules is None:
+        rules = load_affix_rules()
+    entries = read_dictionary(path)
+
+    if processes is None or processes <= 1:
+        for word, flags in entries:
+            yield from rules.expand(word, flags)
+        return
+
+    with multiprocessing.Pool(processes, _init_worker, (rules,)) as pool:
+        pending: Deque = deque()
+        while True:
+            while len(pending) < 2 * processes:
+                chunk = list(islice(entries, chunksize))
+                if not chunk:
+                    break
+                pending.append(pool.apply_async(_expand_entries, (chunk,)))
+            if not pending:
+                break
+            yield from pending.popleft().get()
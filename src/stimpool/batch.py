@@ -0,0 +1,262 @@
+"""Create many subpools in a single run.
+
+Each subpool is described by a :class:`SubpoolSpec` (the selections to apply
+and the sample size). :func:`create_subpools` evaluates every distinct
+selection once over the shared base pool, caches the resulting masks and
+derives each subpool by combining the masks of its selections, so the cost of
+filtering doesn't grow with the number of subpools. The masks can also be
+stored in a :class:`~stimpool.cache.ResultCache`, so later runs with the same
+pool and selections only read them.
+"""
+
+import multiprocessing
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+import pandas as pd
+
+from .cache import ResultCache
+from .plan import Criterion, QueryPlan
+from .sampling import draw_samples
+from .words import WordPool
+
+_WORKER_POOL: Optional[WordPool] = None
+
+
+class SubpoolSpec(NamedTuple):
+    """Description of a subpool.
+
+    Attributes
+    ----------
+    name : str
+        Name of the subpool
+    criteria : Sequence[Tuple[str, Dict[str, Any]]]
+        Selections to apply, as the name of a WordPool selection method (e.g.,
+        "select_words_of_length") and its key-word args
+    n : int
+        Sample size (the default is None, keep all the selected words)
+    seed : int
+        Seed used for sampling, like the seed of WordPool.sample_pool
+        (Default=1). None gives a different sample every run.
+    """
+
+    name: str
+    criteria: Sequence[Tuple[str, Dict[str, Any]]] = ()
+    n: Optional[int] = None
+    seed: Optional[int] = 1
+
+
+def get_criterion(
+    word_pool: WordPool, method: str, kwargs: Dict[str, Any]
+) -> Criterion:
+    """Get the criterion recorded by a WordPool selection method.
+
+    Parameters
+    ----------
+    word_pool : WordPool
+        lazy word pool the criterion will be evaluated on
+    method : str
+        name of the selection method (e.g., "select_words_of_length")
+    kwargs : Dict[str, Any]
+        key-word args of the selection method
+
+    Returns
+    -------
+    Criterion
+
+    Raises
+    ------
+    ValueError
+        If method is not a WordPool selection method.
+    """
+
+    if not method.startswith("select_") or not hasattr(WordPool, method):
+        raise ValueError(f"{method!r} is not a WordPool selection method")
+
+    getattr(word_pool, method)(**(kwargs or {}))
+    criterion = word_pool._plan.criteria[-1]
+    word_pool._plan.clear()
+
+    return criterion
+
+
+def _evaluate_mask(
+    word_pool: WordPool, method: str, kwargs: Dict[str, Any]
+) -> np.ndarray:
+    """Flag the words of the base pool that meet a selection."""
+
+    plan = QueryPlan()
+    plan.add(get_criterion(word_pool, method, kwargs))
+    flags, _ = plan.evaluate(
+        word_pool._words_view, word_pool._n_base, positions_base=word_pool._positions
+    )
+
+    return flags
+
+
+def _init_worker(pool: Optional[List[str]], clean_conjugation_suffix: bool) -> None:
+    """Create the base word pool in a worker process."""
+
+    global _WORKER_POOL
+    _WORKER_POOL = WordPool(pool, clean_conjugation_suffix, lazy=True)
+
+
+def _evaluate_mask_worker(selection: Tuple[str, Dict[str, Any]]) -> np.ndarray:
+    """Flag the words of the base pool that meet a selection in a worker."""
+
+    method, kwargs = selection
+
+    return _evaluate_mask(_WORKER_POOL, method, kwargs)  # type: ignore
+
+
+def iter_subpools(
+    specs: Iterable[SubpoolSpec],
+    pool: Optional[Iterable] = None,
+    clean_conjugation_suffix: bool = True,
+    processes: Optional[int] = None,
+    cache: Optional[ResultCache] = None,
+) -> Iterator[Tuple[SubpoolSpec, pd.Series]]:
+    """Generate the subpools described by the specs from a shared base pool.
+
+    The distinct selections are evaluated before the first subpool is
+    generated; the subpools are then derived one at a time, so they can be
+    saved as they are generated.
+
+    Parameters
+    ----------
+    specs : Iterable[SubpoolSpec]
+        subpools to create
+    pool : Iterable
+        Word pool that will be used to create the subpools (the default is
+        None, use default word pool)
+    clean_conjugation_suffix : bool
+        Specifies if suffixes that are used to identify word conjugations
+        should be removed from the pool (Default=True)
+    processes : int
+        Number of worker processes used to evaluate the distinct selections
+        (the default is None, evaluate them in the current process)
+    cache : ResultCache
+        Stores the masks of the selections, which are only evaluated if they
+        are not stored yet (the default is None, no cache)
+
+    Yields
+    ------
+    Tuple[SubpoolSpec, pd.Series]
+        Spec and words of each subpool, in the order of the specs.
+
+    Raises
+    ------
+    ValueError
+        If two specs have the same name or a selection is not valid.
+    """
+
+    specs = list(specs)
+    names = [spec.name for spec in specs]
+    if len(set(names)) != len(names):
+        raise ValueError("The names of the subpools have to be unique")
+
+    if pool is not None:
+        pool = list(pool)
+    word_pool = WordPool(pool, clean_conjugation_suffix, lazy=True)
+
+    # every distinct selection is evaluated once, identified by its description
+    selections: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+    keys_specs: List[List[str]] = []
+    for spec in specs:
+        keys = []
+        for method, kwargs in spec.criteria:
+            key = get_criterion(word_pool, method, kwargs).describe()
+            selections.setdefault(key, (method, kwargs))
+            keys.append(key)
+        keys_specs.append(keys)
+
+    masks: Dict[str, np.ndarray] = {}
+    cache_keys: Dict[str, str] = {}
+    if cache is not None:
+        n_words = len(word_pool._positions)
+        for key, (method, kwargs) in selections.items():
+            criterion = get_criterion(word_pool, method, kwargs)
+            cache_keys[key] = word_pool._get_cache_key([criterion])
+            mask = cache.get(cache_keys[key], n_words)
+            if mask is not None:
+                masks[key] = mask
+    missing = {
+        key: selection for key, selection in selections.items() if key not in masks
+    }
+
+    if processes is None or processes <= 1 or len(missing) <= 1:
+        masks_list = [
+            _evaluate_mask(word_pool, method, kwargs)
+            for method, kwargs in missing.values()
+        ]
+    else:
+        initargs = (pool, clean_conjugation_suffix)
+        with multiprocessing.Pool(processes, _init_worker, initargs) as process_pool:
+            masks_list = process_pool.map(_evaluate_mask_worker, missing.values())
+    masks.update(zip(missing, masks_list))
+    if cache is not None:
+        for key, mask in zip(missing, masks_list):
+            cache.put(cache_keys[key], mask)
+
+    pool_base = word_pool.words
+    for spec, keys in zip(specs, keys_specs):
+        flags = np.ones(len(pool_base), dtype=bool)
+        for key in keys:
+            flags &= masks[key]
+        subpool = pool_base[flags]
+        if spec.n is not None:
+            sample = draw_samples(len(subpool), spec.n, seed=spec.seed)[0]
+            subpool = subpool.iloc[sample]
+        yield spec, subpool.rename(spec.name)
+
+
+def create_subpools(
+    specs: Iterable[SubpoolSpec],
+    pool: Optional[Iterable] = None,
+    clean_conjugation_suffix: bool = True,
+    processes: Optional[int] = None,
+    cache: Optional[ResultCache] = None,
+) -> Dict[str, pd.Series]:
+    """Create the subpools described by the specs from a shared base pool.
+
+    Parameters
+    ----------
+    specs : Iterable[SubpoolSpec]
+        subpools to create
+    pool : Iterable
+        Word pool that will be used to create the subpools (the default is
+        None, use default word pool)
+    clean_conjugation_suffix : bool
+        Specifies if suffixes that are used to identify word conjugations
+        should be removed from the pool (Default=True)
+    processes : int
+        Number of worker processes used to evaluate the distinct selections
+        (the default is None, evaluate them in the current process)
+    cache : ResultCache
+        Stores the masks of the selections, which are only evaluated if they
+        are not stored yet (the default is None, no cache)
+
+    Returns
+    -------
+    Dict[str, pd.Series]
+        Words of each subpool, by name, in the order of the specs.
+
+    Raises
+    ------
+    ValueError
+        If two specs have the same name or a selection is not valid.
+    """
+
+    subpools = iter_subpools(specs, pool, clean_conjugation_suffix, processes, cache)
+
+    return {spec.name: subpool for spec, subpool in subpools}
@@ -0,0 +1,224 @@
+"""Cache the results of selections on disk, shared between processes.
+
+A :class:`ResultCache` stores which words each selection kept, keyed by a
+hash of everything the result depends on: the content of the base pool,
+whether conjugation suffixes were removed, the words selected before (the
+chain of selections that produced them) and the selections with their
+arguments. Rebuilding the same subpool from the same inputs then reads the
+results instead of analyzing the words again.
+
+Each result is a packed bitmap over the words that were selected before, in
+its own .npy file. Files are written to a temporary file that is then renamed,
+so other processes never read a partially written result, and reading a
+result updates its modification time. When the cache grows beyond max_bytes,
+the least recently used results are removed.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+from .compiled import get_cache_dir
+from .features import pack_flags, unpack_flags
+
+# maximum size of the results stored in a cache (bytes)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# type of compiled patterns (re.Pattern doesn't exist in Python 3.6)
+_PATTERN_TYPE = type(re.compile(""))
+
+
+def _encode_argument(value: Any) -> Any:
+    """Convert an argument of a selection to a JSON value."""
+
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, _PATTERN_TYPE):
+        return {"pattern": value.pattern, "flags": value.flags}
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+
+    raise TypeError(f"Can't use {type(value).__name__} in a cache key")
+
+
+def get_key(*parts: Any) -> str:
+    """Get the key of a result from everything it depends on.
+
+    Parameters
+    ----------
+    *parts : Any
+        Values the result depends on (e.g., names and arguments of the
+        selections). They have to be JSON serializable, sets, compiled
+        patterns or NumPy arrays.
+
+    Returns
+    -------
+    str
+        Hex digest of the parts.
+    """
+
+    text = json.dumps(parts, default=_encode_argument, sort_keys=True)
+
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def hash_words(words: Iterable[str]) -> str:
+    """Get the sha256 hash of words separated by newlines.
+
+    It matches the hash of the buffer of a
+    :class:`~stimpool.compiled.StringColumn` with the same words.
+
+    Parameters
+    ----------
+    words : Iterable[str]
+
+    Returns
+    -------
+    str
+    """
+
+    digest = hashlib.sha256()
+    for word in words:
+        digest.update(f"{word}\n".encode("utf-8"))
+
+    return digest.hexdigest()
+
+
+class ResultCache(object):
+    """Results of selections stored on disk with LRU eviction."""
+
+    def __init__(
+        self, directory: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        """Create a result cache.
+
+        Parameters
+        ----------
+        directory : Path
+            Directory where the results are stored (the default is None, use
+            the results directory of :func:`~stimpool.compiled.get_cache_dir`)
+        max_bytes : int
+            Maximum size of the results stored (Default=256 MiB)
+        """
+
+        if directory is None:
+            directory = get_cache_dir() / "results"
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        """Get the file of a result."""
+
+        return self.directory / f"{key}.npy"
+
+    def get(self, key: str, n_words: int) -> Optional[np.ndarray]:
+        """Read a result.
+
+        Parameters
+        ----------
+        key : str
+            key of the result, from :func:`get_key`
+        n_words : int
+            Number of words the result was computed on
+
+        Returns
+        -------
+        np.ndarray
+            Flags of the words kept, or None if the result is not stored.
+        """
+
+        path = self._path(key)
+        try:
+            bitmap = np.load(path)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        if bitmap.dtype != np.uint8 or len(bitmap) != (n_words + 7) // 8:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+
+        return unpack_flags(bitmap, n_words)
+
+    def put(self, key: str, flags: np.ndarray) -> None:
+        """Store a result and evict the least recently used ones if needed.
+
+        Errors writing the result are ignored (e.g., the directory is not
+        writable), so the cache never makes a selection fail.
+
+        Parameters
+        ----------
+        key : str
+            key of the result, from :func:`get_key`
+        flags : np.ndarray
+            Flags of the words kept
+        """
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            descriptor, tmp_path = tempfile.mkstemp(
+                dir=self.directory, prefix=".tmp-", suffix=".npy"
+            )
+            try:
+                with os.fdopen(descriptor, "wb") as file:
+                    np.save(file, pack_flags(flags))
+                os.replace(tmp_path, self._path(key))
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            self.evict()
+        except OSError:
+            pass
+
+    def evict(self) -> None:
+        """Remove the least recently used results until they fit in max_bytes.
+
+        Results removed by other processes at the same time are skipped.
+        """
+
+        entries: Dict[Path, os.stat_result] = {}
+        for path in self.directory.glob("*.npy"):
+            if path.name.startswith(".tmp-"):
+                continue
+            try:
+                entries[path] = path.stat()
+            except OSError:
+                continue
+
+        size = sum(stat.st_size for stat in entries.values())
+        for path in sorted(entries, key=lambda path: entries[path].st_mtime_ns):
+            if size <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            size -= entries[path].st_size
+
+    def clear(self) -> None:
+        """Remove every result of the cache."""
+
+        for path in self.directory.glob("*.npy"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def __len__(self) -> int:
+        """Get the number of results stored."""
+
+        return sum(
+            not path.name.startswith(".tmp-") for path in self.directory.glob("*.npy")
+        )
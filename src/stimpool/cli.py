@@ -0,0 +1,276 @@
+"""Command line interface of stimpool.
+
+``stimpool build SPEC`` creates every pool described in a spec file (YAML,
+TOML or JSON) in a single process, so the default pool is loaded once and
+each distinct selection is evaluated once (see :mod:`stimpool.batch`). Each
+pool is saved as soon as it is created.
+
+Example spec (YAML)::
+
+    format: csv.gz
+    features: [length, syllables]
+    pools:
+      - name: short
+        n: 20
+        select:
+          - select_words_of_length: {min_len: 4, max_len: 6}
+          - select_words_without_accented_characters: {}
+      - name: long
+        select:
+          - select_words_of_length: {min_len: 10}
+
+Other keys: ``seed`` (per pool, Default=1), ``pool`` (text file with one word
+per line, relative to the spec, used instead of the default pool) and
+``clean_conjugation_suffix`` (Default=true).
+
+Word pools (and pandas) are only imported when a command runs, so ``--help``
+and ``--version`` are fast.
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+import click
+
+from . import __version__
+from .export import FEATURES, FORMATS
+
+if TYPE_CHECKING:
+    from .batch import SubpoolSpec
+
+
+def read_spec_file(path: Path) -> Dict[str, Any]:
+    """Read a spec file.
+
+    Parameters
+    ----------
+    path : Path
+        YAML (.yaml, .yml), TOML (.toml) or JSON (.json) file
+
+    Returns
+    -------
+    Dict[str, Any]
+
+    Raises
+    ------
+    ValueError
+        If the file type is not supported.
+    ImportError
+        If the parser of the file type is not installed.
+    """
+
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".json":
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+
+    if suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("YAML specs require pyyaml") from None
+        with open(path, encoding="utf-8") as file:
+            return yaml.safe_load(file)
+
+    if suffix == ".toml":
+        if sys.version_info >= (3, 11):
+            import tomllib
+        else:
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ImportError("TOML specs require tomli") from None
+        with open(path, "rb") as file:
+            return tomllib.load(file)
+
+    raise ValueError(f"Spec files must be YAML, TOML or JSON, not {suffix!r}")
+
+
+def parse_specs(spec: Dict[str, Any]) -> List["SubpoolSpec"]:
+    """Get the subpool specs of a spec file.
+
+    Parameters
+    ----------
+    spec : Dict[str, Any]
+        contents of the spec file
+
+    Returns
+    -------
+    List[SubpoolSpec]
+
+    Raises
+    ------
+    ValueError
+        If the spec is not valid.
+    """
+
+    from .batch import SubpoolSpec
+
+    pools = spec.get("pools") if isinstance(spec, dict) else None
+    if not isinstance(pools, list) or not pools:
+        raise ValueError("The spec must have a list of pools")
+
+    specs = []
+    for i, pool in enumerate(pools):
+        if not isinstance(pool, dict) or "name" not in pool:
+            raise ValueError(f"Pool {i} must be a mapping with a name")
+
+        criteria = []
+        for selection in pool.get("select") or []:
+            if isinstance(selection, str):
+                selection = {selection: {}}
+            if not isinstance(selection, dict) or len(selection) != 1:
+                raise ValueError(
+                    f"The selections of {pool['name']!r} must be a method name or "
+                    "a mapping of a method name to its arguments"
+                )
+            method, kwargs = next(iter(selection.items()))
+            criteria.append((method, kwargs or {}))
+
+        specs.append(
+            SubpoolSpec(
+                name=str(pool["name"]),
+                criteria=criteria,
+                n=pool.get("n"),
+                seed=pool.get("seed", 1),
+            )
+        )
+
+    return specs
+
+
+def build(
+    spec_path: Path,
+    output_dir: Path,
+    file_format: Optional[str] = None,
+    features: Optional[Sequence[str]] = None,
+    jobs: int = 1,
+    cache: bool = False,
+) -> List[Path]:
+    """Create and save every pool of a spec file.
+
+    Parameters
+    ----------
+    spec_path : Path
+        YAML, TOML or JSON spec file
+    output_dir : Path
+        directory where the pools are saved
+    file_format : str
+        export format, which overrides the one of the spec (the default is
+        None, use the spec format or csv)
+    features : Sequence[str]
+        feature columns, which override those of the spec (the default is
+        None, use the spec features)
+    jobs : int
+        Number of processes used to evaluate the selections (Default=1)
+    cache : bool
+        Specifies if the results of the selections should be stored in the
+        result cache and read from it in later builds (Default=False)
+
+    Returns
+    -------
+    List[Path]
+        Files of the pools, in the order of the spec.
+    """
+
+    from .batch import iter_subpools
+    from .cache import ResultCache
+    from .export import write_pool
+
+    spec = read_spec_file(spec_path)
+    specs = parse_specs(spec)
+    file_format = file_format or spec.get("format", "csv")
+    if features is None:
+        features = spec.get("features", [])
+
+    pool = None
+    if spec.get("pool"):
+        pool_path = Path(spec_path).parent / spec["pool"]
+        with open(pool_path, encoding="utf-8") as file:
+            pool = [line for line in file if line.strip()]
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    subpools = iter_subpools(
+        specs,
+        pool,
+        clean_conjugation_suffix=spec.get("clean_conjugation_suffix", True),
+        processes=jobs,
+        cache=ResultCache() if cache else None,
+    )
+    paths = []
+    for subpool_spec, subpool in subpools:
+        path = output_dir / f"{subpool_spec.name}.{file_format}"
+        write_pool(subpool, path, file_format, features)
+        click.echo(f"{subpool_spec.name}: {len(subpool)} words -> {path}")
+        paths.append(path)
+
+    return paths
+
+
+@click.group()
+@click.version_option(__version__)
+def main() -> None:
+    """Create stimuli pools for psychological research."""
+
+
+@main.command("build")
+@click.argument("spec", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "-o",
+    "--output-dir",
+    type=click.Path(file_okay=False),
+    default=".",
+    show_default=True,
+    help="Directory where the pools are saved.",
+)
+@click.option(
+    "-f",
+    "--format",
+    "file_format",
+    type=click.Choice(FORMATS),
+    default=None,
+    help="Export format (overrides the spec; csv by default).",
+)
+@click.option(
+    "--feature",
+    "features",
+    type=click.Choice(FEATURES),
+    multiple=True,
+    help="Feature column to save with the words (overrides the spec).",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of processes used to evaluate the selections.",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=False,
+    show_default=True,
+    help="Reuse the results of selections from previous builds.",
+)
+def build_command(
+    spec: str,
+    output_dir: str,
+    file_format: Optional[str],
+    features: Sequence[str],
+    jobs: int,
+    cache: bool,
+) -> None:
+    """Create every pool described in SPEC (YAML, TOML or JSON)."""
+
+    try:
+        build(Path(spec), Path(output_dir), file_format, features or None, jobs, cache)
+    except (ValueError, ImportError) as error:
+        raise click.ClickException(str(error))
+
+
+if __name__ == "__main__":
+    main()  # pragma: no cover
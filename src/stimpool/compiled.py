@@ -0,0 +1,549 @@
+"""Compile the default word pool into a memory-mappable binary cache.
+
+Parsing ``es_PR.dic`` and normalizing each of its words is the most expensive
+part of creating a default :class:`~stimpool.words.WordPool`. The compiled
+pool is built once, stored in the user cache directory and validated against
+the hash of the source dictionary, the hash of the hyphenation patterns used
+to count syllables and the version of stimpool that compiled it, so later
+loads only memory-map a few arrays.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import __version__
+from .features import FeatureIndex
+from .hyphenation import DEFAULT_PATTERNS_PATH
+from .prefixes import PrefixIndex
+from .similarity import BKTree
+from .vectorized import normalize_words, remove_conjugation_suffixes, to_object_array
+
+ROOT_DIR = Path(__file__).resolve().parent
+DEFAULT_POOL_PATH = ROOT_DIR / "words" / "es_PR.dic"
+FORMAT_VERSION = 5
+# number of words decoded at once by StringColumn.take; bounds its memory use
+TAKE_CHUNK_SIZE = 1 << 16
+
+_COLUMNS = ("original", "cleaned", "affix_flags")
+_LOADED: Dict[Tuple[str, str, int, int], "CompiledPool"] = {}
+
+
+def get_cache_dir() -> Path:
+    """Get the directory where stimpool stores compiled data.
+
+    The directory can be set using the ``STIMPOOL_CACHE_DIR`` environment
+    variable. Otherwise ``$XDG_CACHE_HOME/stimpool`` (or ``~/.cache/stimpool``)
+    is used.
+
+    Returns
+    -------
+    cache_dir : Path
+    """
+
+    cache_dir = os.environ.get("STIMPOOL_CACHE_DIR")
+    if cache_dir:
+        return Path(cache_dir)
+
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+
+    return Path(cache_home) / "stimpool"
+
+
+def hash_file(path: Path) -> str:
+    """Get the sha256 hash of a file.
+
+    Parameters
+    ----------
+    path : Path
+        File to hash
+
+    Returns
+    -------
+    str
+        Hex digest of the file contents.
+    """
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+class StringColumn(object):
+    """Words stored in a contiguous UTF-8 buffer with offsets.
+
+    Word ``i`` is stored in ``buffer[offsets[i]:offsets[i + 1] - 1]``. The byte
+    that is left out is a newline separator, which allows decoding the whole
+    column at once.
+    """
+
+    def __init__(self, buffer: np.ndarray, offsets: np.ndarray) -> None:
+        """Create a string column.
+
+        Parameters
+        ----------
+        buffer : np.ndarray
+            Newline separated UTF-8 encoded words (uint8)
+        offsets : np.ndarray
+            Start of each word in the buffer followed by the buffer size (int64)
+        """
+
+        self.buffer = buffer
+        self.offsets = offsets
+
+    @classmethod
+    def from_words(cls, words: Iterable[str]) -> "StringColumn":
+        """Create a string column from words.
+
+        Parameters
+        ----------
+        words : Iterable[str]
+            Words to store. They must not contain newlines.
+
+        Returns
+        -------
+        StringColumn
+        """
+
+        encoded = [f"{word}\n".encode("utf-8") for word in words]
+        sizes = np.fromiter((len(word) for word in encoded), np.int64, len(encoded))
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+        buffer = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+        return cls(buffer, offsets)
+
+    @classmethod
+    def load(cls, directory: Path, name: str) -> "StringColumn":
+        """Memory-map a string column saved with :meth:`save`.
+
+        Parameters
+        ----------
+        directory : Path
+            Directory where the column was saved
+        name : str
+            Name of the column
+
+        Returns
+        -------
+        StringColumn
+        """
+
+        buffer = np.load(directory / f"{name}.buffer.npy", mmap_mode="r")
+        offsets = np.load(directory / f"{name}.offsets.npy", mmap_mode="r")
+
+        return cls(buffer, offsets)
+
+    def save(self, directory: Path, name: str) -> None:
+        """Save the column as .npy files that can be memory-mapped.
+
+        Parameters
+        ----------
+        directory : Path
+            Directory where the column will be saved
+        name : str
+            Name of the column
+        """
+
+        np.save(directory / f"{name}.buffer.npy", self.buffer)
+        np.save(directory / f"{name}.offsets.npy", self.offsets)
+
+    def __len__(self) -> int:
+        """Get the number of words in the column."""
+
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        """Decode a single word without touching the rest of the buffer."""
+
+        start, stop = self.offsets[i], self.offsets[i + 1] - 1
+
+        return bytes(self.buffer[start:stop]).decode("utf-8")
+
+    def take(self, positions: np.ndarray) -> np.ndarray:
+        """Decode the words at the positions.
+
+        The bytes of the words are gathered and decoded TAKE_CHUNK_SIZE words
+        at a time, so the rest of the buffer is not touched.
+
+        Parameters
+        ----------
+        positions : np.ndarray
+            positions of the words in the column
+
+        Returns
+        -------
+        np.ndarray
+            Words (object dtype)
+        """
+
+        positions = np.asarray(positions, dtype=np.int64)
+        words: List[str] = []
+        for start in range(0, len(positions), TAKE_CHUNK_SIZE):
+            chunk = positions[start : start + TAKE_CHUNK_SIZE]
+            starts = self.offsets[chunk]
+            sizes = self.offsets[chunk + 1] - starts
+            stops = np.cumsum(sizes)
+            # position in the buffer of every byte of the words, newlines included
+            gather = np.arange(stops[-1]) + np.repeat(starts - stops + sizes, sizes)
+            text = self.buffer[gather].tobytes()[:-1].decode("utf-8")
+            words.extend(text.split("\n"))
+
+        return to_object_array(words)
+
+    def subset(self, positions: np.ndarray) -> "StringColumn":
+        """Create a column with the words at the positions, without decoding them.
+
+        Parameters
+        ----------
+        positions : np.ndarray
+            positions of the words in the column
+
+        Returns
+        -------
+        StringColumn
+        """
+
+        positions = np.asarray(positions, dtype=np.int64)
+        starts = self.offsets[positions]
+        sizes = self.offsets[positions + 1] - starts
+        offsets = np.zeros(len(positions) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+        gather = np.arange(offsets[-1]) + np.repeat(starts - offsets[:-1], sizes)
+
+        return StringColumn(np.asarray(self.buffer)[gather], offsets)
+
+    @classmethod
+    def concatenate(cls, columns: Sequence["StringColumn"]) -> "StringColumn":
+        """Create a column with the words of several columns, in order.
+
+        Parameters
+        ----------
+        columns : Sequence[StringColumn]
+
+        Returns
+        -------
+        StringColumn
+        """
+
+        buffer = np.concatenate([np.asarray(column.buffer) for column in columns])
+        sizes = [np.diff(column.offsets) for column in columns]
+        offsets = np.zeros(sum(map(len, sizes)) + 1, dtype=np.int64)
+        np.cumsum(np.concatenate(sizes), out=offsets[1:])
+
+        return cls(buffer.astype(np.uint8), offsets)
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes used by the buffer and the offsets."""
+
+        return int(self.buffer.nbytes + self.offsets.nbytes)
+
+    def to_list(self) -> List[str]:
+        """Decode all the words in the column.
+
+        Returns
+        -------
+        words : List[str]
+        """
+
+        if len(self) == 0:
+            return []
+
+        text = bytes(self.buffer[:-1]).decode("utf-8")
+
+        return text.split("\n")
+
+
+class StringColumnView(object):
+    """Words of a string column at some positions, decoded when taken."""
+
+    def __init__(self, column: StringColumn, positions: np.ndarray) -> None:
+        """Create a view of a string column.
+
+        Parameters
+        ----------
+        column : StringColumn
+            column with the words
+        positions : np.ndarray
+            positions of the words of the view in the column
+        """
+
+        self.column = column
+        self.positions = positions
+
+    def __len__(self) -> int:
+        """Get the number of words in the view."""
+
+        return len(self.positions)
+
+    def take(self, positions: np.ndarray) -> np.ndarray:
+        """Decode the words at the positions of the view.
+
+        Parameters
+        ----------
+        positions : np.ndarray
+            positions of the words in the view
+
+        Returns
+        -------
+        np.ndarray
+            Words (object dtype)
+        """
+
+        return self.column.take(self.positions[positions])
+
+
+class CompiledPool(object):
+    """Word pool compiled into contiguous string columns.
+
+    Columns
+    -------
+    original
+        Normalized words, including their conjugation suffix.
+    cleaned
+        Normalized words without their conjugation suffix.
+    affix_flags
+        Hunspell affix flags of each word ("" if it has none).
+
+    The features of the cleaned words are precomputed in a
+    :class:`~stimpool.features.FeatureIndex`, and their prefixes and suffixes
+    are indexed in a :class:`~stimpool.prefixes.PrefixIndex`.
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, StringColumn],
+        features: FeatureIndex,
+        metadata: Dict,
+        prefixes: Optional[PrefixIndex] = None,
+    ) -> None:
+        """Create a compiled pool.
+
+        Parameters
+        ----------
+        columns : Dict[str, StringColumn]
+            Columns of the compiled pool
+        features : FeatureIndex
+            Features of the cleaned words
+        metadata : Dict
+            Information about how the pool was compiled (e.g., source hash)
+        prefixes : PrefixIndex
+            Prefixes and suffixes of the cleaned words (the default is None,
+            build them from the cleaned column)
+        """
+
+        self.columns = columns
+        self.features = features
+        self.metadata = metadata
+        if prefixes is None:
+            prefixes = PrefixIndex.from_column(columns["cleaned"])
+        self.prefixes = prefixes
+        self._similarity: Optional[BKTree] = None
+
+    @property
+    def original(self) -> StringColumn:
+        """Normalized words, including their conjugation suffix."""
+
+        return self.columns["original"]
+
+    @property
+    def cleaned(self) -> StringColumn:
+        """Normalized words without their conjugation suffix."""
+
+        return self.columns["cleaned"]
+
+    @property
+    def affix_flags(self) -> StringColumn:
+        """Hunspell affix flags of each word."""
+
+        return self.columns["affix_flags"]
+
+    @property
+    def similarity(self) -> BKTree:
+        """Edit distance index of the cleaned words, built when first used."""
+
+        if self._similarity is None:
+            self._similarity = BKTree(self.cleaned.to_list())
+
+        return self._similarity
+
+    def __len__(self) -> int:
+        """Get the number of words in the pool."""
+
+        return len(self.original)
+
+    @classmethod
+    def from_dictionary(cls, path: Path) -> "CompiledPool":
+        """Compile a hunspell .dic file.
+
+        Words are normalized and cleaned the same way
+        :class:`~stimpool.words.WordPool` does it.
+
+        Parameters
+        ----------
+        path : Path
+            Hunspell dictionary. Its first line is the number of words.
+
+        Returns
+        -------
+        CompiledPool
+        """
+
+        with open(path, encoding="utf-8") as file:
+            lines = file.read().split("\n")[1:]
+        entries = [line for line in lines if line]
+
+        original = normalize_words(entries)
+        cleaned = remove_conjugation_suffixes(original)
+        affix_flags = [entry.strip().partition("/")[2] for entry in entries]
+
+        columns = {
+            "original": StringColumn.from_words(original),
+            "cleaned": StringColumn.from_words(cleaned),
+            "affix_flags": StringColumn.from_words(affix_flags),
+        }
+        features = FeatureIndex.from_words(cleaned, affix_flags)
+        metadata = {
+            "format_version": FORMAT_VERSION,
+            "source": str(path),
+            "source_sha256": hash_file(path),
+            "n_words": len(entries),
+        }
+        metadata.update(_get_dependencies())
+
+        return cls(columns, features, metadata)
+
+    @classmethod
+    def load(cls, directory: Path) -> "CompiledPool":
+        """Memory-map a compiled pool saved with :meth:`save`.
+
+        Parameters
+        ----------
+        directory : Path
+            Directory where the pool was saved
+
+        Returns
+        -------
+        CompiledPool
+        """
+
+        with open(directory / "metadata.json", encoding="utf-8") as file:
+            metadata = json.load(file)
+        columns = {name: StringColumn.load(directory, name) for name in _COLUMNS}
+        features = FeatureIndex.load(directory)
+        prefixes = PrefixIndex.load(directory, columns["cleaned"])
+
+        return cls(columns, features, metadata, prefixes)
+
+    def save(self, directory: Path) -> None:
+        """Save the compiled pool.
+
+        The pool is written to a temporary directory that is then renamed,
+        so other processes never see a partially written pool.
+
+        Parameters
+        ----------
+        directory : Path
+            Directory where the pool will be saved
+        """
+
+        directory.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(dir=directory.parent, prefix=".tmp-"))
+        try:
+            for name, column in self.columns.items():
+                column.save(tmp_dir, name)
+            self.features.save(tmp_dir)
+            self.prefixes.save(tmp_dir)
+            with open(tmp_dir / "metadata.json", "w", encoding="utf-8") as file:
+                json.dump(self.metadata, file)
+
+            if directory.exists():
+                shutil.rmtree(directory, ignore_errors=True)
+            try:
+                os.replace(tmp_dir, directory)
+            except OSError:
+                # another process saved the same pool first
+                pass
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _get_dependencies() -> Dict[str, str]:
+    """Get what the compiled words and features depend on besides the source.
+
+    A compiled pool whose metadata doesn't match is compiled again, so a new
+    release never uses words cleaned or features computed by an older one.
+    """
+
+    return {
+        "stimpool_version": __version__,
+        "patterns_sha256": hash_file(DEFAULT_PATTERNS_PATH),
+    }
+
+
+def load_default_pool(
+    source: Path = DEFAULT_POOL_PATH, cache_dir: Optional[Path] = None
+) -> CompiledPool:
+    """Load the compiled form of the default word pool.
+
+    The pool is compiled and saved the first time it is used and whenever the
+    source dictionary or the hyphenation patterns change (i.e., their hashes
+    no longer match) or it was compiled by another version of stimpool. Pools
+    that were already loaded in the current process are reused.
+
+    Parameters
+    ----------
+    source : Path
+        Hunspell dictionary with the word pool (the default is es_PR.dic)
+    cache_dir : Path
+        Directory where compiled pools are stored (the default is None,
+        use :func:`get_cache_dir`)
+
+    Returns
+    -------
+    CompiledPool
+    """
+
+    source = Path(source).resolve()
+    if cache_dir is None:
+        cache_dir = get_cache_dir()
+
+    stat = source.stat()
+    key = (str(source), str(cache_dir), stat.st_mtime_ns, stat.st_size)
+    if key in _LOADED:
+        return _LOADED[key]
+
+    directory = Path(cache_dir) / f"{source.stem}-v{FORMAT_VERSION}"
+    metadata_expected = {"source_sha256": hash_file(source), **_get_dependencies()}
+
+    compiled_pool: Optional[CompiledPool] = None
+    try:
+        compiled_pool = CompiledPool.load(directory)
+    except (OSError, ValueError):
+        pass
+
+    if compiled_pool is None or any(
+        compiled_pool.metadata.get(name) != value
+        for name, value in metadata_expected.items()
+    ):
+        compiled_pool = CompiledPool.from_dictionary(source)
+        try:
+            compiled_pool.save(directory)
+            compiled_pool = CompiledPool.load(directory)
+        except OSError:
+            # the cache is not writable; keep using the in-memory pool
+            pass
+
+    _LOADED[key] = compiled_pool
+
+    return compiled_pool
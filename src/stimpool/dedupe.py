@@ -0,0 +1,211 @@
+"""Remove repeated words in a single pass, keeping their provenance.
+
+Normalizing the words and cleaning their suffixes can make different entries
+equal (e.g., "Ana" and "ana/S" are both "ana"). A :class:`Deduplicator` finds
+the first occurrence of each word with a hash table, one chunk at a time, so
+repeated words are also removed from streamed pools. It can keep the
+provenance of each word:
+
+first
+    First original form of the word (i.e., before cleaning its suffix)
+all
+    All the original forms of the word, in order of appearance
+count
+    Number of occurrences of the word
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .vectorized import to_object_array
+
+PROVENANCE = ("first", "all", "count")
+
+Words = Union[Sequence[str], np.ndarray]
+
+
+def group_words(words: Words, groups: Optional[Dict[str, int]] = None) -> np.ndarray:
+    """Give the same code to equal words using a hash table.
+
+    Codes are numbered in order of first appearance.
+
+    Parameters
+    ----------
+    words : Sequence[str] or np.ndarray
+        words to be grouped
+    groups : Dict[str, int]
+        Code of the words seen before (e.g., in previous chunks), which is
+        updated with the new words (the default is None, no words seen)
+
+    Returns
+    -------
+    np.ndarray
+        Code of each word (int64)
+    """
+
+    if groups is None:
+        groups = {}
+
+    return np.fromiter(
+        (groups.setdefault(word, len(groups)) for word in words),
+        dtype=np.int64,
+        count=len(words),
+    )
+
+
+class Deduplicator(object):
+    """Find the first occurrence of each word across chunks."""
+
+    def __init__(self, provenance: Iterable[str] = ("count",)) -> None:
+        """Create a deduplicator.
+
+        Parameters
+        ----------
+        provenance : Iterable[str]
+            Provenance kept for each word: "first", "all" or "count"
+            (Default=("count",))
+
+        Raises
+        ------
+        ValueError
+            If a provenance is not valid.
+        """
+
+        self.provenance = tuple(provenance)
+        for name in self.provenance:
+            if name not in PROVENANCE:
+                raise ValueError(f"provenance must be in {PROVENANCE}, not {name!r}")
+
+        self._groups: Dict[str, int] = {}
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._first: List[str] = []
+        self._all: List[List[str]] = []
+
+    @property
+    def needs_original(self) -> bool:
+        """Specifies if the original forms of the words are needed."""
+
+        return "first" in self.provenance or "all" in self.provenance
+
+    def __len__(self) -> int:
+        """Get the number of distinct words seen."""
+
+        return len(self._groups)
+
+    def add(self, words: Words, words_original: Optional[Words] = None) -> np.ndarray:
+        """Add a chunk of words.
+
+        Parameters
+        ----------
+        words : Sequence[str] or np.ndarray
+            normalized and cleaned words
+        words_original : Sequence[str] or np.ndarray
+            Original form of each word, needed for the "first" and "all"
+            provenance (the default is None, not available)
+
+        Returns
+        -------
+        np.ndarray
+            Positions in the chunk of the words that were not seen before.
+
+        Raises
+        ------
+        ValueError
+            If the original forms are needed but not given.
+        """
+
+        if self.needs_original and words_original is None:
+            raise ValueError("The original words are needed for this provenance")
+
+        n_seen = len(self._groups)
+        codes = group_words(words, self._groups)
+        # the first occurrence of a word is the first code above all before it
+        codes_before = np.concatenate(([n_seen - 1], codes[:-1]))
+        positions_new = np.flatnonzero(codes > np.maximum.accumulate(codes_before))
+
+        if "count" in self.provenance:
+            counts = np.bincount(codes, minlength=len(self._groups))
+            counts[: len(self._counts)] += self._counts
+            self._counts = counts
+        if "first" in self.provenance:
+            self._first.extend(words_original[i] for i in positions_new)  # type: ignore
+        if "all" in self.provenance:
+            self._all.extend([] for _ in range(len(positions_new)))
+            for code, word in zip(codes.tolist(), words_original):  # type: ignore
+                self._all[code].append(word)
+
+        return positions_new
+
+    def copy(self) -> "Deduplicator":
+        """Create a copy that can be updated independently.
+
+        Returns
+        -------
+        Deduplicator
+        """
+
+        deduplicator = Deduplicator(self.provenance)
+        deduplicator._groups = dict(self._groups)
+        deduplicator._counts = self._counts.copy()
+        deduplicator._first = list(self._first)
+        deduplicator._all = [list(words) for words in self._all]
+
+        return deduplicator
+
+    def discard(self, words: Iterable[str]) -> np.ndarray:
+        """Forget words, so they are new again if they are added later.
+
+        Parameters
+        ----------
+        words : Iterable[str]
+            normalized and cleaned words; words not seen are ignored
+
+        Returns
+        -------
+        np.ndarray
+            Flags of the distinct words seen before that are kept, in order of
+            appearance.
+        """
+
+        flags = np.ones(len(self._groups), dtype=bool)
+        for word in words:
+            code = self._groups.get(word)
+            if code is not None:
+                flags[code] = False
+        if flags.all():
+            return flags
+
+        kept = [word for word, code in self._groups.items() if flags[code]]
+        self._groups = {word: code for code, word in enumerate(kept)}
+        if "count" in self.provenance:
+            self._counts = self._counts[flags]
+        if "first" in self.provenance:
+            self._first = [word for word, flag in zip(self._first, flags) if flag]
+        if "all" in self.provenance:
+            self._all = [words for words, flag in zip(self._all, flags) if flag]
+
+        return flags
+
+    def get_provenance(self) -> Dict[str, np.ndarray]:
+        """Get the provenance of each distinct word, in order of appearance.
+
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            count (int64), first (str) and all (tuple of str) of each word.
+        """
+
+        provenance = {}
+        for name in self.provenance:
+            if name == "count":
+                provenance[name] = self._counts.copy()
+            elif name == "first":
+                provenance[name] = to_object_array(self._first)
+            else:
+                forms = np.empty(len(self._all), dtype=object)
+                for i, words_original in enumerate(self._all):
+                    forms[i] = tuple(words_original)
+                provenance[name] = forms
+
+        return provenance
@@ -0,0 +1,242 @@
+"""Write word pools to columnar, compressed and text formats.
+
+Pools are written one chunk at a time, together with the optional feature
+columns of the words, so large pools are exported in bounded memory.
+
+Formats
+-------
+csv, csv.gz, csv.zst
+    Comma separated values, optionally compressed with gzip or zstd.
+jsonl, jsonl.gz, jsonl.zst
+    One JSON object per word, optionally compressed with gzip or zstd.
+parquet
+    Apache Parquet, with one row group per chunk.
+arrow, feather
+    Arrow IPC file (Feather V2), with one record batch per chunk. It can be
+    memory-mapped.
+
+Parquet and Arrow require ``pyarrow`` and zstd requires ``zstandard``.
+
+pandas and NumPy are imported when a pool is written or read, so the formats
+and features can be listed (e.g., by the command line interface) without
+importing them.
+"""
+
+import gzip
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Dict, Iterable, Iterator, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+CHUNKSIZE = 100_000
+FORMATS = (
+    "csv",
+    "csv.gz",
+    "csv.zst",
+    "jsonl",
+    "jsonl.gz",
+    "jsonl.zst",
+    "parquet",
+    "arrow",
+    "feather",
+)
+FEATURES = ("length", "syllables", "accented")
+
+
+def _import_optional(name: str, file_format: str) -> Any:
+    """Import an optional dependency needed for a format.
+
+    Raises
+    ------
+    ImportError
+        If the dependency is not installed.
+    """
+
+    try:
+        return __import__(name, fromlist=["_"])
+    except ImportError:
+        package = name.split(".")[0]
+        raise ImportError(f"{file_format} files require {package}") from None
+
+
+def compute_features(words: Iterable[str], features: Sequence[str]) -> "pd.DataFrame":
+    """Compute the features of the words.
+
+    Parameters
+    ----------
+    words : Iterable[str]
+        normalized and cleaned words
+    features : Sequence[str]
+        names of the features (length, syllables or accented)
+
+    Returns
+    -------
+    pd.DataFrame
+        Words (column "word") followed by one column per feature.
+
+    Raises
+    ------
+    ValueError
+        If a feature is not valid.
+    """
+
+    import pandas as pd
+
+    from .hyphenation import load_hyphenator
+    from .vectorized import ACCENTED_CHARACTERS, flag_characters, word_lengths
+
+    words = list(words)
+    columns: Dict[str, Any] = {"word": pd.Series(words, dtype="object")}
+    for feature in features:
+        if feature == "length":
+            columns[feature] = word_lengths(words)
+        elif feature == "syllables":
+            columns[feature] = load_hyphenator().count_syllables_pool(words)
+        elif feature == "accented":
+            columns[feature] = flag_characters(words, ACCENTED_CHARACTERS)
+        else:
+            raise ValueError(f"feature must be one of {FEATURES}, not {feature!r}")
+
+    return pd.DataFrame(columns)
+
+
+def _get_chunks(
+    words: "np.ndarray", features: Sequence[str], chunksize: int
+) -> Iterator["pd.DataFrame"]:
+    """Generate the chunks of the pool with their feature columns."""
+
+    for start in range(0, max(len(words), 1), chunksize):
+        yield compute_features(words[start : start + chunksize], features)
+
+
+def _open_text(path: Path, mode: str, compression: str) -> IO[str]:
+    """Open a text file, optionally compressed with gzip or zstd."""
+
+    if compression == "gz":
+        return gzip.open(path, f"{mode}t", encoding="utf-8", newline="")  # type: ignore
+    if compression == "zst":
+        zstandard = _import_optional("zstandard", "zstd")
+        return zstandard.open(path, f"{mode}t", encoding="utf-8", newline="")
+
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def write_pool(
+    words: Iterable[str],
+    path: Path,
+    file_format: str = "csv",
+    features: Sequence[str] = (),
+    chunksize: int = CHUNKSIZE,
+) -> None:
+    """Write the words of a pool and their features to a file.
+
+    Parameters
+    ----------
+    words : Iterable[str]
+        words to be written (e.g., a pd.Series or np.ndarray)
+    path : Path
+        file to write
+    file_format : str
+        one of the supported formats (Default=csv)
+    features : Sequence[str]
+        feature columns to write with the words (length, syllables or
+        accented) (the default is (), only the words)
+    chunksize : int
+        Number of words written at once (Default=100000)
+
+    Raises
+    ------
+    ValueError
+        If the format or a feature is not valid.
+    """
+
+    if file_format not in FORMATS:
+        raise ValueError(f"file_format must be one of {FORMATS}, not {file_format!r}")
+    for feature in features:
+        if feature not in FEATURES:
+            raise ValueError(f"feature must be one of {FEATURES}, not {feature!r}")
+
+    from .vectorized import to_object_array
+
+    kind, _, compression = file_format.partition(".")
+    chunks = _get_chunks(to_object_array(words), features, chunksize)
+
+    if kind in ("csv", "jsonl"):
+        with _open_text(Path(path), "w", compression) as file:
+            for i, chunk in enumerate(chunks):
+                if kind == "csv":
+                    chunk.to_csv(file, header=i == 0, index=False)
+                elif len(chunk) > 0:
+                    lines = chunk.to_json(
+                        orient="records", lines=True, force_ascii=False
+                    )
+                    file.write(lines if lines.endswith("\n") else f"{lines}\n")
+        return
+
+    pa = _import_optional("pyarrow", kind)
+    schema = pa.schema(
+        [("word", pa.string())]
+        + [
+            (feature, pa.bool_() if feature == "accented" else pa.int64())
+            for feature in features
+        ]
+    )
+    if kind == "parquet":
+        writer = _import_optional("pyarrow.parquet", kind).ParquetWriter(path, schema)
+    else:
+        writer = pa.ipc.new_file(str(path), schema)
+    with writer:
+        for chunk in chunks:
+            columns = [chunk[name].to_numpy() for name in schema.names]
+            columns[0] = columns[0].astype(object)
+            table = pa.Table.from_arrays(
+                [pa.array(column) for column in columns], schema=schema
+            )
+            writer.write_table(table)
+
+
+def read_pool(path: Path, file_format: str = "csv") -> "pd.DataFrame":
+    """Read a pool written with :func:`write_pool`.
+
+    Arrow files are memory-mapped.
+
+    Parameters
+    ----------
+    path : Path
+        file to read
+    file_format : str
+        format of the file (Default=csv)
+
+    Returns
+    -------
+    pd.DataFrame
+        Words (column "word") and their feature columns.
+
+    Raises
+    ------
+    ValueError
+        If the format is not valid.
+    """
+
+    if file_format not in FORMATS:
+        raise ValueError(f"file_format must be one of {FORMATS}, not {file_format!r}")
+
+    import pandas as pd
+
+    kind, _, compression = file_format.partition(".")
+    if kind in ("csv", "jsonl"):
+        with _open_text(Path(path), "r", compression) as buffer:
+            if kind == "csv":
+                return pd.read_csv(
+                    buffer, dtype={"word": "object"}, keep_default_na=False
+                )
+            return pd.read_json(buffer, orient="records", lines=True, dtype=False)
+
+    pa = _import_optional("pyarrow", kind)
+    if kind == "parquet":
+        return _import_optional("pyarrow.parquet", kind).read_table(path).to_pandas()
+
+    with pa.memory_map(str(path)) as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
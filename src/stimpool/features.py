@@ -0,0 +1,479 @@
+"""Precompute word features and index them for fast lookups.
+
+A :class:`FeatureIndex` stores features of every word in a pool. Numeric
+features (e.g., length) are kept together with the positions of the words
+sorted by that feature, so ranges are found through bisection. Boolean
+features (e.g., accented characters, affix flags) are kept as bitmaps, so
+criteria can be combined by intersecting bitmaps instead of scanning words.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .hyphenation import load_hyphenator
+from .neighbors import NEIGHBORHOODS, count_neighbors
+from .vectorized import ACCENTED_CHARACTERS, flag_characters, word_lengths
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+
+
+def popcount(bitmap: np.ndarray) -> int:
+    """Count the bits that are set in a bitmap.
+
+    Parameters
+    ----------
+    bitmap : np.ndarray
+        packed bitmap (uint8)
+
+    Returns
+    -------
+    int
+    """
+
+    return int(_POPCOUNT[bitmap].sum())
+
+
+def pack_flags(flags: np.ndarray) -> np.ndarray:
+    """Pack boolean flags into a bitmap.
+
+    Parameters
+    ----------
+    flags : np.ndarray
+        one boolean flag per word
+
+    Returns
+    -------
+    np.ndarray
+        packed bitmap (uint8)
+    """
+
+    return np.packbits(np.asarray(flags, dtype=bool))
+
+
+def pack_positions(positions: np.ndarray, n_words: int) -> np.ndarray:
+    """Pack the positions of the flagged words into a bitmap.
+
+    Only the bits of the positions are set, so the cost is proportional to
+    their number rather than to n_words (apart from allocating the zeroed
+    bitmap, n_words / 8 bytes).
+
+    Parameters
+    ----------
+    positions : np.ndarray
+        positions of the words flagged, in any order
+    n_words : int
+        Number of words
+
+    Returns
+    -------
+    np.ndarray
+        packed bitmap (uint8), equal to :func:`pack_flags` of the flags
+    """
+
+    positions = np.asarray(positions, dtype=np.int64)
+    bitmap = np.zeros((n_words + 7) // 8, dtype=np.uint8)
+    bits = np.right_shift(128, positions & 7).astype(np.uint8)
+    np.bitwise_or.at(bitmap, positions >> 3, bits)
+
+    return bitmap
+
+
+def unpack_flags(bitmap: np.ndarray, n_words: int) -> np.ndarray:
+    """Unpack a bitmap into boolean flags.
+
+    Parameters
+    ----------
+    bitmap : np.ndarray
+        packed bitmap (uint8)
+    n_words : int
+        number of words in the bitmap
+
+    Returns
+    -------
+    np.ndarray
+        one boolean flag per word
+    """
+
+    return np.unpackbits(bitmap, count=n_words).astype(bool)
+
+
+def _compute_numeric(words: List[str]) -> Dict[str, np.ndarray]:
+    """Compute the numeric features that only depend on each word."""
+
+    return {
+        "length": word_lengths(words).astype(np.int32),
+        "syllables": load_hyphenator().count_syllables_pool(words).astype(np.int32),
+    }
+
+
+def _compute_flags(
+    words: List[str], affix_flags: Optional[Sequence[str]] = None
+) -> Dict[str, np.ndarray]:
+    """Compute the boolean features of the words."""
+
+    features = {"accented": flag_characters(words, ACCENTED_CHARACTERS)}
+    if affix_flags is not None:
+        positions_by_flag: Dict[str, List[int]] = {}
+        for position, flags in enumerate(affix_flags):
+            for flag in set(flags):
+                positions_by_flag.setdefault(flag, []).append(position)
+        for flag in sorted(positions_by_flag):
+            flags_words = np.zeros(len(words), dtype=bool)
+            flags_words[positions_by_flag[flag]] = True
+            features[f"affix:{flag}"] = flags_words
+
+    return features
+
+
+class FeatureIndex(object):
+    """Precomputed features of the words in a pool.
+
+    Features
+    --------
+    length (numeric)
+        Number of characters of the word.
+    syllables (numeric)
+        Number of syllables of the word.
+    neighbors:<neighborhood> (numeric)
+        Number of orthographic neighbors of the word in the pool, for the
+        substitution (Coltheart's N) and levenshtein neighborhoods.
+    accented (boolean)
+        The word contains accented characters.
+    affix:<flag> (boolean)
+        The word has the hunspell affix flag <flag>.
+    """
+
+    def __init__(
+        self,
+        numeric: Dict[str, np.ndarray],
+        orders: Dict[str, np.ndarray],
+        bitmaps: Dict[str, np.ndarray],
+        n_words: int,
+    ) -> None:
+        """Create a feature index.
+
+        Parameters
+        ----------
+        numeric : Dict[str, np.ndarray]
+            Value of each numeric feature for every word
+        orders : Dict[str, np.ndarray]
+            Positions of the words sorted by each numeric feature
+        bitmaps : Dict[str, np.ndarray]
+            Packed bitmap of each boolean feature
+        n_words : int
+            Number of words in the pool
+        """
+
+        self.numeric = numeric
+        self.orders = orders
+        self.bitmaps = bitmaps
+        self.n_words = n_words
+        self._sorted = {
+            name: np.asarray(values)[orders[name]] for name, values in numeric.items()
+        }
+
+    @classmethod
+    def from_words(
+        cls, words: Sequence[str], affix_flags: Optional[Sequence[str]] = None
+    ) -> "FeatureIndex":
+        """Compute the features of the words.
+
+        Parameters
+        ----------
+        words : Sequence[str]
+            normalized and cleaned words
+        affix_flags : Sequence[str]
+            hunspell affix flags of each word (the default is None, no flags)
+
+        Returns
+        -------
+        FeatureIndex
+        """
+
+        words = list(words)
+        numeric = _compute_numeric(words)
+        for neighborhood in NEIGHBORHOODS:
+            neighbors = count_neighbors(words, neighborhood)
+            numeric[f"neighbors:{neighborhood}"] = neighbors.astype(np.int32)
+        orders = {
+            name: np.argsort(values, kind="stable") for name, values in numeric.items()
+        }
+        bitmaps = {
+            name: pack_flags(flags)
+            for name, flags in _compute_flags(words, affix_flags).items()
+        }
+
+        return cls(numeric, orders, bitmaps, len(words))
+
+    def append(
+        self,
+        words: Sequence[str],
+        affix_flags: Optional[Sequence[str]] = None,
+        numeric: Optional[Dict[str, np.ndarray]] = None,
+    ) -> "FeatureIndex":
+        """Create an index with words added after the words of this one.
+
+        Only the features of the new words are computed, and they are merged
+        into the sorted orders and the bitmaps. The neighbor counts of the
+        words already indexed change when words are added, so they have to be
+        given for every word.
+
+        Parameters
+        ----------
+        words : Sequence[str]
+            normalized and cleaned words
+        affix_flags : Sequence[str]
+            hunspell affix flags of each word (the default is None, no flags)
+        numeric : Dict[str, np.ndarray]
+            Value of the numeric features that depend on the whole pool, for
+            every word of the new index (e.g., "neighbors:substitution")
+
+        Returns
+        -------
+        FeatureIndex
+
+        Raises
+        ------
+        ValueError
+            If the values of a numeric feature are missing or don't have one
+            value per word.
+        """
+
+        words = list(words)
+        n_words = self.n_words + len(words)
+        numeric = numeric or {}
+        numeric_added = _compute_numeric(words)
+        values_all = {}
+        orders = {}
+        for name, values in self.numeric.items():
+            if name in numeric:
+                values_all[name] = self._check_values(name, numeric[name], n_words)
+                orders[name] = np.argsort(values_all[name], kind="stable")
+            elif name in numeric_added:
+                added = numeric_added[name]
+                values_all[name] = np.concatenate([values, added])
+                # new words go after the words with the same value
+                order_added = np.argsort(added, kind="stable")
+                insert_at = np.searchsorted(
+                    self._sorted[name], added[order_added], side="right"
+                )
+                orders[name] = np.insert(
+                    self.orders[name], insert_at, order_added + self.n_words
+                )
+            else:
+                raise ValueError(f"The values of {name} have to be given")
+
+        flags_added = _compute_flags(words, affix_flags)
+        bitmaps = {}
+        for name in list(self.bitmaps) + sorted(set(flags_added) - set(self.bitmaps)):
+            flags = np.zeros(n_words, dtype=bool)
+            if name in self.bitmaps:
+                flags[: self.n_words] = self.flags(name)
+            if name in flags_added:
+                flags[self.n_words :] = flags_added[name]
+            bitmaps[name] = pack_flags(flags)
+
+        return FeatureIndex(values_all, orders, bitmaps, n_words)
+
+    def keep(
+        self, flags: np.ndarray, numeric: Optional[Dict[str, np.ndarray]] = None
+    ) -> "FeatureIndex":
+        """Create an index with only the words flagged.
+
+        The orders of the words that are kept don't change, so they are not
+        sorted again. The neighbor counts of the words kept change when
+        words are removed, so they have to be given.
+
+        Parameters
+        ----------
+        flags : np.ndarray
+            one boolean flag per word, True for the words kept
+        numeric : Dict[str, np.ndarray]
+            Value of the numeric features that depend on the whole pool, for
+            every word kept (e.g., "neighbors:substitution") (the default is
+            None, keep their values)
+
+        Returns
+        -------
+        FeatureIndex
+
+        Raises
+        ------
+        ValueError
+            If the values of a numeric feature don't have one value per word.
+        """
+
+        flags = np.asarray(flags, dtype=bool)
+        n_words = int(flags.sum())
+        numeric = numeric or {}
+        positions_new = np.cumsum(flags) - 1
+        values_all = {}
+        orders = {}
+        for name, values in self.numeric.items():
+            if name in numeric:
+                values_all[name] = self._check_values(name, numeric[name], n_words)
+                orders[name] = np.argsort(values_all[name], kind="stable")
+            else:
+                values_all[name] = np.asarray(values)[flags]
+                order = np.asarray(self.orders[name])
+                orders[name] = positions_new[order[flags[order]]]
+        bitmaps = {name: pack_flags(self.flags(name)[flags]) for name in self.bitmaps}
+
+        return FeatureIndex(values_all, orders, bitmaps, n_words)
+
+    @staticmethod
+    def _check_values(name: str, values: np.ndarray, n_words: int) -> np.ndarray:
+        """Check that a numeric feature has one value per word."""
+
+        values = np.asarray(values, dtype=np.int32)
+        if values.shape != (n_words,):
+            raise ValueError(f"{name} has to have one value per word ({n_words})")
+
+        return values
+
+    @classmethod
+    def load(cls, directory: Path) -> "FeatureIndex":
+        """Memory-map a feature index saved with :meth:`save`.
+
+        Parameters
+        ----------
+        directory : Path
+            Directory where the index was saved
+
+        Returns
+        -------
+        FeatureIndex
+        """
+
+        with open(directory / "features.json", encoding="utf-8") as file:
+            names = json.load(file)
+
+        numeric_values = np.load(directory / "features.numeric.npy", mmap_mode="r")
+        orders_values = np.load(directory / "features.orders.npy", mmap_mode="r")
+        bitmaps_values = np.load(directory / "features.bitmaps.npy", mmap_mode="r")
+
+        numeric = dict(zip(names["numeric"], numeric_values))
+        orders = dict(zip(names["numeric"], orders_values))
+        bitmaps = dict(zip(names["bitmaps"], bitmaps_values))
+
+        return cls(numeric, orders, bitmaps, names["n_words"])
+
+    def save(self, directory: Path) -> None:
+        """Save the feature index as .npy files that can be memory-mapped.
+
+        Parameters
+        ----------
+        directory : Path
+            Directory where the index will be saved
+        """
+
+        names = {
+            "n_words": self.n_words,
+            "numeric": list(self.numeric),
+            "bitmaps": list(self.bitmaps),
+        }
+        with open(directory / "features.json", "w", encoding="utf-8") as file:
+            json.dump(names, file)
+
+        np.save(
+            directory / "features.numeric.npy", np.stack(list(self.numeric.values()))
+        )
+        np.save(directory / "features.orders.npy", np.stack(list(self.orders.values())))
+        np.save(
+            directory / "features.bitmaps.npy", np.stack(list(self.bitmaps.values()))
+        )
+
+    def positions_in_range(
+        self,
+        name: str,
+        min_value: Optional[int] = None,
+        max_value: Optional[int] = None,
+    ) -> np.ndarray:
+        """Find the words whose numeric feature is within the limits.
+
+        Parameters
+        ----------
+        name : str
+            name of the numeric feature
+        min_value : int
+            Minimum value (defaults to None; no min value).
+        max_value : int
+            Maximum value (defaults to None; no max value).
+
+        Returns
+        -------
+        np.ndarray
+            Positions of the words, sorted by the feature.
+        """
+
+        values_sorted = self._sorted[name]
+        start = 0
+        stop = len(values_sorted)
+        if min_value is not None:
+            start = int(np.searchsorted(values_sorted, min_value, side="left"))
+        if max_value is not None:
+            stop = int(np.searchsorted(values_sorted, max_value, side="right"))
+
+        return self.orders[name][start:stop]
+
+    def bitmap_in_range(
+        self,
+        name: str,
+        min_value: Optional[int] = None,
+        max_value: Optional[int] = None,
+    ) -> np.ndarray:
+        """Get the bitmap of the words whose numeric feature is within the limits.
+
+        Parameters
+        ----------
+        name : str
+            name of the numeric feature
+        min_value : int
+            Minimum value (defaults to None; no min value).
+        max_value : int
+            Maximum value (defaults to None; no max value).
+
+        Returns
+        -------
+        np.ndarray
+            packed bitmap (uint8)
+        """
+
+        flags = np.zeros(self.n_words, dtype=bool)
+        flags[self.positions_in_range(name, min_value, max_value)] = True
+
+        return pack_flags(flags)
+
+    def bitmap(self, name: str) -> np.ndarray:
+        """Get the bitmap of a boolean feature.
+
+        Parameters
+        ----------
+        name : str
+            name of the boolean feature
+
+        Returns
+        -------
+        np.ndarray
+            packed bitmap (uint8)
+        """
+
+        return np.asarray(self.bitmaps[name])
+
+    def flags(self, name: str) -> np.ndarray:
+        """Get a boolean feature as one flag per word.
+
+        Parameters
+        ----------
+        name : str
+            name of the boolean feature
+
+        Returns
+        -------
+        np.ndarray
+        """
+
+        return unpack_flags(self.bitmap(name), self.n_words)
@@ -0,0 +1,291 @@
+"""Split words into syllables using Liang hyphenation patterns.
+
+The package includes the Spanish hyphenation patterns of LibreOffice
+(``hyph_es.dic``). :class:`Hyphenator` compiles them into a trie, finds the
+hyphenation points of a word with Liang's algorithm and caches the result of
+each word.
+
+The patterns place the breaks between consonants and vowels, but (following
+the typographic rules) never split vowels in hiatus and may leave a final
+consonant alone. Syllables are obtained by merging the parts without vowels
+into their neighbors and splitting the parts that have several vowel nuclei.
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+ROOT_DIR = Path(__file__).resolve().parent
+DEFAULT_PATTERNS_PATH = ROOT_DIR / "words" / "hyph_es.dic"
+CACHE_SIZE = 1 << 16
+
+# a nucleus is a strong (or accented weak) vowel with its surrounding weak
+# vowels (diphthongs and triphthongs) or a group of weak vowels only
+PATTERN_SYLLABLE_NUCLEUS = re.compile(
+    "[iuü]*[aeoáéóíú][iuüy]?|[iuü]+y?|y(?![aeiouáéíóúü])"
+)
+PATTERN_VOWEL = re.compile("[aeiouáéíóúü]")
+# consonant clusters that start a syllable
+ONSETS = {"bl", "br", "cl", "cr", "dr", "fl", "fr", "gl", "gr", "kl", "kr", "pl"}
+ONSETS |= {"pr", "tl", "tr", "ch", "ll", "rr"}
+
+
+class _TrieNode(object):
+    """Node of the pattern trie."""
+
+    __slots__ = ("children", "points")
+
+    def __init__(self) -> None:
+        """Create a node without children or points."""
+
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.points: Tuple[int, ...] = ()
+
+
+class Hyphenator(object):
+    """Find the hyphenation points of words using Liang patterns."""
+
+    def __init__(
+        self,
+        patterns: Sequence[str],
+        left_min: int = 2,
+        right_min: int = 2,
+        cache_size: int = CACHE_SIZE,
+    ) -> None:
+        """Compile the patterns.
+
+        Parameters
+        ----------
+        patterns : Sequence[str]
+            Liang patterns (e.g., ".s2a5b2")
+        left_min : int
+            Minimum number of characters before the first hyphen (Default=2)
+        right_min : int
+            Minimum number of characters after the last hyphen (Default=2)
+        cache_size : int
+            Number of words whose points are cached (Default=65536)
+        """
+
+        self.left_min = left_min
+        self.right_min = right_min
+        self._root = _TrieNode()
+        for pattern in patterns:
+            self._add_pattern(pattern)
+
+        self.get_points = lru_cache(maxsize=cache_size)(self._get_points)
+        self.syllabify = lru_cache(maxsize=cache_size)(self._syllabify)
+
+    @classmethod
+    def from_file(
+        cls, path: Path = DEFAULT_PATTERNS_PATH, cache_size: int = CACHE_SIZE
+    ) -> "Hyphenator":
+        """Read the patterns of a hyphenation dictionary.
+
+        Parameters
+        ----------
+        path : Path
+            hyphenation dictionary (the default is hyph_es.dic). Its first
+            line is the encoding.
+        cache_size : int
+            Number of words whose points are cached (Default=65536)
+
+        Returns
+        -------
+        Hyphenator
+        """
+
+        content = Path(path).read_bytes()
+        encoding, _, body = content.partition(b"\n")
+        lines = body.decode(encoding.decode("ascii").strip()).splitlines()
+
+        settings = {"LEFTHYPHENMIN": 2, "RIGHTHYPHENMIN": 2}
+        patterns = []
+        for line in lines:
+            fields = line.split()
+            if not fields or line.startswith("%"):
+                continue
+            if fields[0] in settings:
+                settings[fields[0]] = int(fields[1])
+            else:
+                patterns.append(fields[0])
+
+        return cls(
+            patterns,
+            left_min=settings["LEFTHYPHENMIN"],
+            right_min=settings["RIGHTHYPHENMIN"],
+            cache_size=cache_size,
+        )
+
+    def _add_pattern(self, pattern: str) -> None:
+        """Add a pattern to the trie.
+
+        The digits of the pattern are the points between its letters (e.g.,
+        "a1b" has point 1 between "a" and "b").
+        """
+
+        letters = "".join(char for char in pattern if not char.isdigit())
+        points = [0] * (len(letters) + 1)
+        position = 0
+        for char in pattern:
+            if char.isdigit():
+                points[position] = int(char)
+            else:
+                position += 1
+
+        node = self._root
+        for letter in letters:
+            node = node.children.setdefault(letter, _TrieNode())
+        node.points = tuple(points)
+
+    def _get_points(self, word: str) -> Tuple[int, ...]:
+        """Get the positions where the word can be split into syllables.
+
+        Parameters
+        ----------
+        word : str
+            normalized word
+
+        Returns
+        -------
+        Tuple[int, ...]
+            Positions (from 1 to len(word) - 1) of the breaks.
+        """
+
+        word_marked = f".{word}."
+        scores = [0] * (len(word_marked) + 1)
+        for start in range(len(word_marked)):
+            node = self._root
+            for position in range(start, len(word_marked)):
+                node = node.children.get(word_marked[position])  # type: ignore
+                if node is None:
+                    break
+                for offset, point in enumerate(node.points):
+                    if point > scores[start + offset]:
+                        scores[start + offset] = point
+
+        # scores[i + 1] is the score between word[i - 1] and word[i]
+        return tuple(i for i in range(1, len(word)) if scores[i + 1] % 2 == 1)
+
+    def _syllabify(self, word: str) -> Tuple[str, ...]:
+        """Split a word into syllables.
+
+        Parameters
+        ----------
+        word : str
+            normalized word
+
+        Returns
+        -------
+        Tuple[str, ...]
+        """
+
+        points = (0,) + self.get_points(word) + (len(word),)
+        parts = [word[start:stop] for start, stop in zip(points, points[1:])]
+
+        parts_merged: List[str] = []
+        for part in parts:
+            if parts_merged and not PATTERN_VOWEL.search(part):
+                parts_merged[-1] += part
+            elif parts_merged and not PATTERN_VOWEL.search(parts_merged[-1]):
+                parts_merged[-1] += part
+            else:
+                parts_merged.append(part)
+
+        syllables: List[str] = []
+        for part in parts_merged:
+            nuclei = list(PATTERN_SYLLABLE_NUCLEUS.finditer(part))
+            start = 0
+            for nucleus, nucleus_next in zip(nuclei, nuclei[1:]):
+                # consonants between nuclei go with the next one if they can
+                # start a syllable
+                consonants = part[nucleus.end() : nucleus_next.start()]
+                if len(consonants) >= 2 and consonants[-2:] in ONSETS:
+                    stop = nucleus_next.start() - 2
+                else:
+                    stop = max(nucleus.end(), nucleus_next.start() - 1)
+                syllables.append(part[start:stop])
+                start = stop
+            syllables.append(part[start:])
+
+        return tuple(syllables)
+
+    def hyphenate(self, word: str) -> List[str]:
+        """Split a word where it can be hyphenated at the end of a line.
+
+        Unlike :meth:`syllabify`, it respects the minimum number of characters
+        before the first and after the last hyphen.
+
+        Parameters
+        ----------
+        word : str
+            normalized word
+
+        Returns
+        -------
+        List[str]
+        """
+
+        points = [
+            point
+            for point in self.get_points(word)
+            if self.left_min <= point <= len(word) - self.right_min
+        ]
+        points = [0] + points + [len(word)]
+
+        return [word[start:stop] for start, stop in zip(points, points[1:])]
+
+    def count_syllables(self, word: str) -> int:
+        """Count the syllables of a word.
+
+        Parameters
+        ----------
+        word : str
+            normalized word
+
+        Returns
+        -------
+        int
+        """
+
+        if not word:
+            return 0
+
+        return len(self.syllabify(word))
+
+    def count_syllables_pool(self, words: Sequence[str]) -> np.ndarray:
+        """Count the syllables of all the words.
+
+        Parameters
+        ----------
+        words : Sequence[str]
+            normalized words
+
+        Returns
+        -------
+        np.ndarray
+            Number of syllables of each word (int64)
+        """
+
+        return np.fromiter(
+            map(self.count_syllables, words), dtype=np.int64, count=len(words)
+        )
+
+
+@lru_cache(maxsize=None)
+def load_hyphenator(path: Path = DEFAULT_PATTERNS_PATH) -> Hyphenator:
+    """Load the compiled hyphenation patterns (once per process).
+
+    Parameters
+    ----------
+    path : Path
+        hyphenation dictionary (the default is hyph_es.dic)
+
+    Returns
+    -------
+    Hyphenator
+    """
+
+    return Hyphenator.from_file(path)
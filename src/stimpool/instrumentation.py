@@ -0,0 +1,251 @@
+"""Record the time, size and memory of each stage of building a word pool.
+
+An :class:`Instrumentation` is passed to a :class:`~stimpool.words.WordPool`
+to record a :class:`StageEvent` for each stage (e.g., loading the default
+pool, formatting it, cleaning suffixes or evaluating each selection). Events
+are kept in a history that can be queried as a DataFrame and are sent to the
+hooks, which can ship them to other systems (e.g., a metrics service).
+
+Pools without instrumentation use :data:`NULL_STAGE`, which does nothing, so
+disabled instrumentation costs almost nothing.
+
+Memory is traced with tracemalloc, which is started by the instrumentation if
+it is not already tracing and stopped by :meth:`Instrumentation.close` (e.g.,
+at the end of a ``with`` block), unless it was started by someone else.
+"""
+
+import time
+import tracemalloc
+from typing import TYPE_CHECKING, Any, Callable, List, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class StageEvent(NamedTuple):
+    """Measurements of a stage.
+
+    Attributes
+    ----------
+    stage : str
+        Name of the stage (e.g., "format_pool" or
+        "select:select_words_of_length")
+    started : float
+        Time the stage started (seconds since the epoch)
+    seconds : float
+        Wall time of the stage
+    n_in : int
+        Number of words the stage received (None if not applicable)
+    n_out : int
+        Number of words the stage produced (None if not applicable)
+    memory_delta : int
+        Change in traced memory in bytes (None if memory is not traced)
+    """
+
+    stage: str
+    started: float
+    seconds: float
+    n_in: Optional[int]
+    n_out: Optional[int]
+    memory_delta: Optional[int]
+
+
+class _NullStage(object):
+    """Stage that records nothing, used when instrumentation is disabled."""
+
+    n_out: Optional[int] = None
+
+    def __enter__(self) -> "_NullStage":
+        """Start the stage, which does nothing."""
+
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """End the stage without recording it."""
+
+        return None
+
+
+NULL_STAGE = _NullStage()
+
+
+class Stage(object):
+    """Stage being measured. Set n_out before it ends."""
+
+    def __init__(
+        self, instrumentation: "Instrumentation", name: str, n_in: Optional[int]
+    ) -> None:
+        """Create a stage of the instrumentation that receives n_in words."""
+
+        self.instrumentation = instrumentation
+        self.name = name
+        self.n_in = n_in
+        self.n_out: Optional[int] = None
+        self._started = 0.0
+        self._start = 0.0
+        self._memory: Optional[int] = None
+
+    def __enter__(self) -> "Stage":
+        """Start measuring the time and memory of the stage."""
+
+        if self.instrumentation.trace_memory:
+            self._memory = tracemalloc.get_traced_memory()[0]
+        self._started = time.time()
+        self._start = time.perf_counter()
+
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Record the event of the stage."""
+
+        seconds = time.perf_counter() - self._start
+        memory_delta = None
+        if self._memory is not None:
+            memory_delta = tracemalloc.get_traced_memory()[0] - self._memory
+
+        event = StageEvent(
+            self.name, self._started, seconds, self.n_in, self.n_out, memory_delta
+        )
+        self.instrumentation.record(event)
+
+
+class Instrumentation(object):
+    """History of the stages of one or more word pools."""
+
+    def __init__(
+        self,
+        hooks: Optional[List[Callable[[StageEvent], None]]] = None,
+        trace_memory: bool = False,
+        enabled: bool = True,
+    ) -> None:
+        """Create the instrumentation.
+
+        Parameters
+        ----------
+        hooks : List[Callable[[StageEvent], None]]
+            Functions called with each event when it is recorded (the default
+            is None, no hooks)
+        trace_memory : bool
+            Specifies if the memory delta of each stage should be measured
+            with tracemalloc, which slows down the stages until the
+            instrumentation is closed (Default=False)
+        enabled : bool
+            Specifies if stages should be recorded (Default=True)
+        """
+
+        self.hooks = list(hooks or [])
+        self.trace_memory = trace_memory
+        self.enabled = enabled
+        self.history: List[StageEvent] = []
+        self._started_tracing = False
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def __enter__(self) -> "Instrumentation":
+        """Use the instrumentation until the with block ends."""
+
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Close the instrumentation (see :meth:`close`)."""
+
+        self.close()
+
+    def close(self) -> None:
+        """Stop measuring memory, and stop tracemalloc if it was started here.
+
+        The history is kept, and later stages are recorded without their
+        memory delta.
+        """
+
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracing = False
+        self.trace_memory = False
+
+    def stage(self, name: str, n_in: Optional[int] = None) -> Any:
+        """Measure a stage.
+
+        Parameters
+        ----------
+        name : str
+            name of the stage
+        n_in : int
+            Number of words the stage receives (the default is None, not
+            applicable)
+
+        Returns
+        -------
+        Stage
+            Context manager that records the stage when it ends.
+        """
+
+        if not self.enabled:
+            return NULL_STAGE
+
+        return Stage(self, name, n_in)
+
+    def record(self, event: StageEvent) -> None:
+        """Add an event to the history and send it to the hooks.
+
+        Parameters
+        ----------
+        event : StageEvent
+        """
+
+        self.history.append(event)
+        for hook in self.hooks:
+            hook(event)
+
+    def add_hook(self, hook: Callable[[StageEvent], None]) -> None:
+        """Call a function with each event recorded from now on.
+
+        Parameters
+        ----------
+        hook : Callable[[StageEvent], None]
+        """
+
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[StageEvent], None]) -> None:
+        """Stop calling a function with the events.
+
+        Parameters
+        ----------
+        hook : Callable[[StageEvent], None]
+        """
+
+        self.hooks.remove(hook)
+
+    def clear(self) -> None:
+        """Remove all the events from the history."""
+
+        self.history = []
+
+    def to_frame(self) -> "pd.DataFrame":
+        """Get the history as a DataFrame, one row per event.
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+
+        import pandas as pd
+
+        return pd.DataFrame(self.history, columns=StageEvent._fields)
+
+    def summary(self) -> "pd.DataFrame":
+        """Get the number of calls and the total time of each stage.
+
+        Returns
+        -------
+        pd.DataFrame
+            calls and seconds of each stage, slowest first.
+        """
+
+        history = self.to_frame()
+        summary = history.groupby("stage")["seconds"].agg(["count", "sum"])
+        summary.columns = ["calls", "seconds"]
+
+        return summary.sort_values("seconds", ascending=False)
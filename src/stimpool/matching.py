@@ -0,0 +1,256 @@
+"""Partition words into lists matched on their features.
+
+:func:`match_lists` assigns words to ``k`` lists of ``n`` words so the mean
+of every feature (e.g., length and syllables) is as similar as possible
+across the lists. It minimizes the variance of the list means of the
+standardized features with simulated annealing:
+
+1. The words are sorted by their features and dealt to the lists in a snake
+   order, which is already a good starting point.
+2. Each iteration proposes a batch of swaps, between two lists or between a
+   list and the words that were left out, evaluates all of them at once from
+   the sums of the lists and applies the best one. Worse swaps are sometimes
+   accepted while the temperature is high, to escape local minima.
+
+The cost of an iteration doesn't depend on the number of words, so the lists
+can be chosen from thousands of candidates. The search stops when the lists
+are balanced, the time budget is exhausted or after max_iterations.
+"""
+
+import time
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from .sampling import DEFAULT_SEED, get_generator
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# swaps evaluated at once in each iteration
+BATCH_SIZE = 256
+# lists whose objective is below this are considered balanced
+TOLERANCE = 1e-12
+
+
+class MatchResult(NamedTuple):
+    """Lists found by :func:`match_lists` and how balanced they are.
+
+    Attributes
+    ----------
+    lists : np.ndarray
+        Positions of the words of each list, one row per list
+    means : np.ndarray
+        Mean of each feature (columns) in each list (rows)
+    stds : np.ndarray
+        Standard deviation of each feature (columns) in each list (rows)
+    max_difference : np.ndarray
+        Largest difference between the means of two lists, for each feature
+    objective : float
+        Variance of the list means of the standardized features (0 when the
+        means are equal)
+    iterations : int
+        Number of iterations of the search
+    seconds : float
+        Duration of the search
+    """
+
+    lists: np.ndarray
+    means: np.ndarray
+    stds: np.ndarray
+    max_difference: np.ndarray
+    objective: float
+    iterations: int
+    seconds: float
+
+
+class MatchedLists(NamedTuple):
+    """Lists of words created by :meth:`stimpool.words.WordPool.match_lists`.
+
+    Attributes
+    ----------
+    lists : List[pd.Series]
+        Words of each list
+    balance : pd.DataFrame
+        Mean and standard deviation of each feature in each list (one row per
+        list, columns such as "length_mean" and "length_std")
+    max_difference : Dict[str, float]
+        Largest difference between the means of two lists, for each feature
+    objective : float
+        Variance of the list means of the standardized features
+    iterations : int
+        Number of iterations of the search
+    seconds : float
+        Duration of the search
+    """
+
+    lists: List["pd.Series"]
+    balance: "pd.DataFrame"
+    max_difference: Dict[str, float]
+    objective: float
+    iterations: int
+    seconds: float
+
+
+def _get_objective(sums: np.ndarray, n: int) -> np.ndarray:
+    """Get the variance of the list means, for the list sums of each swap.
+
+    sums has shape (..., k, n_features).
+    """
+
+    means = sums / n
+    deviations = means - means.mean(axis=-2, keepdims=True)
+
+    return (deviations**2).sum(axis=(-2, -1)) / sums.shape[-2]
+
+
+def _deal_snake(positions: np.ndarray, k: int) -> np.ndarray:
+    """Deal the positions to k lists in snake order (0, 1, ..., k - 1, k - 1, ...)."""
+
+    ranks = np.arange(len(positions))
+    rounds, seats = np.divmod(ranks, k)
+    lists = np.where(rounds % 2 == 0, seats, k - 1 - seats)
+    order = np.argsort(lists, kind="stable")
+
+    return positions[order].reshape(k, -1)
+
+
+def match_lists(
+    values: np.ndarray,
+    k: int,
+    n: int,
+    time_budget: Optional[float] = 1.0,
+    max_iterations: Optional[int] = None,
+    seed: Optional[int] = DEFAULT_SEED,
+) -> MatchResult:
+    """Assign words to k lists of n words with matched feature means.
+
+    The search is reproducible for a seed when it is stopped by max_iterations
+    (i.e., time_budget is None); otherwise, the number of iterations depends
+    on the speed of the machine.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Features of each word, one row per word and one column per feature
+    k : int
+        Number of lists
+    n : int
+        Number of words of each list
+    time_budget : float
+        Maximum duration of the search in seconds (Default=1.0). None has
+        no time limit.
+    max_iterations : int
+        Maximum number of iterations (the default is None, no limit)
+    seed : int
+        Seed of the search (Default=1). None uses fresh entropy from the OS.
+
+    Returns
+    -------
+    MatchResult
+
+    Raises
+    ------
+    ValueError
+        If k or n are not positive, there are fewer than k * n words, or the
+        search has no limit.
+    """
+
+    if k < 1 or n < 1:
+        raise ValueError("k and n have to be positive")
+    if time_budget is None and max_iterations is None:
+        raise ValueError("Either time_budget or max_iterations have to be specified")
+
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    n_words = len(values)
+    if k * n > n_words:
+        raise ValueError(f"Can't make {k} lists of {n} words from {n_words} words")
+
+    scale = values.std(axis=0)
+    scaled = (values - values.mean(axis=0)) / np.where(scale > 0, scale, 1)
+
+    start = time.perf_counter()
+    generator = get_generator(seed)
+    candidates = generator.permutation(n_words)
+    chosen, unused = candidates[: k * n], candidates[k * n :]
+    chosen = chosen[np.argsort(scaled[chosen].sum(axis=1), kind="stable")]
+    lists = _deal_snake(chosen, k)
+
+    sums = scaled[lists].sum(axis=1)
+    objective = float(_get_objective(sums, n))
+    best = (objective, lists.copy())
+    temperature_start = objective / 10
+
+    iteration = 0
+    while best[0] > TOLERANCE:
+        elapsed = time.perf_counter() - start
+        if time_budget is not None and elapsed >= time_budget:
+            break
+        if max_iterations is not None and iteration >= max_iterations:
+            break
+        progress = max(
+            elapsed / time_budget if time_budget else 0,
+            iteration / max_iterations if max_iterations else 0,
+        )
+        iteration += 1
+
+        # swap the word at (list_a, slot_a) with a word of another list or,
+        # if list_b is k, with a word that was left out
+        n_slots = k + (len(unused) > 0)
+        if n_slots == 1:
+            break
+        list_a = generator.integers(k, size=BATCH_SIZE)
+        slot_a = generator.integers(n, size=BATCH_SIZE)
+        list_b = (
+            list_a + 1 + generator.integers(n_slots - 1, size=BATCH_SIZE)
+        ) % n_slots
+        is_unused = list_b == k
+        slot_b = generator.integers(n, size=BATCH_SIZE)
+        slot_unused = generator.integers(max(len(unused), 1), size=BATCH_SIZE)
+
+        word_a = lists[list_a, slot_a]
+        word_b = lists[np.minimum(list_b, k - 1), slot_b]
+        if len(unused) > 0:
+            word_b = np.where(is_unused, unused[slot_unused], word_b)
+        difference = scaled[word_b] - scaled[word_a]
+        sums_new = np.repeat(sums[np.newaxis], BATCH_SIZE, axis=0)
+        swaps = np.arange(BATCH_SIZE)
+        sums_new[swaps, list_a] += difference
+        in_lists = ~is_unused
+        sums_new[swaps[in_lists], list_b[in_lists]] -= difference[in_lists]
+        objectives = _get_objective(sums_new, n)
+
+        swap = int(np.argmin(objectives))
+        delta = objectives[swap] - objective
+        temperature = temperature_start * (1 - progress)
+        if delta >= 0 and (
+            temperature <= 0 or generator.random() >= np.exp(-delta / temperature)
+        ):
+            continue
+
+        a, b = word_a[swap], word_b[swap]
+        lists[list_a[swap], slot_a[swap]] = b
+        if is_unused[swap]:
+            unused[slot_unused[swap]] = a
+        else:
+            lists[list_b[swap], slot_b[swap]] = a
+        sums = sums_new[swap]
+        objective = float(objectives[swap])
+        if objective < best[0]:
+            best = (objective, lists.copy())
+
+    lists = best[1]
+    values_lists = values[lists]
+    means = values_lists.mean(axis=1)
+
+    return MatchResult(
+        lists=lists,
+        means=means,
+        stds=values_lists.std(axis=1),
+        max_difference=means.max(axis=0) - means.min(axis=0),
+        objective=float(_get_objective(scaled[lists].sum(axis=1), n)),
+        iterations=iteration,
+        seconds=time.perf_counter() - start,
+    )
@@ -0,0 +1,307 @@
+"""Count the orthographic neighbors of every word in a pool.
+
+Two words are orthographic neighbors when one can be turned into the other by
+editing a single character:
+
+substitution
+    Coltheart's N: words of the same length that differ in one character
+    (e.g., "casa" and "cama").
+levenshtein
+    Words at Levenshtein distance 1: substitutions, plus the words obtained
+    by inserting or deleting one character (e.g., "casa", "casas" and "cas").
+
+Comparing every pair of words is O(n²). Instead, each word is indexed in a
+hash table by its deletion neighborhood, so only words sharing a key are
+counted together, which is O(n * length):
+
+- Words of the same length that differ only at position ``i`` share the key
+  ``word[:i] + WILDCARD + word[i + 1:]`` (and no other key).
+- A word is a deletion neighbor of a longer word when it is one of the words
+  obtained by deleting one of its characters.
+
+Neighbors are counted among the distinct words of the pool, and a word is not
+its own neighbor. Words of each length only depend on the words that are one
+character shorter or longer, so lengths are counted in parallel.
+
+When a few words are added to or removed from a pool whose counts are known,
+:func:`update_neighbor_counts` updates them instead of counting again. The
+neighbors of each of those words are found by generating its edits (every
+substitution, insertion and deletion of a character of the pool) and looking
+them up, which doesn't depend on the size of the pool.
+"""
+
+import multiprocessing
+from collections import Counter
+from typing import Container, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+NEIGHBORHOODS = ("substitution", "levenshtein")
+# character that replaces the substituted position in the keys
+WILDCARD = "\x00"
+# pools with fewer distinct words are counted in a single process
+PARALLEL_MIN_WORDS = 200_000
+
+
+def get_substitution_keys(word: str) -> List[str]:
+    """Get the keys shared by the words that differ from word in one character.
+
+    Parameters
+    ----------
+    word : str
+
+    Returns
+    -------
+    List[str]
+        One key per character, with the character replaced by WILDCARD.
+    """
+
+    return [f"{word[:i]}{WILDCARD}{word[i + 1:]}" for i in range(len(word))]
+
+
+def get_deletions(word: str) -> Set[str]:
+    """Get the distinct words obtained by deleting one character of word.
+
+    Parameters
+    ----------
+    word : str
+
+    Returns
+    -------
+    Set[str]
+    """
+
+    return {word[:i] + word[i + 1 :] for i in range(len(word))}
+
+
+def _count_neighbors_of_length(
+    task: Tuple[List[str], List[str], List[str], str],
+) -> List[int]:
+    """Count the neighbors of the words of one length.
+
+    The task has the distinct words of the length, the words one character
+    shorter and one character longer, and the neighborhood.
+    """
+
+    words, words_shorter, words_longer, neighborhood = task
+
+    key_counts = Counter(key for word in words for key in get_substitution_keys(word))
+    counts = [
+        sum(key_counts[key] for key in get_substitution_keys(word)) - len(word)
+        for word in words
+    ]
+    if neighborhood == "substitution":
+        return counts
+
+    shorter = set(words_shorter)
+    deletion_counts = Counter(
+        deletion for word in words_longer for deletion in get_deletions(word)
+    )
+    for i, word in enumerate(words):
+        n_shorter = sum(deletion in shorter for deletion in get_deletions(word))
+        counts[i] += n_shorter + deletion_counts[word]
+
+    return counts
+
+
+def count_neighbors(
+    words: Iterable[str],
+    neighborhood: str = "substitution",
+    processes: Optional[int] = None,
+) -> np.ndarray:
+    """Count the orthographic neighbors of each word among the words.
+
+    Parameters
+    ----------
+    words : Iterable[str]
+        words to be analyzed, which are also the lexicon where neighbors are
+        looked for
+    neighborhood : str
+        "substitution" (Coltheart's N) or "levenshtein" (Levenshtein distance
+        1) (Default=substitution)
+    processes : int
+        Number of worker processes (the default is None, use every core if
+        the pool has at least PARALLEL_MIN_WORDS distinct words)
+
+    Returns
+    -------
+    np.ndarray
+        Number of neighbors of each word (int64)
+
+    Raises
+    ------
+    ValueError
+        If the neighborhood is not valid.
+    """
+
+    if neighborhood not in NEIGHBORHOODS:
+        raise ValueError(
+            f"neighborhood must be one of {NEIGHBORHOODS}, not {neighborhood!r}"
+        )
+
+    words = list(words)
+    words_by_length: Dict[int, List[str]] = {}
+    for word in dict.fromkeys(words):
+        words_by_length.setdefault(len(word), []).append(word)
+
+    lengths = sorted(words_by_length)
+    tasks = [
+        (
+            words_by_length[length],
+            words_by_length.get(length - 1, []),
+            words_by_length.get(length + 1, []),
+            neighborhood,
+        )
+        for length in lengths
+    ]
+    if neighborhood == "substitution":
+        # only words of the same length can be substitution neighbors
+        tasks = [(task[0], [], [], neighborhood) for task in tasks]
+
+    n_distinct = sum(len(task[0]) for task in tasks)
+    if processes is None:
+        processes = (
+            multiprocessing.cpu_count() if n_distinct >= PARALLEL_MIN_WORDS else 1
+        )
+
+    if processes <= 1 or len(tasks) <= 1:
+        counts_by_length = list(map(_count_neighbors_of_length, tasks))
+    else:
+        with multiprocessing.Pool(processes) as process_pool:
+            counts_by_length = process_pool.map(_count_neighbors_of_length, tasks)
+
+    counts: Dict[str, int] = {}
+    for length, counts_length in zip(lengths, counts_by_length):
+        counts.update(zip(words_by_length[length], counts_length))
+
+    return np.fromiter(map(counts.__getitem__, words), dtype=np.int64, count=len(words))
+
+
+def find_neighbors(
+    word: str, words: Sequence[str], neighborhood: str = "substitution"
+) -> List[str]:
+    """Find the orthographic neighbors of a word among the words.
+
+    Parameters
+    ----------
+    word : str
+        word whose neighbors are looked for
+    words : Sequence[str]
+        lexicon where neighbors are looked for
+    neighborhood : str
+        "substitution" (Coltheart's N) or "levenshtein" (Levenshtein distance
+        1) (Default=substitution)
+
+    Returns
+    -------
+    List[str]
+        Distinct neighbors, in the order of the words.
+
+    Raises
+    ------
+    ValueError
+        If the neighborhood is not valid.
+    """
+
+    if neighborhood not in NEIGHBORHOODS:
+        raise ValueError(
+            f"neighborhood must be one of {NEIGHBORHOODS}, not {neighborhood!r}"
+        )
+
+    keys = set(get_substitution_keys(word))
+    deletions = get_deletions(word)
+    neighbors = []
+    for candidate in dict.fromkeys(words):
+        if len(candidate) == len(word):
+            is_neighbor = candidate != word and any(
+                key in keys for key in get_substitution_keys(candidate)
+            )
+        elif neighborhood == "substitution":
+            is_neighbor = False
+        elif len(candidate) == len(word) - 1:
+            is_neighbor = candidate in deletions
+        elif len(candidate) == len(word) + 1:
+            is_neighbor = word in get_deletions(candidate)
+        else:
+            is_neighbor = False
+        if is_neighbor:
+            neighbors.append(candidate)
+
+    return neighbors
+
+
+def _find_edit_neighbors(
+    word: str, lexicon: Container[str], alphabet: Iterable[str], neighborhood: str
+) -> Set[str]:
+    """Find the neighbors of a word in the lexicon by generating its edits."""
+
+    alphabet = list(alphabet)
+    edits = {
+        f"{word[:i]}{character}{word[i + 1:]}"
+        for i in range(len(word))
+        for character in alphabet
+    }
+    if neighborhood == "levenshtein":
+        edits.update(get_deletions(word))
+        edits.update(
+            f"{word[:i]}{character}{word[i:]}"
+            for i in range(len(word) + 1)
+            for character in alphabet
+        )
+    edits.discard(word)
+
+    return {edit for edit in edits if edit in lexicon}
+
+
+def update_neighbor_counts(
+    counts: Dict[str, int],
+    added: Iterable[str] = (),
+    removed: Iterable[str] = (),
+    neighborhood: str = "substitution",
+) -> None:
+    """Update the neighbor counts of a lexicon after adding or removing words.
+
+    The words are added or removed one at a time: the count of a word that is
+    added is the number of its neighbors in the lexicon, and the count of each
+    of those neighbors increases by one (removed words do the opposite).
+
+    Parameters
+    ----------
+    counts : Dict[str, int]
+        Number of neighbors of each distinct word of the lexicon (e.g., from
+        :func:`count_neighbors`), which is updated
+    added : Iterable[str]
+        words added to the lexicon; those that are already in it are ignored
+    removed : Iterable[str]
+        words removed from the lexicon; those that are not in it are ignored
+    neighborhood : str
+        "substitution" (Coltheart's N) or "levenshtein" (Levenshtein distance
+        1) (Default=substitution)
+
+    Raises
+    ------
+    ValueError
+        If the neighborhood is not valid.
+    """
+
+    if neighborhood not in NEIGHBORHOODS:
+        raise ValueError(
+            f"neighborhood must be one of {NEIGHBORHOODS}, not {neighborhood!r}"
+        )
+
+    added = [word for word in dict.fromkeys(added) if word not in counts]
+    removed = [word for word in dict.fromkeys(removed) if word in counts]
+    if not added and not removed:
+        return
+
+    # neighbors only differ from a word in characters of the lexicon
+    alphabet = set("".join(counts)).union(*added)
+    for word in removed:
+        del counts[word]
+        for neighbor in _find_edit_neighbors(word, counts, alphabet, neighborhood):
+            counts[neighbor] -= 1
+    for word in added:
+        neighbors = _find_edit_neighbors(word, counts, alphabet, neighborhood)
+        for neighbor in neighbors:
+            counts[neighbor] += 1
+        counts[word] = len(neighbors)
@@ -0,0 +1,377 @@
+"""Record word selection criteria and evaluate them lazily.
+
+A :class:`QueryPlan` stores the criteria selected on a lazy
+:class:`~stimpool.words.WordPool`. When the words are needed, the plan runs
+the cheapest criteria first, evaluates each criterion only on the words that
+survived the previous ones and materializes the resulting pool once.
+
+Criteria that can be answered from a :class:`~stimpool.features.FeatureIndex`
+run before all others, as an intersection of bitmaps over the base pool.
+"""
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from .features import pack_flags, popcount, unpack_flags
+from .instrumentation import NULL_STAGE, Instrumentation
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .compiled import StringColumnView
+
+# words are evaluated as arrays of strings; pd.Series are also accepted, and
+# the words of a StringColumnView are only decoded when the plan takes them
+Words = Union[np.ndarray, "pd.Series", "StringColumnView"]
+
+# relative cost per word of each kind of criterion; cheaper criteria run first
+COST_LENGTH = 1
+COST_CHARACTERS = 2
+COST_PATTERN = 3
+COST_SYLLABLES = 5
+COST_NEIGHBORS = 6
+COST_SYNONYMS = 8
+COST_PER_WORD = 10
+
+
+class Criterion(NamedTuple):
+    """Word selection criterion.
+
+    Attributes
+    ----------
+    name : str
+        Name of the selection (e.g., the WordPool method that created it)
+    func : Callable
+        Function that flags the words meeting the criterion.
+    how : str
+        Determines if words meeting the criterion should be kept or removed.
+    kwargs : Dict[str, Any]
+        Key-word args to pass to func
+    vectorized : bool
+        Specifies if func analyzes the whole pool at once. Otherwise, it is
+        called with each word.
+    cost : int
+        Relative cost per word, used to decide the evaluation order.
+    lookup : Callable
+        Function that gets the bitmap of the words in the base pool meeting
+        the criterion from a feature index (None if it can't be looked up).
+        It receives the same kwargs as func.
+    """
+
+    name: str
+    func: Callable
+    how: str = "keep"
+    kwargs: Dict[str, Any] = {}
+    vectorized: bool = False
+    cost: int = COST_PER_WORD
+    lookup: Optional[Callable] = None
+
+    def evaluate(self, pool: Union[np.ndarray, "pd.Series"]) -> np.ndarray:
+        """Flag the words that should be kept.
+
+        Parameters
+        ----------
+        pool : np.ndarray or pd.Series
+            words to be analyzed
+
+        Returns
+        -------
+        np.ndarray
+            True for the words that should be kept; False otherwise.
+
+        Raises
+        ------
+        ValueError
+            If how is not "keep" or "remove".
+        """
+
+        self._check_how()
+        if self.vectorized:
+            flags = self.func(pool, **self.kwargs)
+        else:
+            flags = [self.func(word, **self.kwargs) for word in pool]
+        flags_meeting_criterion = np.asarray(flags, dtype=bool)
+
+        if self.how == "keep":
+            return flags_meeting_criterion
+        else:
+            return ~flags_meeting_criterion
+
+    def intersect(self, bitmap: np.ndarray) -> np.ndarray:
+        """Keep only the words of the bitmap that should be kept.
+
+        Parameters
+        ----------
+        bitmap : np.ndarray
+            packed bitmap of words in the base pool
+
+        Returns
+        -------
+        np.ndarray
+            packed bitmap of the words that should be kept.
+
+        Raises
+        ------
+        ValueError
+            If the criterion can't be looked up in a feature index.
+        """
+
+        if self.lookup is None:
+            raise ValueError(f"{self.name} can't be looked up in a feature index")
+
+        self._check_how()
+        bitmap_meeting_criterion = self.lookup(**self.kwargs)
+        if self.how == "keep":
+            return bitmap & bitmap_meeting_criterion
+        else:
+            return bitmap & ~bitmap_meeting_criterion
+
+    def _check_how(self) -> None:
+        """Check that how is "keep" or "remove".
+
+        Raises
+        ------
+        ValueError
+            If how is not "keep" or "remove".
+        """
+
+        if self.how not in ("keep", "remove"):
+            raise ValueError(f"how must be 'keep' or 'remove', not {self.how!r}")
+
+    def describe(self) -> str:
+        """Describe the criterion as a call (e.g., "select(min_len=2)")."""
+
+        args = ", ".join(f"{key}={value!r}" for key, value in self.kwargs.items())
+
+        return f"{self.name}({args})"
+
+
+class StepStats(NamedTuple):
+    """Number of words before and after evaluating a criterion."""
+
+    criterion: Criterion
+    n_in: int
+    n_out: int
+
+    @property
+    def selectivity(self) -> float:
+        """Proportion of the words that met the criterion."""
+
+        if self.n_in == 0:
+            return 1.0
+
+        return self.n_out / self.n_in
+
+
+class QueryPlan(object):
+    """Criteria waiting to be evaluated on a word pool."""
+
+    def __init__(self) -> None:
+        """Create an empty query plan."""
+
+        self.criteria: List[Criterion] = []
+        self._result: Optional[Tuple[Words, np.ndarray, List[StepStats]]] = None
+
+    def __len__(self) -> int:
+        """Get the number of criteria in the plan."""
+
+        return len(self.criteria)
+
+    def add(self, criterion: Criterion) -> None:
+        """Add a criterion to the plan.
+
+        Parameters
+        ----------
+        criterion : Criterion
+            criterion to be added
+        """
+
+        self.criteria.append(criterion)
+        self._result = None
+
+    def clear(self) -> None:
+        """Remove all the criteria from the plan."""
+
+        self.criteria = []
+        self._result = None
+
+    def pop(self) -> Criterion:
+        """Remove the last criterion added to the plan.
+
+        Returns
+        -------
+        Criterion
+        """
+
+        self._result = None
+
+        return self.criteria.pop()
+
+    def copy(self) -> "QueryPlan":
+        """Create a plan with the same criteria.
+
+        Returns
+        -------
+        QueryPlan
+        """
+
+        plan = QueryPlan()
+        plan.criteria = list(self.criteria)
+
+        return plan
+
+    def optimize(self, indexed: bool = False) -> List[Criterion]:
+        """Order the criteria so the cheapest are evaluated first.
+
+        All criteria flag words independently, so the order doesn't change the
+        result. Criteria with the same cost keep the order they were added in.
+
+        Parameters
+        ----------
+        indexed : bool
+            Specifies if criteria that can be looked up in a feature index
+            should go first (Default=False)
+
+        Returns
+        -------
+        criteria : List[Criterion]
+        """
+
+        def _sort_key(criterion: Criterion) -> Tuple[bool, int]:
+            is_looked_up = indexed and criterion.lookup is not None
+            return (not is_looked_up, criterion.cost)
+
+        return sorted(self.criteria, key=_sort_key)
+
+    def evaluate(
+        self,
+        pool: Words,
+        n_base: Optional[int] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        positions_base: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, List[StepStats]]:
+        """Flag the words that meet every criterion in the plan.
+
+        Each criterion is only evaluated on the words that met the previous
+        criteria, and no intermediate pools are created.
+
+        Parameters
+        ----------
+        pool : np.ndarray, pd.Series or StringColumnView
+            words to be analyzed
+        n_base : int
+            Number of words in the base pool, if the pool has a feature index
+            (the default is None, no index).
+        instrumentation : Instrumentation
+            Records each step as the stage "select:<name>" (the default is
+            None, no instrumentation)
+        positions_base : np.ndarray
+            Position of each word in the base pool, used with the feature
+            index (the default is None, use the index of the pool)
+
+        Returns
+        -------
+        flags : np.ndarray
+            True for the words meeting every criterion; False otherwise.
+        steps : List[StepStats]
+            Number of words before and after each criterion.
+        """
+
+        if self._result is not None and self._result[0] is pool:
+            return self._result[1], self._result[2]
+
+        criteria = self.optimize(indexed=n_base is not None)
+        steps: List[StepStats] = []
+
+        if n_base is not None and criteria and criteria[0].lookup is not None:
+            if positions_base is None:
+                positions_base = pool.index.to_numpy()  # type: ignore
+            flags_base = np.zeros(n_base, dtype=bool)
+            flags_base[positions_base] = True
+            bitmap = pack_flags(flags_base)
+            while criteria and criteria[0].lookup is not None:
+                criterion = criteria.pop(0)
+                n_in = popcount(bitmap)
+                with self._stage(instrumentation, criterion, n_in) as stage:
+                    bitmap = criterion.intersect(bitmap)
+                    stage.n_out = popcount(bitmap)
+                steps.append(StepStats(criterion, n_in, popcount(bitmap)))
+            flags_base = unpack_flags(bitmap, n_base)
+            positions = np.flatnonzero(flags_base[positions_base])
+        else:
+            positions = np.arange(len(pool))
+
+        for criterion in criteria:
+            n_in = len(positions)
+            with self._stage(instrumentation, criterion, n_in) as stage:
+                if n_in > 0:
+                    positions = positions[criterion.evaluate(pool.take(positions))]
+                stage.n_out = len(positions)
+            steps.append(StepStats(criterion, n_in, len(positions)))
+
+        flags = np.zeros(len(pool), dtype=bool)
+        flags[positions] = True
+        self._result = (pool, flags, steps)
+
+        return flags, steps
+
+    @staticmethod
+    def _stage(
+        instrumentation: Optional[Instrumentation], criterion: Criterion, n_in: int
+    ) -> Any:
+        """Measure the evaluation of a criterion if there is instrumentation."""
+
+        if instrumentation is None:
+            return NULL_STAGE
+
+        return instrumentation.stage(f"select:{criterion.name}", n_in)
+
+    def explain(
+        self,
+        pool: Words,
+        n_base: Optional[int] = None,
+        positions_base: Optional[np.ndarray] = None,
+    ) -> str:
+        """Describe the plan and the selectivity of each of its steps.
+
+        Parameters
+        ----------
+        pool : np.ndarray, pd.Series or StringColumnView
+            words the plan will be evaluated on
+        n_base : int
+            Number of words in the base pool, if the pool has a feature index
+            (the default is None, no index).
+        positions_base : np.ndarray
+            Position of each word in the base pool (the default is None, use
+            the index of the pool)
+
+        Returns
+        -------
+        str
+            One line per step, in evaluation order.
+        """
+
+        _, steps = self.evaluate(pool, n_base, positions_base=positions_base)
+        lines = [f"QueryPlan over {len(pool)} words"]
+        for i, step in enumerate(steps, start=1):
+            criterion = step.criterion
+            method = "index" if n_base and criterion.lookup else "scan"
+            lines.append(
+                f"  {i}. {criterion.describe()} [{method}, cost={criterion.cost}]: "
+                f"{step.n_in} -> {step.n_out} words ({step.selectivity:.1%})"
+            )
+        n_words = steps[-1].n_out if steps else len(pool)
+        lines.append(f"Result: {n_words} words")
+
+        return "\n".join(lines)
@@ -0,0 +1,297 @@
+"""Index the prefixes and suffixes of the words for fast lookups.
+
+A :class:`PrefixIndex` keeps the positions of the words of a
+:class:`~stimpool.compiled.StringColumn` in lexicographic order, and the
+positions in the order of the reversed words. The words that share a prefix
+are contiguous in the first order, as in the leaves of a prefix trie, and the
+words that share a suffix are contiguous in the second one. Both ranges are
+found through bisection, decoding only the words that are compared, so
+queries take time proportional to the number of matches instead of the size
+of the pool.
+"""
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Tuple
+
+import numpy as np
+
+from .features import pack_positions
+
+if TYPE_CHECKING:
+    from .compiled import StringColumn
+
+
+class PrefixIndex(object):
+    """Words of a string column sorted by their prefixes and suffixes."""
+
+    def __init__(
+        self, column: "StringColumn", order: np.ndarray, order_reversed: np.ndarray
+    ) -> None:
+        """Create a prefix index.
+
+        Parameters
+        ----------
+        column : StringColumn
+            words of the pool
+        order : np.ndarray
+            Positions of the words sorted lexicographically
+        order_reversed : np.ndarray
+            Positions of the words sorted by their reversed form
+        """
+
+        self.column = column
+        self.order = order
+        self.order_reversed = order_reversed
+
+    @property
+    def n_words(self) -> int:
+        """Number of words in the pool."""
+
+        return len(self.column)
+
+    @classmethod
+    def from_column(cls, column: "StringColumn") -> "PrefixIndex":
+        """Sort the words of a column by their prefixes and suffixes.
+
+        Parameters
+        ----------
+        column : StringColumn
+            words of the pool
+
+        Returns
+        -------
+        PrefixIndex
+        """
+
+        words = np.empty(len(column), dtype=object)
+        words[:] = column.to_list()
+        order = np.argsort(words, kind="stable")
+        words[:] = [word[::-1] for word in words]
+        order_reversed = np.argsort(words, kind="stable")
+
+        return cls(column, order, order_reversed)
+
+    @classmethod
+    def load(cls, directory: Path, column: "StringColumn") -> "PrefixIndex":
+        """Memory-map a prefix index saved with :meth:`save`.
+
+        Parameters
+        ----------
+        directory : Path
+            Directory where the index was saved
+        column : StringColumn
+            words of the pool the index was built from
+
+        Returns
+        -------
+        PrefixIndex
+
+        Raises
+        ------
+        ValueError
+            If the index doesn't have one position per word of the column.
+        """
+
+        orders = np.load(directory / "prefixes.orders.npy", mmap_mode="r")
+        if orders.shape != (2, len(column)):
+            raise ValueError("The prefix index doesn't match the column")
+
+        return cls(column, orders[0], orders[1])
+
+    def save(self, directory: Path) -> None:
+        """Save the prefix index as a .npy file that can be memory-mapped.
+
+        Parameters
+        ----------
+        directory : Path
+            Directory where the index will be saved
+        """
+
+        np.save(
+            directory / "prefixes.orders.npy",
+            np.stack([self.order, self.order_reversed]),
+        )
+
+    def append(self, column: "StringColumn") -> "PrefixIndex":
+        """Create an index of a column with words added after the indexed ones.
+
+        The new words are sorted among themselves and their places in the
+        orders are found through bisection, so the words already indexed are
+        not sorted again.
+
+        Parameters
+        ----------
+        column : StringColumn
+            words of the pool, starting with the words of this index
+
+        Returns
+        -------
+        PrefixIndex
+        """
+
+        n_words = self.n_words
+        words_added = np.empty(len(column) - n_words, dtype=object)
+        words_added[:] = column.take(np.arange(n_words, len(column))).tolist()
+        orders = []
+        for order, reverse in ((self.order, False), (self.order_reversed, True)):
+            keys = words_added
+            if reverse:
+                keys = np.array([word[::-1] for word in words_added], dtype=object)
+            order_added = np.argsort(keys, kind="stable")
+            insert_at = [
+                self._bisect_word(order, keys[i], reverse) for i in order_added
+            ]
+            orders.append(np.insert(order, insert_at, order_added + n_words))
+
+        return PrefixIndex(column, orders[0], orders[1])
+
+    def keep(self, flags: np.ndarray, column: "StringColumn") -> "PrefixIndex":
+        """Create an index with only the words flagged.
+
+        Parameters
+        ----------
+        flags : np.ndarray
+            one boolean flag per word, True for the words kept
+        column : StringColumn
+            words of the pool that are kept
+
+        Returns
+        -------
+        PrefixIndex
+        """
+
+        flags = np.asarray(flags, dtype=bool)
+        positions_new = np.cumsum(flags) - 1
+        orders = [
+            positions_new[order[flags[order]]]
+            for order in (np.asarray(self.order), np.asarray(self.order_reversed))
+        ]
+
+        return PrefixIndex(column, orders[0], orders[1])
+
+    def positions_with_prefix(self, prefix: str) -> np.ndarray:
+        """Find the words that start with the prefix.
+
+        Parameters
+        ----------
+        prefix : str
+            prefix to look for
+
+        Returns
+        -------
+        np.ndarray
+            Positions of the words, sorted.
+        """
+
+        start, stop = self._find_range(self.order, prefix, reverse=False)
+
+        return np.sort(self.order[start:stop])
+
+    def positions_with_suffix(self, suffix: str) -> np.ndarray:
+        """Find the words that end with the suffix.
+
+        Parameters
+        ----------
+        suffix : str
+            suffix to look for
+
+        Returns
+        -------
+        np.ndarray
+            Positions of the words, sorted.
+        """
+
+        start, stop = self._find_range(self.order_reversed, suffix[::-1], reverse=True)
+
+        return np.sort(self.order_reversed[start:stop])
+
+    def bitmap_with_prefix(self, prefix: str) -> np.ndarray:
+        """Get the bitmap of the words that start with the prefix.
+
+        Parameters
+        ----------
+        prefix : str
+            prefix to look for
+
+        Returns
+        -------
+        np.ndarray
+            packed bitmap (uint8)
+        """
+
+        start, stop = self._find_range(self.order, prefix, reverse=False)
+
+        return pack_positions(self.order[start:stop], self.n_words)
+
+    def bitmap_with_suffix(self, suffix: str) -> np.ndarray:
+        """Get the bitmap of the words that end with the suffix.
+
+        Parameters
+        ----------
+        suffix : str
+            suffix to look for
+
+        Returns
+        -------
+        np.ndarray
+            packed bitmap (uint8)
+        """
+
+        start, stop = self._find_range(self.order_reversed, suffix[::-1], reverse=True)
+
+        return pack_positions(self.order_reversed[start:stop], self.n_words)
+
+    def _find_range(
+        self, order: np.ndarray, key: str, reverse: bool
+    ) -> Tuple[int, int]:
+        """Find the range of the order where the words start with the key.
+
+        Words are truncated to the length of the key, which keeps them
+        sorted, so the range is found with two bisections.
+        """
+
+        start = self._bisect(order, key, reverse, side="left")
+        stop = self._bisect(order, key, reverse, side="right", start=start)
+
+        return start, stop
+
+    def _bisect(
+        self,
+        order: np.ndarray,
+        key: str,
+        reverse: bool,
+        side: str,
+        start: int = 0,
+    ) -> int:
+        """Find where the key would be inserted among the truncated words."""
+
+        n_characters = len(key)
+        low, high = start, len(order)
+        while low < high:
+            middle = (low + high) // 2
+            word = self.column[int(order[middle])]
+            if reverse:
+                word = word[::-1]
+            word = word[:n_characters]
+            if word < key or (side == "right" and word == key):
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def _bisect_word(self, order: np.ndarray, word: str, reverse: bool) -> int:
+        """Find where the word would be inserted after the equal words."""
+
+        low, high = 0, len(order)
+        while low < high:
+            middle = (low + high) // 2
+            other = self.column[int(order[middle])]
+            if reverse:
+                other = other[::-1]
+            if word < other:
+                high = middle
+            else:
+                low = middle + 1
+
+        return low
@@ -0,0 +1,248 @@
+"""Draw reproducible samples of positions from a word pool.
+
+Samples are drawn with NumPy :class:`~numpy.random.Generator` objects backed
+by Philox, a counter-based bit generator. The key of the generator is derived
+from the seed, and sample ``i`` of a call always uses the substream ``i``: the
+counters whose highest word is ``i``, which never overlap with those of other
+substreams. A sample doesn't depend on how many samples are drawn with it or
+on how they are split across worker processes, so drawing the samples in
+shards, in parallel, gives exactly the same samples as drawing them all at
+once.
+
+Samples can be independent (each sample is drawn without replacement, but a
+word can appear in several samples) or mutually non-overlapping (each word
+appears in at most one sample). Non-overlapping samples are the consecutive
+slices of a single permutation of the pool.
+
+Stratified samples draw a quota of words from each stratum (e.g., each
+combination of length and number of syllables). Every word gets a random key
+and the words with the smallest keys of each stratum are drawn, so all the
+strata are drawn in a single sort.
+"""
+
+import multiprocessing
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_SEED = 1
+# samples drawn by each task when they are drawn in parallel
+SHARD_SIZE = 256
+
+
+def get_generator(
+    seed: Optional[int] = DEFAULT_SEED, stream: int = 0
+) -> np.random.Generator:
+    """Get the generator of a substream of the seed.
+
+    Parameters
+    ----------
+    seed : int
+        Seed of the samples (Default=1). None uses fresh entropy from the OS,
+        so the samples are not reproducible.
+    stream : int
+        Number of the substream (Default=0)
+
+    Returns
+    -------
+    np.random.Generator
+    """
+
+    return _get_substream(_get_key(seed), stream)
+
+
+def _get_key(seed: Optional[int]) -> np.ndarray:
+    """Derive the Philox key of a seed."""
+
+    return np.random.SeedSequence(seed).generate_state(2, np.uint64)
+
+
+def _get_substream(key: np.ndarray, stream: int) -> np.random.Generator:
+    """Get the generator of the counters whose highest word is stream."""
+
+    return np.random.Generator(np.random.Philox(counter=[0, 0, 0, stream], key=key))
+
+
+def _draw_shard(task: Tuple[int, int, Optional[int], int, int]) -> np.ndarray:
+    """Draw the independent samples from start to stop of a seed."""
+
+    n_population, n, seed, start, stop = task
+    key = _get_key(seed)
+    samples = np.empty((stop - start, n), dtype=np.int64)
+    for i, stream in enumerate(range(start, stop)):
+        generator = _get_substream(key, stream)
+        samples[i] = generator.choice(n_population, size=n, replace=False)
+
+    return samples
+
+
+def draw_samples(
+    n_population: int,
+    n: int,
+    n_samples: int = 1,
+    seed: Optional[int] = DEFAULT_SEED,
+    overlap: bool = True,
+    processes: Optional[int] = None,
+) -> np.ndarray:
+    """Draw samples of positions of a pool without replacement.
+
+    Parameters
+    ----------
+    n_population : int
+        Number of words in the pool
+    n : int
+        sample size
+    n_samples : int
+        Number of samples (Default=1)
+    seed : int
+        Seed of the samples (Default=1). None uses fresh entropy from the OS,
+        so the samples are not reproducible.
+    overlap : bool
+        Specifies if a word can appear in several samples. Otherwise, the
+        samples don't share any word (Default=True)
+    processes : int
+        Number of worker processes that draw independent samples, SHARD_SIZE
+        samples at a time. The samples don't depend on it (the default is
+        None, draw them in this process)
+
+    Returns
+    -------
+    np.ndarray
+        Positions of the words of each sample, one row per sample (int64)
+
+    Raises
+    ------
+    ValueError
+        If a sample is larger than the pool, or the samples don't overlap and
+        they are larger than the pool together.
+    """
+
+    if n < 0 or n_samples < 0:
+        raise ValueError("n and n_samples can't be negative")
+    if n > n_population:
+        raise ValueError(f"Can't draw {n} words from a pool of {n_population}")
+
+    if seed is None:
+        # all the shards have to use the same entropy
+        seed = int(np.random.SeedSequence().entropy)  # type: ignore
+
+    if not overlap:
+        if n * n_samples > n_population:
+            raise ValueError(
+                f"Can't draw {n_samples} samples of {n} different words from a "
+                f"pool of {n_population}"
+            )
+        permutation = get_generator(seed).permutation(n_population)
+        return permutation[: n * n_samples].reshape(n_samples, n)
+
+    tasks = [
+        (n_population, n, seed, start, min(start + SHARD_SIZE, n_samples))
+        for start in range(0, n_samples, SHARD_SIZE)
+    ]
+    if processes is None or processes <= 1 or len(tasks) <= 1:
+        shards = list(map(_draw_shard, tasks))
+    else:
+        with multiprocessing.Pool(processes) as process_pool:
+            shards = process_pool.map(_draw_shard, tasks)
+
+    if not shards:
+        return np.zeros((0, n), dtype=np.int64)
+
+    return np.concatenate(shards)
+
+
+def allocate_quotas(
+    sizes: np.ndarray,
+    n: int,
+    allocation: str = "proportional",
+    labels: Optional[Sequence[str]] = None,
+) -> np.ndarray:
+    """Allocate the sample size among the strata.
+
+    Parameters
+    ----------
+    sizes : np.ndarray
+        Number of words in each stratum
+    n : int
+        Sample size: the total for proportional allocation, or the size of
+        each stratum for fixed allocation
+    allocation : str
+        "proportional" (the quota of each stratum is proportional to its
+        size; remainders go to the largest fractions, i.e., Hamilton's
+        method) or "fixed" (n words per stratum) (Default=proportional)
+    labels : Sequence[str]
+        Description of each stratum, used in errors (the default is None, use
+        the number of the stratum)
+
+    Returns
+    -------
+    np.ndarray
+        Number of words drawn from each stratum (int64)
+
+    Raises
+    ------
+    ValueError
+        If the allocation is not valid or a stratum is smaller than its quota.
+    """
+
+    sizes = np.asarray(sizes, dtype=np.int64)
+    if allocation == "fixed":
+        quotas = np.full(len(sizes), n, dtype=np.int64)
+    elif allocation == "proportional":
+        if n > sizes.sum():
+            raise ValueError(f"Can't draw {n} words from a pool of {sizes.sum()}")
+        shares = n * sizes / max(sizes.sum(), 1)
+        quotas = np.floor(shares).astype(np.int64)
+        remainders = np.argsort(quotas - shares, kind="stable")
+        quotas[remainders[: n - quotas.sum()]] += 1
+    else:
+        raise ValueError(
+            f"allocation must be 'proportional' or 'fixed', not {allocation!r}"
+        )
+
+    too_small = np.flatnonzero(quotas > sizes)
+    if len(too_small) > 0:
+        stratum = too_small[0]
+        label = labels[stratum] if labels is not None else stratum
+        raise ValueError(
+            f"Can't draw {quotas[stratum]} words from stratum {label}, which "
+            f"has {sizes[stratum]}"
+        )
+
+    return quotas
+
+
+def draw_stratified(
+    strata: np.ndarray,
+    quotas: np.ndarray,
+    seed: Optional[int] = DEFAULT_SEED,
+) -> np.ndarray:
+    """Draw a sample with a quota of words from each stratum.
+
+    Every word gets a random key, and the words of each stratum with the
+    smallest keys are drawn, so all the strata are drawn at once.
+
+    Parameters
+    ----------
+    strata : np.ndarray
+        Stratum of each word of the pool, numbered from 0
+    quotas : np.ndarray
+        Number of words drawn from each stratum
+    seed : int
+        Seed of the sample (Default=1). None uses fresh entropy from the OS,
+        so the sample is not reproducible.
+
+    Returns
+    -------
+    np.ndarray
+        Positions of the words drawn, grouped by stratum (int64)
+    """
+
+    strata = np.asarray(strata, dtype=np.int64)
+    keys = get_generator(seed).random(len(strata))
+    order = np.lexsort((keys, strata))
+    strata_sorted = strata[order]
+    starts = np.searchsorted(strata_sorted, np.arange(len(quotas)))
+    ranks = np.arange(len(strata)) - starts[strata_sorted]
+
+    return order[ranks < np.asarray(quotas)[strata_sorted]].astype(np.int64)
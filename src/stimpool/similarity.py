@@ -0,0 +1,363 @@
+"""Find words that are similar to others, measured by their edit distance.
+
+A :class:`BKTree` indexes the distinct words of a pool by their Levenshtein
+distance to pivot words. Because the distance is a metric, a search for the
+words within a distance of a query only descends into the children whose
+distance to the pivot is compatible with it (triangle inequality), so it
+compares the query with a small part of the pool.
+
+The tree is bulk-loaded: the distance of a pivot to all the words below it is
+computed at once with :func:`levenshtein_to_many`, which runs the dynamic
+programming of the Levenshtein distance for many words at the same time in
+NumPy. Subtrees with few words are kept as leaves that are also compared at
+once. Words added later are inserted one at a time, splitting the leaves that
+grow beyond the leaf size, and removed words are only marked as such.
+"""
+
+import copy
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Union
+
+import numpy as np
+
+from .vectorized import to_object_array
+
+# maximum number of words in a leaf of the tree
+LEAF_SIZE = 64
+
+
+def levenshtein(word: str, other: str) -> int:
+    """Get the Levenshtein distance between two words.
+
+    Parameters
+    ----------
+    word : str
+    other : str
+
+    Returns
+    -------
+    int
+        Minimum number of insertions, deletions and substitutions of
+        characters needed to turn word into other.
+    """
+
+    if len(word) < len(other):
+        word, other = other, word
+
+    previous = list(range(len(other) + 1))
+    for i, character in enumerate(word, start=1):
+        current = [i]
+        for j, character_other in enumerate(other, start=1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (character != character_other),
+                )
+            )
+        previous = current
+
+    return previous[-1]
+
+
+def encode_words(words: Union[Sequence[str], np.ndarray]) -> np.ndarray:
+    """Encode the words as a matrix of code points, one row per word.
+
+    Parameters
+    ----------
+    words : Sequence[str] or np.ndarray
+
+    Returns
+    -------
+    np.ndarray
+        Code points of each word, padded with zeros (uint32)
+    """
+
+    n_columns = max(map(len, words), default=0)
+    text = "".join(word.ljust(n_columns, "\x00") for word in words)
+    codes = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+
+    return codes.reshape(len(words), n_columns)
+
+
+def levenshtein_to_many(
+    word: str, codes: np.ndarray, lengths: np.ndarray
+) -> np.ndarray:
+    """Get the Levenshtein distance between a word and many words at once.
+
+    Each row of the dynamic programming table is computed for all the words
+    at the same time. Insertions depend on the cell to their left, so they
+    are resolved with a cumulative minimum over the row.
+
+    Parameters
+    ----------
+    word : str
+        word to be compared
+    codes : np.ndarray
+        code points of the words, from :func:`encode_words`
+    lengths : np.ndarray
+        length of each word
+
+    Returns
+    -------
+    np.ndarray
+        Distance to each word (int64)
+    """
+
+    n_columns = int(lengths.max(initial=0))
+    codes = codes[:, :n_columns]
+    columns = np.arange(n_columns + 1)
+    previous = np.broadcast_to(columns, (len(codes), n_columns + 1))
+    for i, character in enumerate(word, start=1):
+        costs = codes != ord(character)
+        current = np.empty_like(previous)
+        current[:, 0] = i
+        np.minimum(previous[:, 1:] + 1, previous[:, :-1] + costs, out=current[:, 1:])
+        current = np.minimum.accumulate(current - columns, axis=1) + columns
+        previous = current
+
+    return previous[np.arange(len(codes)), lengths].astype(np.int64)
+
+
+class BKTree(object):
+    """Burkhard-Keller tree of words with bucketed leaves.
+
+    Each node is either a pivot word with one child per distance to the pivot,
+    or a leaf with the positions of up to LEAF_SIZE words.
+    """
+
+    def __init__(self, words: Iterable[str], leaf_size: int = LEAF_SIZE) -> None:
+        """Build the tree.
+
+        Parameters
+        ----------
+        words : Iterable[str]
+            words to be indexed; repeated words are indexed once
+        leaf_size : int
+            Maximum number of words in a leaf (Default=64)
+        """
+
+        self.words = to_object_array(dict.fromkeys(words))
+        self.lengths = np.fromiter(
+            map(len, self.words), dtype=np.int64, count=len(self.words)
+        )
+        self.leaf_size = leaf_size
+        self._codes = encode_words(self.words)
+        self._removed = np.zeros(len(self.words), dtype=bool)
+        self._positions: Optional[Dict[str, int]] = None
+        self.pivots: List[int] = []
+        self.children: List[Dict[int, int]] = []
+        self.leaves: List[np.ndarray] = []
+
+        if len(self.words) > 0:
+            empty = np.zeros(0, dtype=np.int64)
+            self._build(np.arange(len(self.words)), self._add_node(-1, empty))
+
+    def __len__(self) -> int:
+        """Get the number of distinct words in the tree."""
+
+        return len(self.words) - int(self._removed.sum())
+
+    def copy(self) -> "BKTree":
+        """Create a copy of the tree that can be changed independently.
+
+        Returns
+        -------
+        BKTree
+        """
+
+        tree = copy.copy(self)
+        tree.pivots = list(self.pivots)
+        tree.children = [dict(children) for children in self.children]
+        tree.leaves = list(self.leaves)
+        tree._removed = self._removed.copy()
+        tree._positions = None
+
+        return tree
+
+    def add(self, words: Iterable[str]) -> None:
+        """Add words to the tree; words that are already in it are ignored.
+
+        Parameters
+        ----------
+        words : Iterable[str]
+            words to be added
+        """
+
+        positions = self._get_positions()
+        words_new = []
+        for word in dict.fromkeys(words):
+            if word in positions:
+                self._removed[positions[word]] = False
+            else:
+                words_new.append(word)
+        if not words_new:
+            return
+
+        start = len(self.words)
+        self.words = np.concatenate([self.words, to_object_array(words_new)])
+        self.lengths = np.concatenate(
+            [self.lengths, np.fromiter(map(len, words_new), np.int64, len(words_new))]
+        )
+        codes_new = encode_words(words_new)
+        n_columns = max(self._codes.shape[1], codes_new.shape[1])
+        self._codes = np.concatenate(
+            [
+                np.pad(self._codes, ((0, 0), (0, n_columns - self._codes.shape[1]))),
+                np.pad(codes_new, ((0, 0), (0, n_columns - codes_new.shape[1]))),
+            ]
+        )
+        self._removed = np.concatenate(
+            [self._removed, np.zeros(len(words_new), dtype=bool)]
+        )
+        for position, word in enumerate(words_new, start=start):
+            positions[word] = position
+            self._insert(position)
+
+    def discard(self, words: Iterable[str]) -> None:
+        """Remove words from the tree; words that are not in it are ignored.
+
+        The words are only marked as removed, so the tree is not rebuilt.
+
+        Parameters
+        ----------
+        words : Iterable[str]
+            words to be removed
+        """
+
+        positions = self._get_positions()
+        removed = [positions[word] for word in words if word in positions]
+        self._removed[removed] = True
+
+    def _get_positions(self) -> Dict[str, int]:
+        """Get the position of each word, indexing them the first time."""
+
+        if self._positions is None:
+            self._positions = {word: i for i, word in enumerate(self.words)}
+
+        return self._positions
+
+    def _insert(self, position: int) -> None:
+        """Insert the word at the position into the tree."""
+
+        leaf = np.array([position], dtype=np.int64)
+        if not self.pivots:
+            self._add_node(-1, leaf)
+            return
+
+        word = self.words[position]
+        node = 0
+        while self.pivots[node] >= 0:
+            distance = levenshtein(word, self.words[self.pivots[node]])
+            child = self.children[node].get(distance)
+            if child is None:
+                self.children[node][distance] = self._add_node(-1, leaf)
+                return
+            node = child
+
+        positions = np.append(self.leaves[node], position)
+        if len(positions) > self.leaf_size:
+            self._build(positions, node)
+        else:
+            self.leaves[node] = positions
+
+    def _add_node(self, pivot: int, leaf: np.ndarray) -> int:
+        """Add a node and get its number."""
+
+        self.pivots.append(pivot)
+        self.children.append({})
+        self.leaves.append(leaf)
+
+        return len(self.pivots) - 1
+
+    def _build(self, positions: np.ndarray, node: int) -> None:
+        """Bulk-load the subtree of a leaf node with the words at the positions."""
+
+        empty = np.zeros(0, dtype=np.int64)
+        stack = [(positions, node)]
+        while stack:
+            positions, node = stack.pop()
+            if len(positions) <= self.leaf_size:
+                self.leaves[node] = positions
+                continue
+
+            pivot, positions = int(positions[0]), positions[1:]
+            self.pivots[node] = pivot
+            self.leaves[node] = empty
+            distances = self._distances(self.words[pivot], positions)
+            order = np.argsort(distances, kind="stable")
+            bounds = np.flatnonzero(np.diff(distances[order])) + 1
+            for group in np.split(order, bounds):
+                child = self._add_node(-1, empty)
+                self.children[node][int(distances[group[0]])] = child
+                stack.append((positions[group], child))
+
+    def _distances(self, word: str, positions: np.ndarray) -> np.ndarray:
+        """Get the distance between word and the words at the positions."""
+
+        return levenshtein_to_many(
+            word, self._codes[positions], self.lengths[positions]
+        )
+
+    def search(self, word: str, max_distance: int) -> np.ndarray:
+        """Find the words within a distance of word.
+
+        Parameters
+        ----------
+        word : str
+            word to be compared
+        max_distance : int
+            maximum Levenshtein distance
+
+        Returns
+        -------
+        np.ndarray
+            Positions in :attr:`words` of the words found, sorted.
+        """
+
+        if len(self.words) == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        pivots_found = []
+        leaves = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            pivot = self.pivots[node]
+            if pivot < 0:
+                leaves.append(self.leaves[node])
+                continue
+
+            distance = levenshtein(word, self.words[pivot])
+            if distance <= max_distance:
+                pivots_found.append(pivot)
+            for child_distance, child in self.children[node].items():
+                if abs(child_distance - distance) <= max_distance:
+                    stack.append(child)
+
+        # the words of all the leaves reached are compared at once
+        candidates = np.concatenate(leaves + [np.zeros(0, dtype=np.int64)])
+        found = candidates[self._distances(word, candidates) <= max_distance]
+        found = np.sort(np.concatenate([found, pivots_found])).astype(np.int64)
+
+        return found[~self._removed[found]]
+
+    def find_similar(self, words: Iterable[str], max_distance: int) -> Set[str]:
+        """Find the words within a distance of any of the words.
+
+        Parameters
+        ----------
+        words : Iterable[str]
+            words to be compared
+        max_distance : int
+            maximum Levenshtein distance
+
+        Returns
+        -------
+        Set[str]
+        """
+
+        similar: Set[str] = set()
+        for word in words:
+            similar.update(self.words[self.search(word, max_distance)])
+
+        return similar
@@ -0,0 +1,238 @@
+"""Look up synonyms in the thesaurus of LibreOffice.
+
+The package includes the Spanish thesaurus of LibreOffice. ``th_es_v2.dat``
+stores the meanings of each word and ``th_es_v2.idx`` stores the byte offset
+of each word in ``th_es_v2.dat``. :class:`Thesaurus` memory-maps the data file
+and keeps the index as a sorted column of words with their offsets, so looking
+up a word only bisects the index and reads the entry at its offset.
+"""
+
+import mmap
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .compiled import StringColumn
+
+ROOT_DIR = Path(__file__).resolve().parent
+DEFAULT_DATA_PATH = ROOT_DIR / "words" / "th_es_v2.dat"
+DEFAULT_INDEX_PATH = ROOT_DIR / "words" / "th_es_v2.idx"
+
+# usage notes of synonyms, e.g., "gato (fig.)"
+PATTERN_NOTE = re.compile(r"\s*\([^)]*\)")
+
+
+class Meaning(NamedTuple):
+    """Meaning of a word in the thesaurus.
+
+    Attributes
+    ----------
+    part_of_speech : str
+        Part of speech of the meaning ("-" if it is not specified)
+    synonyms : List[str]
+        Words and expressions with the meaning
+    """
+
+    part_of_speech: str
+    synonyms: List[str]
+
+
+class Thesaurus(object):
+    """Synonyms of the words in a thesaurus (MyThes format)."""
+
+    def __init__(
+        self, data_path: Path = DEFAULT_DATA_PATH, index_path: Path = DEFAULT_INDEX_PATH
+    ) -> None:
+        """Memory-map the data file and load the index of the thesaurus.
+
+        Parameters
+        ----------
+        data_path : Path
+            thesaurus data (the default is th_es_v2.dat). Its first line is
+            the encoding.
+        index_path : Path
+            byte offset of each word in the data file (the default is
+            th_es_v2.idx). Its first lines are the encoding and the number
+            of words.
+        """
+
+        with open(data_path, "rb") as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.encoding = self._data.readline().decode("ascii").strip()
+
+        with open(index_path, encoding=self.encoding) as file:
+            next(file, None)
+            next(file, None)
+            entries = []
+            for line in file:
+                word, _, offset = line.rstrip("\n").rpartition("|")
+                if word:
+                    entries.append((word.lower(), int(offset)))
+        entries.sort()
+
+        self.words = StringColumn.from_words(word for word, _ in entries)
+        self.offsets = np.fromiter(
+            (offset for _, offset in entries), dtype=np.int64, count=len(entries)
+        )
+
+    def __len__(self) -> int:
+        """Get the number of words in the thesaurus."""
+
+        return len(self.words)
+
+    def __contains__(self, word: object) -> bool:
+        """Check if the word is in the thesaurus."""
+
+        return isinstance(word, str) and self._find(word) is not None
+
+    def _find(self, word: str) -> Optional[int]:
+        """Get the byte offset of a word in the data file (None if missing)."""
+
+        position = bisect_left(self.words, word)  # type: ignore
+        if position < len(self.words) and self.words[position] == word:
+            return int(self.offsets[position])
+
+        return None
+
+    def get_meanings(self, word: str) -> List[Meaning]:
+        """Get the meanings of a word.
+
+        Parameters
+        ----------
+        word : str
+            normalized word
+
+        Returns
+        -------
+        List[Meaning]
+            Meanings of the word (empty if the word is not in the thesaurus).
+        """
+
+        offset = self._find(word)
+        if offset is None:
+            return []
+
+        line, offset = self._read_line(offset)
+        _, _, n_meanings = line.rpartition("|")
+        meanings = []
+        for _ in range(int(n_meanings)):
+            line, offset = self._read_line(offset)
+            fields = line.split("|")
+            meanings.append(Meaning(fields[0], fields[1:]))
+
+        return meanings
+
+    def _read_line(self, offset: int) -> Tuple[str, int]:
+        """Read the line of the data file that starts at the offset.
+
+        Returns
+        -------
+        line : str
+            decoded line without the newline
+        offset : int
+            offset of the next line
+        """
+
+        end = self._data.find(b"\n", offset)
+        if end == -1:
+            end = len(self._data)
+
+        return self._data[offset:end].decode(self.encoding).rstrip("\r"), end + 1
+
+    def get_synonyms(self, word: str) -> List[str]:
+        """Get the synonyms of a word in every meaning.
+
+        Parameters
+        ----------
+        word : str
+            normalized word
+
+        Returns
+        -------
+        List[str]
+            Normalized synonyms in the order they appear, without usage notes,
+            duplicates or the word itself.
+        """
+
+        synonyms: Dict[str, None] = {}
+        for meaning in self.get_meanings(word):
+            for synonym in meaning.synonyms:
+                synonyms[PATTERN_NOTE.sub("", synonym).strip().lower()] = None
+        synonyms.pop(word, None)
+
+        return list(synonyms)
+
+    def get_synonyms_pool(self, words: Iterable[str]) -> List[List[str]]:
+        """Get the synonyms of all the words.
+
+        Parameters
+        ----------
+        words : Iterable[str]
+            normalized words
+
+        Returns
+        -------
+        List[List[str]]
+        """
+
+        return [self.get_synonyms(word) for word in words]
+
+    def count_synonyms_pool(self, words: Sequence[str]) -> np.ndarray:
+        """Count the synonyms of all the words.
+
+        Parameters
+        ----------
+        words : Sequence[str]
+            normalized words
+
+        Returns
+        -------
+        np.ndarray
+            Number of synonyms of each word (int64)
+        """
+
+        return np.fromiter(
+            (len(self.get_synonyms(word)) for word in words),
+            dtype=np.int64,
+            count=len(words),
+        )
+
+    def get_synonyms_of_targets(self, targets: Iterable[str]) -> Set[str]:
+        """Get the synonyms of any of the targets.
+
+        Parameters
+        ----------
+        targets : Iterable[str]
+            normalized words
+
+        Returns
+        -------
+        Set[str]
+        """
+
+        return {synonym for target in targets for synonym in self.get_synonyms(target)}
+
+
+@lru_cache(maxsize=None)
+def load_thesaurus(
+    data_path: Path = DEFAULT_DATA_PATH, index_path: Path = DEFAULT_INDEX_PATH
+) -> Thesaurus:
+    """Load the thesaurus (once per process).
+
+    Parameters
+    ----------
+    data_path : Path
+        thesaurus data (the default is th_es_v2.dat)
+    index_path : Path
+        byte offset of each word in the data file (the default is th_es_v2.idx)
+
+    Returns
+    -------
+    Thesaurus
+    """
+
+    return Thesaurus(data_path, index_path)
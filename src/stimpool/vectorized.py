@@ -0,0 +1,263 @@
+"""Vectorized operations over whole word pools.
+
+These functions are the whole-pool counterparts of the per-word helpers in
+:class:`~stimpool.words.WordPool`. Each of them runs a single pass over all
+the words (in C, through ``map`` or NumPy) instead of calling a Python
+function for every word.
+"""
+
+import re
+from itertools import repeat
+from typing import Any, Iterable, List, Optional, Pattern, Sequence
+
+import numpy as np
+
+ACCENTED_CHARACTERS = "áéíóúñü"
+
+# number of words encoded at once by flag_characters; bounds its memory use
+CHUNK_SIZE = 1 << 20
+
+
+def normalize_words(words: Sequence[str]) -> List[str]:
+    """Normalize all the words.
+
+    Equivalent to ``WordPool._normalize_word`` applied to every word.
+
+    Parameters
+    ----------
+    words : Sequence[str]
+        words to be normalized
+
+    Returns
+    -------
+    words_normalized : List[str]
+    """
+
+    return list(map(str.lower, map(str.strip, words)))
+
+
+def remove_conjugation_suffixes(words: Sequence[str]) -> List[str]:
+    """Remove the suffix that indicates how to conjugate each word.
+
+    Equivalent to ``WordPool._remove_conjugation_suffix_from_word`` applied
+    to every word.
+
+    Parameters
+    ----------
+    words : Sequence[str]
+        words to be cleaned
+
+    Returns
+    -------
+    words_cleaned : List[str]
+    """
+
+    return [word.partition("/")[0] for word in words]
+
+
+def to_object_array(words: Iterable[str]) -> np.ndarray:
+    """Store the words in a 1-D array of Python strings.
+
+    Arrays and pd.Series are converted without copying their words.
+
+    Parameters
+    ----------
+    words : Iterable[str]
+        words to be stored
+
+    Returns
+    -------
+    np.ndarray
+        Words (object dtype)
+    """
+
+    if isinstance(words, np.ndarray) or hasattr(words, "to_numpy"):
+        return np.asarray(words, dtype=object)
+
+    words_list: List[Any] = list(words)
+    array = np.empty(len(words_list), dtype=object)
+    array[:] = words_list
+
+    return array
+
+
+def word_lengths(words: Sequence[str]) -> np.ndarray:
+    """Get the length of all the words.
+
+    Parameters
+    ----------
+    words : Sequence[str]
+        words to be analyzed
+
+    Returns
+    -------
+    np.ndarray
+        Length of each word (int64)
+    """
+
+    return np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+
+
+def flag_word_length(
+    words: Sequence[str], min_len: Optional[int] = None, max_len: Optional[int] = None
+) -> np.ndarray:
+    """Flag the words whose length is within the limits.
+
+    Parameters
+    ----------
+    words : Sequence[str]
+        words to be analyzed
+    min_len : int
+        Minimum word length (defaults to None; no min length).
+    max_len : int
+        Maximum word length (defaults to None; no max length).
+
+    Returns
+    -------
+    np.ndarray
+        True for the words within the specified length; False otherwise.
+    """
+
+    lengths = word_lengths(words)
+    flags = np.ones(len(lengths), dtype=bool)
+    if min_len is not None:
+        flags &= lengths >= min_len
+    if max_len is not None:
+        flags &= lengths <= max_len
+
+    return flags
+
+
+def flag_characters(words: Sequence[str], characters: str) -> np.ndarray:
+    """Flag the words that contain any of the characters.
+
+    The words are joined and encoded as one array of code points, which is
+    searched at once. Each match is then assigned to its word using the
+    position of the separators.
+
+    Parameters
+    ----------
+    words : Sequence[str]
+        words to be analyzed
+    characters : str
+        characters to look for
+
+    Returns
+    -------
+    np.ndarray
+        True for the words that contain any of the characters; False otherwise.
+    """
+
+    words = list(words)
+    flags = np.zeros(len(words), dtype=bool)
+    code_points = np.array([ord(character) for character in characters])
+
+    for start in range(0, len(words), CHUNK_SIZE):
+        chunk = words[start : start + CHUNK_SIZE]
+        text = "\n".join(chunk)
+        codes = np.frombuffer(
+            text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32
+        )
+        separators = np.flatnonzero(codes == ord("\n"))
+
+        if len(separators) != len(chunk) - 1:
+            # some words contain newlines; check each word instead
+            pattern = re.compile(f"[{re.escape(characters)}]")
+            flags[start : start + len(chunk)] = [
+                pattern.search(word) is not None for word in chunk
+            ]
+            continue
+
+        matches = np.flatnonzero(np.isin(codes, code_points))
+        flags[start + np.searchsorted(separators, matches)] = True
+
+    return flags
+
+
+def flag_prefix(words: Sequence[str], prefix: str) -> np.ndarray:
+    """Flag the words that start with the prefix.
+
+    Parameters
+    ----------
+    words : Sequence[str]
+        words to be analyzed
+    prefix : str
+        prefix to look for
+
+    Returns
+    -------
+    np.ndarray
+        True for the words that start with the prefix; False otherwise.
+    """
+
+    flags = map(str.startswith, words, repeat(prefix))
+
+    return np.fromiter(flags, dtype=bool, count=len(words))
+
+
+def flag_suffix(words: Sequence[str], suffix: str) -> np.ndarray:
+    """Flag the words that end with the suffix.
+
+    Parameters
+    ----------
+    words : Sequence[str]
+        words to be analyzed
+    suffix : str
+        suffix to look for
+
+    Returns
+    -------
+    np.ndarray
+        True for the words that end with the suffix; False otherwise.
+    """
+
+    flags = map(str.endswith, words, repeat(suffix))
+
+    return np.fromiter(flags, dtype=bool, count=len(words))
+
+
+def flag_substring(words: Sequence[str], substring: str) -> np.ndarray:
+    """Flag the words that contain the substring.
+
+    Parameters
+    ----------
+    words : Sequence[str]
+        words to be analyzed
+    substring : str
+        substring to look for
+
+    Returns
+    -------
+    np.ndarray
+        True for the words that contain the substring; False otherwise.
+    """
+
+    flags = map(str.__contains__, words, repeat(substring))
+
+    return np.fromiter(flags, dtype=bool, count=len(words))
+
+
+def flag_pattern(words: Sequence[str], pattern: Pattern) -> np.ndarray:
+    """Flag the words where the compiled regular expression matches.
+
+    The pattern is searched anywhere in each word (i.e., ``re.search``); it
+    has to be anchored with ``^`` and ``$`` to match whole words.
+
+    Parameters
+    ----------
+    words : Sequence[str]
+        words to be analyzed
+    pattern : Pattern
+        compiled regular expression
+
+    Returns
+    -------
+    np.ndarray
+        True for the words where the pattern matches; False otherwise.
+    """
+
+    matches = map(pattern.search, words)
+
+    return np.fromiter(
+        (match is not None for match in matches), dtype=bool, count=len(words)
+    )
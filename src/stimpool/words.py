@@ -1,19 +1,135 @@
-"""Create word pools."""
+"""Create word pools.
 
+The words of a pool are kept in NumPy arrays, and pandas is only imported
+when they are requested as a pd.Series (e.g., with :attr:`WordPool.words`),
+so pools can be built, filtered, sampled and saved without it.
+
+Compact pools (``WordPool(compact=True)``) store the words once in a
+contiguous UTF-8 buffer (a :class:`~stimpool.compiled.StringColumn`) and
+their selections as positions into it. The buffer of the default pool is
+memory-mapped, so it is shared by every compact pool in the process.
+"""
+
+import copy
+import hashlib
 import re
+import sys
+from itertools import islice
 from pathlib import Path
-from typing import Any, Callable, Iterable, Optional, Tuple
-
-import pandas as pd
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Pattern,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from . import __version__
+from .affixes import expand_dictionary
+from .cache import ResultCache, get_key, hash_words
+from .compiled import StringColumn, StringColumnView, load_default_pool
+from .dedupe import Deduplicator
+from .export import write_pool
+from .features import FeatureIndex
+from .hyphenation import load_hyphenator
+from .instrumentation import NULL_STAGE, Instrumentation
+from .matching import MatchedLists, match_lists
+from .neighbors import NEIGHBORHOODS, count_neighbors, update_neighbor_counts
+from .plan import (
+    COST_CHARACTERS,
+    COST_LENGTH,
+    COST_NEIGHBORS,
+    COST_PATTERN,
+    COST_SYLLABLES,
+    COST_SYNONYMS,
+    Criterion,
+    QueryPlan,
+)
+from .prefixes import PrefixIndex
+from .sampling import (
+    DEFAULT_SEED,
+    allocate_quotas,
+    draw_samples,
+    draw_stratified,
+    get_generator,
+)
+from .similarity import BKTree
+from .thesaurus import load_thesaurus
+from .vectorized import (
+    ACCENTED_CHARACTERS,
+    flag_characters,
+    flag_pattern,
+    flag_prefix,
+    flag_substring,
+    flag_suffix,
+    flag_word_length,
+    normalize_words,
+    remove_conjugation_suffixes,
+    to_object_array,
+    word_lengths,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 ROOT_DIR = Path(__file__).resolve().parent
+CHUNKSIZE = 100_000
+# selections whose result for a word depends on the other words of the pool,
+# which can't be applied to each chunk of a stream separately
+POOL_DEPENDENT_SELECTIONS = ("select_words_of_neighbors",)
+PATTERN_ACCENTED_CHARACTERS = re.compile(f"[{ACCENTED_CHARACTERS}]")
+# features the words can be stratified by
+STRATA_FEATURES = (
+    "length",
+    "syllables",
+    "accented",
+    "neighbors:substitution",
+    "neighbors:levenshtein",
+)
+
+
+def _import_pandas() -> Any:
+    """Import pandas, which is only needed to return pd.Series."""
+
+    import pandas as pd
+
+    return pd
+
+
+def _default_features() -> FeatureIndex:
+    """Get the feature index of the default pool, which is shared by its pools."""
+
+    return load_default_pool().features
+
+
+def _is_series(pool: Any) -> bool:
+    """Check if the pool is a pd.Series without importing pandas."""
+
+    pd = sys.modules.get("pandas")
+
+    return pd is not None and isinstance(pool, pd.Series)
 
 
 class WordPool(object):
     """Create word pools."""
 
     def __init__(
-        self, pool: Optional[Iterable] = None, clean_conjugation_suffix: bool = True
+        self,
+        pool: Optional[Iterable] = None,
+        clean_conjugation_suffix: bool = True,
+        lazy: bool = False,
+        instrumentation: Optional[Instrumentation] = None,
+        compact: bool = False,
+        cache: Optional[ResultCache] = None,
     ) -> None:
         """Create a word pool.
 
@@ -25,15 +141,312 @@ class WordPool(object):
         clean_conjugation_suffix : bool
             Specifies if suffixes that are used to identify word conjugations
             should be removed from the pool (Default=True)
+        lazy : bool
+            Specifies if selections should be recorded and evaluated together
+            only when the words are needed (i.e., when getting the words,
+            sampling or saving the pool). Otherwise, each selection is applied
+            immediately (Default=False)
+        instrumentation : Instrumentation
+            Records the time, number of words and memory of each stage (e.g.,
+            formatting the pool or each selection) (the default is None, no
+            instrumentation)
+        compact : bool
+            Specifies if the words should be stored in a contiguous UTF-8
+            buffer and selected as positions into it, which uses several times
+            less memory. Selections decode the words they analyze, and the
+            words must not contain newlines (Default=False)
+        cache : ResultCache
+            Stores the results of the selections on disk, so selecting the
+            same words from the same pool again only reads them (the default
+            is None, no cache)
+        """
+
+        self.instrumentation = instrumentation
+        self.cache = cache
+        self._compact = compact
+        self._clean_conjugation_suffix = clean_conjugation_suffix
+        self._fingerprint: Optional[str] = None
+        self._state_key: Optional[str] = None
+        self._series: Optional["pd.Series"] = None
+        self._view: Any = None
+        self._base_words: Optional[np.ndarray] = None
+        self._column: Optional[StringColumn] = None
+        self._index_base: Optional[np.ndarray] = None
+        self._positions = np.arange(0)
+        self._history: List[np.ndarray] = []
+        self._provenance: Dict[str, np.ndarray] = {}
+        self._deduplicator: Optional[Deduplicator] = None
+        self._dedupe_positions = np.arange(0)
+        self._neighbors: Dict[str, Dict[str, int]] = {}
+        self._similarity: Optional[BKTree] = None
+        self._words_original: Optional[np.ndarray] = None
+        self._column_original: Optional[StringColumn] = None
+        self._load_original = False
+        if compact and pool is None:
+            self._prepare_default_column(clean_conjugation_suffix)
+        else:
+            words, index, words_original = self._prepare_pool(
+                pool, clean_conjugation_suffix
+            )
+            self._set_words(words, index)
+            if compact and words_original is words:
+                self._column_original = self._column
+            else:
+                self._set_words_original(words_original)
+            # the original words of the default pool are loaded when requested
+            self._load_original = pool is None and words_original is None
+        self._features: Optional[FeatureIndex] = None
+        self._prefixes: Optional[PrefixIndex] = None
+        if pool is None and clean_conjugation_suffix:
+            self._features = load_default_pool().features
+            self._prefixes = load_default_pool().prefixes
+        self._lazy = lazy
+        self._plan = QueryPlan()
+
+    @classmethod
+    def from_inflected_forms(
+        cls,
+        processes: Optional[int] = None,
+        lazy: bool = False,
+        compact: bool = False,
+        chunksize: int = CHUNKSIZE,
+    ) -> "WordPool":
+        """Create a word pool with every inflected form of the default pool.
+
+        The forms are generated from the affix rules in es_PR.aff (see
+        :mod:`stimpool.affixes`) and streamed into the pool one chunk at a
+        time (see :meth:`from_iterable`), so they are never all held in a list.
+
+        Parameters
+        ----------
+        processes : int
+            Number of worker processes used to generate the forms (the
+            default is None, use the current process)
+        lazy : bool
+            Specifies if selections should be evaluated lazily (Default=False)
+        compact : bool
+            Specifies if the words should be stored in a contiguous buffer
+            (Default=False)
+        chunksize : int
+            Number of forms formatted and cleaned at once (Default=100000)
+
+        Returns
+        -------
+        WordPool
         """
 
-        self._pool_original, self._pool_cleaned = self._prepare_pool(
-            pool, clean_conjugation_suffix
+        return cls.from_iterable(
+            expand_dictionary(processes=processes),
+            chunksize=chunksize,
+            lazy=lazy,
+            compact=compact,
         )
 
+    @classmethod
+    def from_iterable(
+        cls,
+        words: Iterable[str],
+        selections: Sequence[Tuple[str, Dict[str, Any]]] = (),
+        chunksize: int = CHUNKSIZE,
+        clean_conjugation_suffix: bool = True,
+        keep_original: bool = False,
+        lazy: bool = False,
+        instrumentation: Optional[Instrumentation] = None,
+        compact: bool = False,
+        remove_duplicates: bool = False,
+        provenance: Sequence[str] = ("count",),
+    ) -> "WordPool":
+        """Create a word pool from a stream of words, one chunk at a time.
+
+        Each chunk is normalized, cleaned and filtered with the selections
+        before the next one is read, and only the words meeting every
+        selection are kept. This allows creating pools from inputs that don't
+        fit in memory. Selections that depend on the whole pool (see
+        POOL_DEPENDENT_SELECTIONS) can't be applied to the chunks; apply them
+        to the pool that is created instead.
+
+        Parameters
+        ----------
+        words : Iterable[str]
+            stream of words
+        selections : Sequence[Tuple[str, Dict[str, Any]]]
+            Selections applied to each chunk, as the name of a selection
+            method (e.g., "select_words_of_length") and its key-word args
+            (the default is (), keep every word)
+        chunksize : int
+            Number of words processed at once (Default=100000)
+        clean_conjugation_suffix : bool
+            Specifies if suffixes that are used to identify word conjugations
+            should be removed from the pool (Default=True)
+        keep_original : bool
+            Specifies if the original version of the words that are kept
+            should also be stored (Default=False)
+        lazy : bool
+            Specifies if later selections should be evaluated lazily
+            (Default=False)
+        instrumentation : Instrumentation
+            Records the stages of each chunk (the default is None, no
+            instrumentation)
+        compact : bool
+            Specifies if the words that are kept should be stored in a
+            contiguous buffer (Default=False)
+        remove_duplicates : bool
+            Specifies if only the first occurrence of each word in the stream
+            should be kept (see :meth:`remove_duplicates`) (Default=False)
+        provenance : Sequence[str]
+            Provenance kept for each word when removing duplicates: "first",
+            "all" or "count" (Default=("count",))
+
+        Returns
+        -------
+        WordPool
+            Pool whose index is the position of each word in the stream.
+
+        Raises
+        ------
+        ValueError
+            If a selection is not a WordPool selection method, depends on the
+            whole pool or a provenance is not valid.
+        """
+
+        for method, _ in selections:
+            if not method.startswith("select_") or not hasattr(cls, method):
+                raise ValueError(f"{method!r} is not a WordPool selection method")
+            if method in POOL_DEPENDENT_SELECTIONS:
+                raise ValueError(
+                    f"{method!r} depends on the whole pool and can't be applied "
+                    "to each chunk; apply it to the pool that is created"
+                )
+
+        deduplicator = Deduplicator(provenance) if remove_duplicates else None
+        words = iter(words)
+        chunks_cleaned: List[np.ndarray] = []
+        chunks_original: List[np.ndarray] = []
+        chunks_index: List[np.ndarray] = []
+        start = 0
+        while True:
+            chunk = list(islice(words, chunksize))
+            if not chunk:
+                break
+
+            word_pool_chunk = cls(
+                chunk, clean_conjugation_suffix, True, instrumentation
+            )
+            for method, kwargs in selections:
+                getattr(word_pool_chunk, method)(**(kwargs or {}))
+            word_pool_chunk._evaluate_plan()
+            positions = word_pool_chunk._index
+            words_chunk = word_pool_chunk._words
+            if deduplicator is not None:
+                words_original = None
+                if deduplicator.needs_original:
+                    words_original = word_pool_chunk._take_original(positions)
+                positions_new = deduplicator.add(words_chunk, words_original)
+                words_chunk = words_chunk[positions_new]
+                positions = positions[positions_new]
+            chunks_cleaned.append(words_chunk)
+            if keep_original:
+                chunks_original.append(
+                    word_pool_chunk._take_original(positions)  # type: ignore
+                )
+            chunks_index.append(positions + start)
+            start += len(chunk)
+
+        word_pool = cls([], clean_conjugation_suffix, lazy, instrumentation, compact)
+        if chunks_cleaned:
+            word_pool._set_words(
+                np.concatenate(chunks_cleaned), np.concatenate(chunks_index)
+            )
+        if not keep_original:
+            word_pool._set_words_original(None)
+        elif chunks_original:
+            word_pool._set_words_original(np.concatenate(chunks_original))
+        if deduplicator is not None and chunks_cleaned:
+            word_pool._deduplicator = deduplicator
+            word_pool._dedupe_positions = np.arange(len(deduplicator))
+            word_pool._provenance = deduplicator.get_provenance()
+
+        return word_pool
+
+    @classmethod
+    def from_file(
+        cls,
+        path: Path,
+        selections: Sequence[Tuple[str, Dict[str, Any]]] = (),
+        chunksize: int = CHUNKSIZE,
+        clean_conjugation_suffix: bool = True,
+        keep_original: bool = False,
+        lazy: bool = False,
+        encoding: str = "utf-8",
+        instrumentation: Optional[Instrumentation] = None,
+        compact: bool = False,
+        remove_duplicates: bool = False,
+        provenance: Sequence[str] = ("count",),
+    ) -> "WordPool":
+        """Create a word pool from a text file with one word per line.
+
+        The file is read one chunk at a time (see :meth:`from_iterable`), so
+        only the words meeting the selections are kept in memory. Empty lines
+        are skipped.
+
+        Parameters
+        ----------
+        path : Path
+            text file with one word per line
+        selections : Sequence[Tuple[str, Dict[str, Any]]]
+            Selections applied to each chunk, which can't depend on the whole
+            pool (see :meth:`from_iterable`) (the default is (), keep every
+            word)
+        chunksize : int
+            Number of words processed at once (Default=100000)
+        clean_conjugation_suffix : bool
+            Specifies if suffixes that are used to identify word conjugations
+            should be removed from the pool (Default=True)
+        keep_original : bool
+            Specifies if the original version of the words that are kept
+            should also be stored (Default=False)
+        lazy : bool
+            Specifies if later selections should be evaluated lazily
+            (Default=False)
+        encoding : str
+            Encoding of the file (Default=utf-8)
+        instrumentation : Instrumentation
+            Records the stages of each chunk (the default is None, no
+            instrumentation)
+        compact : bool
+            Specifies if the words that are kept should be stored in a
+            contiguous buffer (Default=False)
+        remove_duplicates : bool
+            Specifies if only the first occurrence of each word in the file
+            should be kept (Default=False)
+        provenance : Sequence[str]
+            Provenance kept for each word when removing duplicates: "first",
+            "all" or "count" (Default=("count",))
+
+        Returns
+        -------
+        WordPool
+        """
+
+        with open(path, encoding=encoding) as file:
+            words = (line for line in file if line.strip())
+
+            return cls.from_iterable(
+                words,
+                selections=selections,
+                chunksize=chunksize,
+                clean_conjugation_suffix=clean_conjugation_suffix,
+                keep_original=keep_original,
+                lazy=lazy,
+                instrumentation=instrumentation,
+                compact=compact,
+                remove_duplicates=remove_duplicates,
+                provenance=provenance,
+            )
+
     def _prepare_pool(
         self, pool: Optional[Iterable[str]], clean_conjugation_suffix: bool
-    ) -> Tuple[pd.Series, pd.Series]:
+    ) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
         """Prepare word pool to be used.
 
         Parameters
@@ -46,40 +459,99 @@ class WordPool(object):
 
         Returns
         -------
-        word_pools
-            Original word pool and its formatted word version, which will be
-            used to create the subpool.
+        words : np.ndarray
+            Formatted words, which will be used to create the subpool.
+        index : np.ndarray
+            Label of each word (its position, unless pool is a pd.Series).
+        words_original : np.ndarray
+            Original words (None if they are loaded when requested).
         """
 
         if pool is None:
-            pool_current: pd.Series = self._get_default_pool()
-        else:
-            # redefining makes sense; see mypy issue #6233
-            pool_current: Iterable = pool  # type: ignore
+            return self._prepare_default_pool(clean_conjugation_suffix)
 
-        pool_formatted: pd.Series = self._format_pool(pool_current)
-        pool_original: pd.Series[str] = pool_formatted.copy()
-        pool_cleaned: pd.Series[str] = pool_formatted.copy()
+        with self._stage("format_pool") as stage:
+            words_formatted, index = self._format_words(pool)
+            stage.n_out = len(words_formatted)
+        words_cleaned = words_formatted
 
         if clean_conjugation_suffix:
-            pool_cleaned: pd.Series = self._clean_conjugation_suffixes(  # type: ignore
-                pool_cleaned
-            )
+            n_words = len(words_cleaned)
+            with self._stage("clean_conjugation_suffixes", n_words) as stage:
+                words_cleaned = self._clean_conjugation_suffixes(words_cleaned)
+                stage.n_out = len(words_cleaned)
+
+        return words_cleaned, index, words_formatted
+
+    def _prepare_default_pool(
+        self, clean_conjugation_suffix: bool
+    ) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """Prepare the default word pool to be used.
+
+        The default pool is read from its compiled form (see
+        :mod:`stimpool.compiled`), which already contains the formatted and
+        cleaned words, so it doesn't need to be parsed and formatted again.
+
+        Parameters
+        ----------
+        clean_conjugation_suffix : bool
+            Specifies if suffixes that are used to identify word conjugations
+            should be removed from the pool
 
-        pool_original.name = "words_original"
-        pool_cleaned.name = "words"
+        Returns
+        -------
+        words : np.ndarray
+            Formatted words, which will be used to create the subpool.
+        index : np.ndarray
+            Position of each word.
+        words_original : np.ndarray
+            Original words (None if they are loaded when requested).
+        """
+
+        with self._stage("load_default_pool") as stage:
+            compiled_pool = load_default_pool()
+            words_original: Optional[np.ndarray] = None
+            if clean_conjugation_suffix:
+                words_cleaned = to_object_array(compiled_pool.cleaned.to_list())
+            else:
+                words_cleaned = to_object_array(compiled_pool.original.to_list())
+                words_original = words_cleaned
+            stage.n_out = len(words_cleaned)
 
-        return pool_original, pool_cleaned
+        return words_cleaned, np.arange(len(words_cleaned)), words_original
+
+    def _prepare_default_column(self, clean_conjugation_suffix: bool) -> None:
+        """Use the columns of the compiled default pool as compact storage.
+
+        The columns are memory-mapped, so no word is decoded or copied.
+
+        Parameters
+        ----------
+        clean_conjugation_suffix : bool
+            Specifies if suffixes that are used to identify word conjugations
+            should be removed from the pool
+        """
 
-    def _get_default_pool(self) -> pd.Series:
+        with self._stage("load_default_pool") as stage:
+            compiled_pool = load_default_pool()
+            self._column_original = compiled_pool.original
+            if clean_conjugation_suffix:
+                self._column = compiled_pool.cleaned
+            else:
+                self._column = compiled_pool.original
+            self._positions = np.arange(len(self._column))
+            stage.n_out = len(self._column)
+
+    def _get_default_pool(self) -> "pd.Series":
         """Get the default word pool."""
 
+        pd = _import_pandas()
         path = ROOT_DIR / "words" / "es_PR.dic"
         pool = pd.read_csv(path, squeeze=True)
 
         return pool
 
-    def _format_pool(self, pool: Iterable) -> pd.Series:
+    def _format_pool(self, pool: Iterable) -> "pd.Series":
         """Format word pool.
 
         The pool is formatted by converting it in into a pd.Series if
@@ -95,12 +567,34 @@ class WordPool(object):
         pool_formatted : pd.Series
         """
 
-        if not isinstance(pool, pd.Series):
-            pool = pd.Series(pool)
+        words, index = self._format_words(pool)
+
+        return _import_pandas().Series(words, index=index, dtype="object")
+
+    def _format_words(self, pool: Iterable) -> Tuple[np.ndarray, np.ndarray]:
+        """Format the words of the pool without creating a pd.Series.
+
+        Parameters
+        ----------
+        pool : Iterable
+            word pool
+
+        Returns
+        -------
+        words : np.ndarray
+            Formatted words
+        index : np.ndarray
+            Label of each word (its position, unless pool is a pd.Series)
+        """
 
-        pool_formatted: pd.Series = pool.apply(self._normalize_word)
+        if _is_series(pool):
+            words = pool.tolist()  # type: ignore
+            index = pool.index.to_numpy()  # type: ignore
+        else:
+            words = [pool] if isinstance(pool, str) else list(pool)
+            index = np.arange(len(words))
 
-        return pool_formatted
+        return to_object_array(normalize_words(words)), index
 
     def _normalize_word(self, word: str) -> str:
         """Normalize the word.
@@ -125,12 +619,16 @@ class WordPool(object):
         Accented characters:: á, é, í, ó, ú, ñ, ü
         """
 
-        pool_cleaned = self._get_words_meeting_criteria(
-            func_checks_criteria=self._check_accented_characters,
+        criterion = Criterion(
+            name="select_words_without_accented_characters",
+            func=self._flag_accented_characters,
             how="remove",
+            vectorized=True,
+            cost=COST_CHARACTERS,
+            lookup=self._lookup_accented_characters,
         )
 
-        self._pool_cleaned = pool_cleaned
+        self._select(criterion)
 
     def _check_accented_characters(self, word: str) -> bool:
         """Check if the word contains accented characters.
@@ -146,13 +644,33 @@ class WordPool(object):
             True if the word contains accented characters; False otherwise
         """
 
-        pattern_accented_characters = re.compile("[áéíóúñü]")
-        matches = pattern_accented_characters.findall(word)
+        matches = PATTERN_ACCENTED_CHARACTERS.findall(word)
         if len(matches) > 0:
             return True
         else:
             return False
 
+    def _flag_accented_characters(self, pool: np.ndarray) -> np.ndarray:
+        """Flag the words that contain accented characters (vectorized).
+
+        Parameters
+        ----------
+        pool : np.ndarray
+            words to be analyzed
+
+        Returns
+        -------
+        np.ndarray
+            True for the words that contain accented characters; False otherwise
+        """
+
+        return flag_characters(pool.tolist(), ACCENTED_CHARACTERS)
+
+    def _lookup_accented_characters(self) -> np.ndarray:
+        """Get the bitmap of words with accented characters from the index."""
+
+        return self._features.bitmap("accented")  # type: ignore
+
     def select_words_of_length(self, min_len: int = None, max_len: int = None) -> None:
         """Get words of the length specified.
 
@@ -174,14 +692,17 @@ class WordPool(object):
         if min_len is None and max_len is None:
             raise ValueError("Either min_len or a max_len have to be specified")
 
-        pool_cleaned = self._get_words_meeting_criteria(
-            func_checks_criteria=self._check_word_length,
+        criterion = Criterion(
+            name="select_words_of_length",
+            func=self._flag_word_length,
             how="keep",
-            min_len=min_len,
-            max_len=max_len,
+            kwargs={"min_len": min_len, "max_len": max_len},
+            vectorized=True,
+            cost=COST_LENGTH,
+            lookup=self._lookup_word_length,
         )
 
-        self._pool_cleaned = pool_cleaned
+        self._select(criterion)
 
     def _check_word_length(
         self, word: str, min_len: int = None, max_len: int = None
@@ -215,101 +736,1747 @@ class WordPool(object):
         else:
             return False
 
-    def _clean_conjugation_suffixes(self, pool: pd.Series) -> pd.Series:
-        """Clean suffix that indicates how to conjugate the words."""
+    def _flag_word_length(
+        self,
+        pool: np.ndarray,
+        min_len: Optional[int] = None,
+        max_len: Optional[int] = None,
+    ) -> np.ndarray:
+        """Flag the words whose length meets the established limits (vectorized).
 
-        pool_clean: pd.Series = pool.apply(self._remove_conjugation_suffix_from_word)
+        Parameters
+        ----------
+        pool : np.ndarray
+            words to be analyzed
+        min_len : int
+            Minimum word length (defaults to None; no min length).
+        max_len : int
+            Maximum word length (defaults to None; no max length).
 
-        return pool_clean
+        Returns
+        -------
+        np.ndarray
+            True for the words within the specified length; False otherwise.
+        """
 
-    def _remove_conjugation_suffix_from_word(self, word: str) -> str:
-        """Remove suffix that indicates how to conjugate the word."""
+        return flag_word_length(pool.tolist(), min_len, max_len)
 
-        if "/" in word:
-            word_elements = word.split("/")
-            word = word_elements[0]
+    def _lookup_word_length(
+        self, min_len: Optional[int] = None, max_len: Optional[int] = None
+    ) -> np.ndarray:
+        """Get the bitmap of words of the specified length from the index."""
 
-        return word
+        return self._features.bitmap_in_range(  # type: ignore
+            "length", min_len, max_len
+        )
 
-    def _get_words_meeting_criteria(
-        self, func_checks_criteria: Callable, how: str = "keep", **kwargs: Optional[Any]
-    ) -> pd.Series:
-        """Run specified analysis on words (helper function).
+    def select_words_of_syllables(
+        self, min_syl: Optional[int] = None, max_syl: Optional[int] = None
+    ) -> None:
+        """Get words with the number of syllables specified.
+
+        Syllables are found with the Spanish hyphenation patterns of
+        LibreOffice (hyph_es.dic).
 
         Parameters
         ----------
-        func_checks_criteria : Callable
-            Function that analyzes the words to determine which met the
-            criteria.
-        how : {"keep", "remove"}, str  # noqa: DAR103 (numpy style)
-            Determines if words meeting the criteria should be kept or removed.
-        **kwargs : Any
-            Key-word args to pass to func_checks_criteria
+        min_syl : int
+            Minimum number of syllables (defaults to None; no min number). If a
+            min number is not specified, a max number has to be specified.
+        max_syl : int
+            Maximum number of syllables (defaults to None; no max number). If a
+            max number is not specified, a min number has to be specified.
+
+        Raises
+        ------
+        ValueError
+            If neither min_syl nor max_syl are specified.
+        """
+
+        if min_syl is None and max_syl is None:
+            raise ValueError("Either min_syl or a max_syl have to be specified")
+
+        criterion = Criterion(
+            name="select_words_of_syllables",
+            func=self._flag_syllables,
+            how="keep",
+            kwargs={"min_syl": min_syl, "max_syl": max_syl},
+            vectorized=True,
+            cost=COST_SYLLABLES,
+            lookup=self._lookup_syllables,
+        )
+
+        self._select(criterion)
+
+    def _flag_syllables(
+        self,
+        pool: np.ndarray,
+        min_syl: Optional[int] = None,
+        max_syl: Optional[int] = None,
+    ) -> np.ndarray:
+        """Flag the words whose number of syllables meets the limits (vectorized).
+
+        Parameters
+        ----------
+        pool : np.ndarray
+            words to be analyzed
+        min_syl : int
+            Minimum number of syllables (defaults to None; no min number).
+        max_syl : int
+            Maximum number of syllables (defaults to None; no max number).
 
         Returns
         -------
-        pool_cleaned : pd.Series
-            Words that met the criteria.
+        np.ndarray
+            True for the words within the specified number of syllables; False
+            otherwise.
         """
 
-        pool_meeting_criteria_flags = self._pool_cleaned.apply(
-            func_checks_criteria, **kwargs
+        syllables = load_hyphenator().count_syllables_pool(pool.tolist())
+        flags = np.ones(len(syllables), dtype=bool)
+        if min_syl is not None:
+            flags &= syllables >= min_syl
+        if max_syl is not None:
+            flags &= syllables <= max_syl
+
+        return flags
+
+    def _lookup_syllables(
+        self, min_syl: Optional[int] = None, max_syl: Optional[int] = None
+    ) -> np.ndarray:
+        """Get the bitmap of words with the number of syllables from the index."""
+
+        return self._features.bitmap_in_range(  # type: ignore
+            "syllables", min_syl, max_syl
         )
-        if how == "keep":
-            pool_meeting_criteria = self._pool_cleaned.where(
-                pool_meeting_criteria_flags
+
+    def select_words_of_neighbors(
+        self,
+        min_neighbors: Optional[int] = None,
+        max_neighbors: Optional[int] = None,
+        neighborhood: str = "substitution",
+    ) -> None:
+        """Get words with the number of orthographic neighbors specified.
+
+        Neighbors are looked for among all the words of the base pool (i.e.,
+        before any selection), with a deletion-neighborhood hash index (see
+        :mod:`stimpool.neighbors`). They are counted once per pool; the counts
+        of the default pool are precomputed in its feature index.
+
+        Parameters
+        ----------
+        min_neighbors : int
+            Minimum number of neighbors (defaults to None; no min number). If a
+            min number is not specified, a max number has to be specified.
+        max_neighbors : int
+            Maximum number of neighbors (defaults to None; no max number). If a
+            max number is not specified, a min number has to be specified.
+        neighborhood : str
+            "substitution" (Coltheart's N, words of the same length that
+            differ in one character) or "levenshtein" (words at Levenshtein
+            distance 1) (Default=substitution)
+
+        Raises
+        ------
+        ValueError
+            If neither min_neighbors nor max_neighbors are specified or the
+            neighborhood is not valid.
+        """
+
+        if min_neighbors is None and max_neighbors is None:
+            raise ValueError(
+                "Either min_neighbors or a max_neighbors have to be specified"
+            )
+        if neighborhood not in NEIGHBORHOODS:
+            raise ValueError(
+                f"neighborhood must be one of {NEIGHBORHOODS}, not {neighborhood!r}"
             )
-        elif how == "remove":
-            pool_meeting_criteria = self._pool_cleaned.mask(pool_meeting_criteria_flags)
 
-        pool_cleaned = pool_meeting_criteria.dropna()
+        criterion = Criterion(
+            name="select_words_of_neighbors",
+            func=self._flag_neighbors,
+            how="keep",
+            kwargs={
+                "min_neighbors": min_neighbors,
+                "max_neighbors": max_neighbors,
+                "neighborhood": neighborhood,
+            },
+            vectorized=True,
+            cost=COST_NEIGHBORS,
+            lookup=self._lookup_neighbors,
+        )
+
+        self._select(criterion)
 
-        return pool_cleaned
+    def _flag_neighbors(
+        self,
+        pool: np.ndarray,
+        min_neighbors: Optional[int] = None,
+        max_neighbors: Optional[int] = None,
+        neighborhood: str = "substitution",
+    ) -> np.ndarray:
+        """Flag the words whose number of neighbors meets the limits (vectorized).
 
-    def sample_pool(self, n: int, reproducible: bool = True) -> None:
-        """Sample from the word pool.
+        Parameters
+        ----------
+        pool : np.ndarray
+            words to be analyzed
+        min_neighbors : int
+            Minimum number of neighbors (defaults to None; no min number).
+        max_neighbors : int
+            Maximum number of neighbors (defaults to None; no max number).
+        neighborhood : str
+            "substitution" or "levenshtein" (Default=substitution)
+
+        Returns
+        -------
+        np.ndarray
+            True for the words within the specified number of neighbors; False
+            otherwise.
+        """
+
+        neighbors = self._get_neighbors(neighborhood)
+        counts = np.fromiter(
+            map(neighbors.__getitem__, pool), dtype=np.int64, count=len(pool)
+        )
+        flags = np.ones(len(counts), dtype=bool)
+        if min_neighbors is not None:
+            flags &= counts >= min_neighbors
+        if max_neighbors is not None:
+            flags &= counts <= max_neighbors
+
+        return flags
+
+    def _lookup_neighbors(
+        self,
+        min_neighbors: Optional[int] = None,
+        max_neighbors: Optional[int] = None,
+        neighborhood: str = "substitution",
+    ) -> np.ndarray:
+        """Get the bitmap of words with the number of neighbors from the index."""
+
+        return self._features.bitmap_in_range(  # type: ignore
+            f"neighbors:{neighborhood}", min_neighbors, max_neighbors
+        )
+
+    def _get_neighbors(self, neighborhood: str) -> Dict[str, int]:
+        """Get the number of neighbors of each word of the base pool.
+
+        The neighbors are counted the first time they are needed and cached
+        until the base pool changes.
+        """
+
+        if neighborhood not in self._neighbors:
+            words = self._get_base_words()
+            with self._stage(f"count_neighbors:{neighborhood}", len(words)) as stage:
+                counts = count_neighbors(words, neighborhood)
+                self._neighbors[neighborhood] = dict(zip(words, counts.tolist()))
+                stage.n_out = len(words)
 
-        This is just a helper function that uses pandas.Series.sample.
-        You can read its [complete documentation]
-        (https://pandas.pydata.org/docs/reference/api/pandas.Series.sample.html)
+        return self._neighbors[neighborhood]
+
+    def select_words_with_synonyms(self, min_synonyms: int = 1) -> None:
+        """Get words with at least the number of synonyms specified.
+
+        Synonyms are found in the Spanish thesaurus of LibreOffice (th_es_v2).
 
         Parameters
         ----------
-        n : int
-            sample size
+        min_synonyms : int
+            Minimum number of synonyms (Default=1)
+        """
 
-        reproducible : bool
-            Specifies whether the sample obtained should be reproducible.
-            This is important to guarantee the reproducibility of
-            research (Default=True)
+        criterion = Criterion(
+            name="select_words_with_synonyms",
+            func=self._flag_synonyms,
+            how="keep",
+            kwargs={"min_synonyms": min_synonyms},
+            vectorized=True,
+            cost=COST_SYNONYMS,
+        )
+
+        self._select(criterion)
+
+    def _flag_synonyms(self, pool: np.ndarray, min_synonyms: int = 1) -> np.ndarray:
+        """Flag the words with at least the number of synonyms (vectorized).
+
+        Parameters
+        ----------
+        pool : np.ndarray
+            words to be analyzed
+        min_synonyms : int
+            Minimum number of synonyms (Default=1)
+
+        Returns
+        -------
+        np.ndarray
+            True for the words with enough synonyms; False otherwise.
         """
 
-        reproducible_coded: Optional[int] = 1 if True else None
+        return load_thesaurus().count_synonyms_pool(pool.tolist()) >= min_synonyms
+
+    def select_words_not_synonyms_of(self, targets: Iterable[str]) -> None:
+        """Get words that are not synonyms of the targets.
+
+        Synonyms are found in the Spanish thesaurus of LibreOffice (th_es_v2).
+
+        Parameters
+        ----------
+        targets : Iterable[str]
+            words whose synonyms should be removed from the pool
+        """
 
-        self._pool_cleaned = self._pool_cleaned.sample(
-            n=n, random_state=reproducible_coded
+        targets = [self._normalize_word(target) for target in targets]
+        criterion = Criterion(
+            name="select_words_not_synonyms_of",
+            func=self._flag_synonyms_of_targets,
+            how="remove",
+            kwargs={"targets": targets},
+            vectorized=True,
+            cost=COST_CHARACTERS,
         )
 
-    def save_pool(self, filename: str = "word pool") -> None:
-        """Save the word pool to a csv file.
+        self._select(criterion)
 
-        This is just a helper function that uses pandas.Series.to_csv.
-        You can read its [complete documentation]
-        (https://pandas.pydata.org/pandas-docs/version/0.23.4/generated/pandas.Series.to_csv.html)
+    def _flag_synonyms_of_targets(
+        self, pool: np.ndarray, targets: Iterable[str]
+    ) -> np.ndarray:
+        """Flag the words that are synonyms of the targets (vectorized).
 
         Parameters
         ----------
-        filename : str
-            Name of the file without the extension (i.e., csv). (Default=word pool)
+        pool : np.ndarray
+            words to be analyzed
+        targets : Iterable[str]
+            normalized words whose synonyms should be flagged
+
+        Returns
+        -------
+        np.ndarray
+            True for the synonyms of the targets; False otherwise.
         """
 
-        path = f"{filename}.csv"
-        self._pool_cleaned.name = "word"
+        synonyms = load_thesaurus().get_synonyms_of_targets(targets)
 
-        self._pool_cleaned.to_csv(path, index=False)
+        return np.fromiter(
+            map(synonyms.__contains__, pool), dtype=bool, count=len(pool)
+        )
 
-    @property
-    def words(self) -> pd.Series:
-        """Return the clean word pool."""
+    def select_words_starting_with(self, prefix: str) -> None:
+        """Get words that start with the prefix.
 
-        return self._pool_cleaned
+        The prefixes of the default pool are looked up in a
+        :class:`~stimpool.prefixes.PrefixIndex`, in time proportional to the
+        number of words that start with the prefix.
+
+        Parameters
+        ----------
+        prefix : str
+            prefix the words have to start with
+        """
+
+        criterion = Criterion(
+            name="select_words_starting_with",
+            func=flag_prefix,
+            how="keep",
+            kwargs={"prefix": self._normalize_word(prefix)},
+            vectorized=True,
+            cost=COST_CHARACTERS,
+            lookup=self._lookup_prefix,
+        )
+
+        self._select(criterion)
+
+    def _lookup_prefix(self, prefix: str) -> np.ndarray:
+        """Get the bitmap of words that start with the prefix from the index."""
+
+        return self._prefixes.bitmap_with_prefix(prefix)  # type: ignore
+
+    def select_words_ending_with(self, suffix: str) -> None:
+        """Get words that end with the suffix.
+
+        The suffixes of the default pool are looked up in a
+        :class:`~stimpool.prefixes.PrefixIndex`, in time proportional to the
+        number of words that end with the suffix.
+
+        Parameters
+        ----------
+        suffix : str
+            suffix the words have to end with
+        """
+
+        criterion = Criterion(
+            name="select_words_ending_with",
+            func=flag_suffix,
+            how="keep",
+            kwargs={"suffix": self._normalize_word(suffix)},
+            vectorized=True,
+            cost=COST_CHARACTERS,
+            lookup=self._lookup_suffix,
+        )
+
+        self._select(criterion)
+
+    def _lookup_suffix(self, suffix: str) -> np.ndarray:
+        """Get the bitmap of words that end with the suffix from the index."""
+
+        return self._prefixes.bitmap_with_suffix(suffix)  # type: ignore
+
+    def select_words_containing(self, substring: str) -> None:
+        """Get words that contain the substring.
+
+        Parameters
+        ----------
+        substring : str
+            substring the words have to contain
+        """
+
+        criterion = Criterion(
+            name="select_words_containing",
+            func=flag_substring,
+            how="keep",
+            kwargs={"substring": self._normalize_word(substring)},
+            vectorized=True,
+            cost=COST_CHARACTERS,
+        )
+
+        self._select(criterion)
+
+    def select_words_matching(self, pattern: Union[str, Pattern]) -> None:
+        """Get words that match the regular expression.
+
+        The pattern is compiled once and searched anywhere in the words (i.e.,
+        ``re.search``), so it has to be anchored with ``^`` and ``$`` to match
+        whole words. Words are normalized (i.e., lowercase).
+
+        Parameters
+        ----------
+        pattern : str or Pattern
+            regular expression the words have to match
+
+        Raises
+        ------
+        ValueError
+            If the pattern is not a valid regular expression.
+        """
+
+        try:
+            pattern_compiled = re.compile(pattern)
+        except re.error as error:
+            raise ValueError(f"Invalid pattern {pattern!r}: {error}") from None
+
+        criterion = Criterion(
+            name="select_words_matching",
+            func=flag_pattern,
+            how="keep",
+            kwargs={"pattern": pattern_compiled},
+            vectorized=True,
+            cost=COST_PATTERN,
+        )
+
+        self._select(criterion)
+
+    def select_words_dissimilar_to(
+        self, targets: Iterable[str], min_distance: int = 2
+    ) -> None:
+        """Get words whose edit distance to every target is at least min_distance.
+
+        Words similar to the targets are found in a BK-tree of the base pool
+        (see :mod:`stimpool.similarity`), which is built once per pool.
+
+        Parameters
+        ----------
+        targets : Iterable[str]
+            words the selected words should not be confusable with
+        min_distance : int
+            Minimum Levenshtein distance to every target (Default=2)
+
+        Raises
+        ------
+        ValueError
+            If min_distance is less than 1.
+        """
+
+        if min_distance < 1:
+            raise ValueError("min_distance has to be at least 1")
+
+        targets = [self._normalize_word(target) for target in targets]
+        criterion = Criterion(
+            name="select_words_dissimilar_to",
+            func=self._flag_similar_to,
+            how="remove",
+            kwargs={"targets": targets, "min_distance": min_distance},
+            vectorized=True,
+            cost=COST_CHARACTERS,
+        )
+
+        self._select(criterion)
+
+    def _flag_similar_to(
+        self, pool: np.ndarray, targets: Iterable[str], min_distance: int = 2
+    ) -> np.ndarray:
+        """Flag the words closer than min_distance to any target (vectorized).
+
+        Parameters
+        ----------
+        pool : np.ndarray
+            words to be analyzed
+        targets : Iterable[str]
+            normalized words to compare with
+        min_distance : int
+            Minimum Levenshtein distance to every target (Default=2)
+
+        Returns
+        -------
+        np.ndarray
+            True for the words similar to a target; False otherwise.
+        """
+
+        similar = self._get_similarity().find_similar(targets, min_distance - 1)
+
+        return np.fromiter(map(similar.__contains__, pool), dtype=bool, count=len(pool))
+
+    def _get_similarity(self) -> BKTree:
+        """Get the edit distance index of the base pool, building it if needed."""
+
+        if self._similarity is None:
+            if self._features is not None and self._features is _default_features():
+                self._similarity = load_default_pool().similarity
+            else:
+                words = self._get_base_words()
+                with self._stage("build_similarity_index", len(words)) as stage:
+                    self._similarity = BKTree(words)
+                    stage.n_out = len(self._similarity)
+
+        return self._similarity
+
+    def _clean_conjugation_suffixes(self, pool: Any) -> Any:
+        """Clean suffix that indicates how to conjugate the words.
+
+        The words are returned as a pd.Series if pool is one; otherwise, as a
+        np.ndarray.
+        """
+
+        words_clean = to_object_array(remove_conjugation_suffixes(pool.tolist()))
+        if _is_series(pool):
+            return _import_pandas().Series(
+                words_clean, index=pool.index, dtype="object"
+            )
+
+        return words_clean
+
+    def _remove_conjugation_suffix_from_word(self, word: str) -> str:
+        """Remove suffix that indicates how to conjugate the word."""
+
+        if "/" in word:
+            word_elements = word.split("/")
+            word = word_elements[0]
+
+        return word
+
+    def _get_words_meeting_criteria(
+        self,
+        func_checks_criteria: Callable,
+        how: str = "keep",
+        vectorized: bool = False,
+        **kwargs: Optional[Any],
+    ) -> "pd.Series":
+        """Run specified analysis on words (helper function).
+
+        Parameters
+        ----------
+        func_checks_criteria : Callable
+            Function that analyzes the words to determine which met the
+            criteria.
+        how : {"keep", "remove"}, str  # noqa: DAR103 (numpy style)
+            Determines if words meeting the criteria should be kept or removed.
+        vectorized : bool
+            Specifies if func_checks_criteria analyzes the whole pool at once
+            and returns a boolean flag for each word. Otherwise, it is called
+            with each word (Default=False)
+        **kwargs : Any
+            Key-word args to pass to func_checks_criteria
+
+        Returns
+        -------
+        pool_cleaned : pd.Series
+            Words that met the criteria.
+
+        Raises
+        ------
+        ValueError
+            If how is not "keep" or "remove".
+        """
+
+        criterion = Criterion(
+            name=getattr(func_checks_criteria, "__name__", "criteria"),
+            func=func_checks_criteria,
+            how=how,
+            kwargs=kwargs,
+            vectorized=vectorized,
+        )
+        flags_to_keep = criterion.evaluate(self._words)
+        pool_cleaned = self._pool_cleaned[flags_to_keep]
+
+        return pool_cleaned
+
+    def _select(self, criterion: Criterion) -> None:
+        """Select the words meeting the criterion (helper function).
+
+        The criterion is added to the query plan, which is evaluated
+        immediately unless the pool is lazy.
+
+        Parameters
+        ----------
+        criterion : Criterion
+            criterion the words have to meet
+        """
+
+        self._plan.add(criterion)
+        if not self._lazy:
+            self._evaluate_plan()
+
+    def _evaluate_plan(self) -> None:
+        """Apply all the selections in the query plan."""
+
+        if len(self._plan) == 0:
+            return
+
+        key = None
+        flags_to_keep = None
+        if self.cache is not None:
+            key = self._get_cache_key(self._plan.criteria)
+            with self._stage("read_cache", len(self._positions)) as stage:
+                flags_to_keep = self.cache.get(key, len(self._positions))
+                if flags_to_keep is not None:
+                    stage.n_out = int(flags_to_keep.sum())
+
+        if flags_to_keep is None:
+            flags_to_keep, _ = self._plan.evaluate(
+                self._words_view, self._n_base, self.instrumentation, self._positions
+            )
+            if self.cache is not None and key is not None:
+                self.cache.put(key, flags_to_keep)
+        self._keep(flags_to_keep)
+        # the words selected are identified by the chain of selections
+        self._state_key = key
+        self._plan.clear()
+
+    def _get_cache_key(self, criteria: Sequence[Criterion]) -> str:
+        """Get the key of the result of the criteria in the cache.
+
+        The key depends on the content of the base pool, the words selected
+        before and the criteria in the order they were added.
+        """
+
+        if self._fingerprint is None:
+            if self._column is not None:
+                buffer = self._column.buffer.tobytes()
+                self._fingerprint = hashlib.sha256(buffer).hexdigest()
+            else:
+                words = self._base_words.tolist()  # type: ignore
+                self._fingerprint = hash_words(words)
+        if self._state_key is None:
+            positions = self._positions.astype(np.int64).tobytes()
+            self._state_key = hashlib.sha256(positions).hexdigest()
+
+        selections = [
+            [criterion.name, criterion.how, criterion.kwargs] for criterion in criteria
+        ]
+
+        return get_key(
+            __version__,
+            self._fingerprint,
+            self._clean_conjugation_suffix,
+            self._state_key,
+            selections,
+        )
+
+    def explain(self) -> str:
+        """Describe the selections that have not been applied yet.
+
+        The selections are shown in the order they will be evaluated, with
+        the number of words before and after each of them.
+
+        Returns
+        -------
+        str
+            Description of the query plan.
+        """
+
+        return self._plan.explain(self._words_view, self._n_base, self._positions)
+
+    @property
+    def _n_base(self) -> Optional[int]:
+        """Number of words in the base pool if it has a feature index."""
+
+        if self._features is None:
+            return None
+
+        return self._features.n_words
+
+    def add_words(self, words: Iterable[str]) -> None:
+        """Add words to the pool, normalizing and cleaning only them.
+
+        The words are added to the base pool and selected, also in the
+        selections that can be restored with :meth:`undo`. Selections that
+        were already applied are not applied to them, but the pending
+        selections of lazy pools are. The structures derived from the base
+        pool (the feature and prefix indexes of the default pool, the neighbor
+        counts and the edit distance index) are updated instead of being
+        built again, and cached selections are not reused.
+
+        If duplicates were removed (see :meth:`remove_duplicates`), words that
+        are already in the pool are only counted in the provenance.
+
+        Parameters
+        ----------
+        words : Iterable[str]
+            words to be added. The labels of a pd.Series are kept; otherwise,
+            the words are labeled with consecutive integers after the largest
+            label of the pool.
+        """
+
+        if not _is_series(words):
+            words = [words] if isinstance(words, str) else list(words)
+        n_base = self._size_base
+        with self._stage("add_words", len(words)) as stage:  # type: ignore
+            words_formatted, labels = self._format_words(words)
+            words_added = words_formatted
+            if self._clean_conjugation_suffix:
+                words_added = self._clean_conjugation_suffixes(words_formatted)
+            affix_flags = None
+            if self._features is not None:
+                affix_flags = [word.strip().partition("/")[2] for word in words]
+
+            if self._deduplicator is not None:
+                self._deduplicator = self._deduplicator.copy()
+                positions_new = self._deduplicator.add(words_added, words_formatted)
+                words_added = words_added[positions_new]
+                words_formatted = words_formatted[positions_new]
+                labels = labels[positions_new]
+                if affix_flags is not None:
+                    affix_flags = [affix_flags[i] for i in positions_new]
+            positions_added = np.arange(n_base, n_base + len(words_added))
+            index_base = self._index_base
+            if index_base is None:
+                index_base = np.arange(n_base)
+            if not _is_series(words):
+                start = n_base
+                if n_base > 0 and np.issubdtype(index_base.dtype, np.integer):
+                    start = max(start, int(index_base.max()) + 1)
+                labels = np.arange(start, start + len(words_added))
+
+            words_base = self._get_base_words() if self._features is not None else []
+            self._add_to_base(words_added, words_formatted)
+            self._index_base = np.concatenate([index_base, labels])
+            if np.array_equal(self._index_base, np.arange(len(self._index_base))):
+                self._index_base = None
+            if self._deduplicator is not None:
+                self._dedupe_positions = np.concatenate(
+                    [self._dedupe_positions, positions_added]
+                )
+                self._set_provenance()
+
+            words_added_list = words_added.tolist()
+            neighbors = self._update_neighbors(words_base, added=words_added_list)
+            if self._features is not None:
+                self._features = self._features.append(
+                    words_added_list,
+                    affix_flags,
+                    self._get_neighbor_values(neighbors, words_base + words_added_list),
+                )
+            if self._prefixes is not None:
+                column = StringColumn.concatenate(
+                    [self._prefixes.column, StringColumn.from_words(words_added)]
+                )
+                self._prefixes = self._prefixes.append(column)
+            if self._similarity is not None:
+                self._similarity = self._similarity.copy()
+                self._similarity.add(words_added_list)
+
+            self._fingerprint = None
+            self._history = [
+                np.concatenate([positions, positions_added])
+                for positions in self._history
+            ]
+            self._set_positions(np.concatenate([self._positions, positions_added]))
+            stage.n_out = len(words_added)
+
+    def _add_to_base(self, words: np.ndarray, words_original: np.ndarray) -> None:
+        """Add words, and their original version if it is stored, to the base pool."""
+
+        self._load_default_original()
+        original_is_base = (
+            self._column_original is not None and self._column_original is self._column
+        ) or (
+            self._words_original is not None
+            and self._words_original is self._base_words
+        )
+        if self._column is not None:
+            self._column = StringColumn.concatenate(
+                [self._column, StringColumn.from_words(words)]
+            )
+        else:
+            self._base_words = np.concatenate([self._base_words, words])  # type: ignore
+
+        if original_is_base:
+            self._column_original = self._column
+            self._words_original = self._base_words
+        elif self._column_original is not None:
+            self._column_original = StringColumn.concatenate(
+                [self._column_original, StringColumn.from_words(words_original)]
+            )
+        elif self._words_original is not None:
+            self._words_original = np.concatenate(
+                [self._words_original, words_original]
+            )
+
+    def remove_words(self, words: Iterable[str]) -> None:
+        """Remove words from the pool, including its base pool.
+
+        The words are normalized and cleaned like the pool, and every
+        occurrence of them is removed, also from the selections that can be
+        restored with :meth:`undo`. Words that are not in the pool are
+        ignored. The structures derived from the base pool are updated
+        instead of being built again (see :meth:`add_words`).
+
+        Parameters
+        ----------
+        words : Iterable[str]
+            words to be removed
+        """
+
+        words_removed, _ = self._format_words(words)
+        if self._clean_conjugation_suffix:
+            words_removed = self._clean_conjugation_suffixes(words_removed)
+        targets = set(words_removed.tolist())
+        words_base = self._get_base_words()
+        with self._stage("remove_words", len(words_base)) as stage:
+            flags = np.fromiter(
+                map(targets.__contains__, words_base),
+                dtype=bool,
+                count=len(words_base),
+            )
+            stage.n_out = len(words_base)
+            if not flags.any():
+                return
+
+            keep = ~flags
+            positions_kept = np.flatnonzero(keep)
+            positions_new = np.cumsum(keep) - 1
+            self._keep_in_base(keep, positions_kept)
+            index_base = self._index_base
+            if index_base is None:
+                index_base = np.arange(len(keep))
+            self._index_base = index_base[keep]
+            if np.array_equal(self._index_base, np.arange(len(positions_kept))):
+                self._index_base = None
+            if self._deduplicator is not None:
+                self._deduplicator = self._deduplicator.copy()
+                groups_kept = self._deduplicator.discard(targets)
+                self._dedupe_positions = positions_new[
+                    self._dedupe_positions[groups_kept]
+                ]
+                self._set_provenance()
+            else:
+                self._provenance = {
+                    name: values[keep] for name, values in self._provenance.items()
+                }
+
+            words_kept = [word for word, flag in zip(words_base, keep) if flag]
+            neighbors = self._update_neighbors(words_base, removed=targets)
+            if self._features is not None:
+                self._features = self._features.keep(
+                    keep, self._get_neighbor_values(neighbors, words_kept)
+                )
+            if self._prefixes is not None:
+                column = self._prefixes.column.subset(positions_kept)
+                self._prefixes = self._prefixes.keep(keep, column)
+            if self._similarity is not None:
+                self._similarity = self._similarity.copy()
+                self._similarity.discard(targets)
+
+            self._fingerprint = None
+            self._history = [
+                positions_new[positions[keep[positions]]] for positions in self._history
+            ]
+            self._set_positions(positions_new[self._positions[keep[self._positions]]])
+            stage.n_out = len(positions_kept)
+
+    def _keep_in_base(self, flags: np.ndarray, positions: np.ndarray) -> None:
+        """Keep only the flagged words, and their original version, in the base pool."""
+
+        self._load_default_original()
+        original_is_base = (
+            self._column_original is not None and self._column_original is self._column
+        ) or (
+            self._words_original is not None
+            and self._words_original is self._base_words
+        )
+        if self._column is not None:
+            self._column = self._column.subset(positions)
+        else:
+            self._base_words = self._base_words[flags]  # type: ignore
+
+        if original_is_base:
+            self._column_original = self._column
+            self._words_original = self._base_words
+        elif self._column_original is not None:
+            self._column_original = self._column_original.subset(positions)
+        elif self._words_original is not None:
+            self._words_original = self._words_original[flags]
+
+    def _update_neighbors(
+        self,
+        words_base: List[str],
+        added: Iterable[str] = (),
+        removed: Iterable[str] = (),
+    ) -> Dict[str, Dict[str, int]]:
+        """Update the neighbor counts of the base pool after adding or removing words.
+
+        The counts that were computed, and those of the feature index, are
+        updated. words_base are the words of the base pool before the change;
+        they are only needed if the pool has a feature index.
+        """
+
+        added = list(added)
+        removed = list(removed)
+        neighbors = {}
+        for neighborhood in NEIGHBORHOODS:
+            if neighborhood in self._neighbors:
+                counts = dict(self._neighbors[neighborhood])
+            elif self._features is not None:
+                values = self._features.numeric[f"neighbors:{neighborhood}"]
+                counts = dict(zip(words_base, np.asarray(values).tolist()))
+            else:
+                continue
+            update_neighbor_counts(counts, added, removed, neighborhood)
+            neighbors[neighborhood] = counts
+        self._neighbors = neighbors
+
+        return neighbors
+
+    @staticmethod
+    def _get_neighbor_values(
+        neighbors: Dict[str, Dict[str, int]], words: List[str]
+    ) -> Dict[str, np.ndarray]:
+        """Get the neighbor counts of the words as numeric features."""
+
+        return {
+            f"neighbors:{neighborhood}": np.fromiter(
+                map(counts.__getitem__, words), dtype=np.int32, count=len(words)
+            )
+            for neighborhood, counts in neighbors.items()
+        }
+
+    def remove_duplicates(self, provenance: Sequence[str] = ("count",)) -> None:
+        """Keep only the first occurrence of each word.
+
+        Words are compared after they are normalized and their suffixes are
+        cleaned (e.g., "Ana" and "ana/S" are the same word), in a single pass
+        with a hash table (see :mod:`stimpool.dedupe`). The provenance of the
+        words that are kept is returned by :attr:`provenance`.
+
+        Parameters
+        ----------
+        provenance : Sequence[str]
+            Provenance kept for each word: "first" (first original form),
+            "all" (all the original forms) or "count" (number of occurrences)
+            (Default=("count",))
+
+        Raises
+        ------
+        ValueError
+            If a provenance is not valid or the original forms are needed but
+            the pool doesn't store them.
+        """
+
+        deduplicator = Deduplicator(provenance)
+        self._evaluate_plan()
+        words_original = None
+        if deduplicator.needs_original:
+            words_original = self._take_original(self._positions)
+            if words_original is None:
+                raise ValueError("The original words of the pool are not stored")
+
+        with self._stage("remove_duplicates", len(self._positions)) as stage:
+            positions_new = deduplicator.add(self._words, words_original)
+            self._deduplicator = deduplicator
+            self._dedupe_positions = self._positions[positions_new]
+            self._set_provenance()
+            self._keep(positions_new)
+            stage.n_out = len(self._positions)
+
+    def _set_provenance(self) -> None:
+        """Place the provenance of the distinct words at their base positions."""
+
+        self._provenance = {}
+        if self._deduplicator is None:
+            return
+
+        for name, values in self._deduplicator.get_provenance().items():
+            if name == "count":
+                values_base = np.zeros(self._size_base, dtype=np.int64)
+            else:
+                values_base = np.full(self._size_base, None, dtype=object)
+            values_base[self._dedupe_positions] = values
+            self._provenance[name] = values_base
+
+    @property
+    def provenance(self) -> Optional["pd.DataFrame"]:
+        """Return the provenance of the words kept by removing duplicates.
+
+        It has a column for each provenance (first, all or count). Words
+        that were removed as duplicates have no provenance (None or 0) if the
+        removal is undone. It is None if duplicates were not removed.
+        """
+
+        if not self._provenance:
+            return None
+
+        self._evaluate_plan()
+        columns = {
+            name: values[self._positions] for name, values in self._provenance.items()
+        }
+
+        return _import_pandas().DataFrame(columns, index=self._index)
+
+    def sample_pool(
+        self, n: int, reproducible: bool = True, seed: Optional[int] = None
+    ) -> None:
+        """Sample from the word pool.
+
+        The sample is drawn without replacement with a NumPy Generator (see
+        :mod:`stimpool.sampling`), so the same seed always gives the same
+        words.
+
+        Parameters
+        ----------
+        n : int
+            sample size
+
+        reproducible : bool
+            Specifies whether the sample obtained should be reproducible.
+            This is important to guarantee the reproducibility of
+            research (Default=True)
+        seed : int
+            Seed of the sample (the default is None, use the default seed if
+            the sample is reproducible; otherwise, fresh entropy)
+
+        Raises
+        ------
+        ValueError
+            If n is larger than the pool.
+        """
+
+        self._evaluate_plan()
+        seed = self._get_seed(reproducible, seed)
+
+        with self._stage("sample_pool", len(self._positions)) as stage:
+            positions = draw_samples(len(self._positions), n, seed=seed)[0]
+            self._keep(positions)
+            stage.n_out = len(self._positions)
+
+    def draw_samples(
+        self,
+        n: int,
+        n_samples: int,
+        overlap: bool = True,
+        seed: Optional[int] = DEFAULT_SEED,
+        processes: Optional[int] = None,
+    ) -> List["pd.Series"]:
+        """Draw many samples of the word pool at once (e.g., one per participant).
+
+        The pool is not changed. Sample ``i`` only depends on the seed and
+        ``i``, so it is the same regardless of the number of samples drawn or
+        the number of processes (see :mod:`stimpool.sampling`).
+
+        Parameters
+        ----------
+        n : int
+            sample size
+        n_samples : int
+            Number of samples
+        overlap : bool
+            Specifies if a word can appear in several samples. Otherwise, the
+            samples don't share any word (Default=True)
+        seed : int
+            Seed of the samples (Default=1). None gives different samples
+            every run.
+        processes : int
+            Number of worker processes that draw the samples (the default is
+            None, draw them in this process)
+
+        Returns
+        -------
+        List[pd.Series]
+            Words of each sample.
+
+        Raises
+        ------
+        ValueError
+            If the samples are larger than the pool.
+        """
+
+        self._evaluate_plan()
+        with self._stage("draw_samples", len(self._positions)) as stage:
+            samples = draw_samples(
+                len(self._positions), n, n_samples, seed, overlap, processes
+            )
+            words = self._words
+            index = self._index
+            pd = _import_pandas()
+            series = [
+                pd.Series(words[sample], index=index[sample], name="words")
+                for sample in samples
+            ]
+            stage.n_out = samples.size
+
+        return series
+
+    @staticmethod
+    def _get_seed(reproducible: bool, seed: Optional[int]) -> Optional[int]:
+        """Get the seed of a sample (None if it should not be reproducible)."""
+
+        if seed is not None:
+            return seed
+        if reproducible:
+            return DEFAULT_SEED
+
+        return None
+
+    def sample_stratified(
+        self,
+        n: int,
+        by: Sequence[str],
+        bins: Optional[Dict[str, Sequence[int]]] = None,
+        allocation: str = "proportional",
+        reproducible: bool = True,
+        seed: Optional[int] = None,
+    ) -> None:
+        """Sample the word pool balanced across strata of word features.
+
+        The words are grouped once by the combination of their features (e.g.,
+        length and accented characters), and every stratum is drawn at the
+        same time (see :mod:`stimpool.sampling`). The words of the sample are
+        grouped by stratum.
+
+        Parameters
+        ----------
+        n : int
+            Sample size: the total for proportional allocation, or the number
+            of words of each stratum for fixed allocation
+        by : Sequence[str]
+            features that define the strata: "length", "syllables",
+            "accented", "neighbors:substitution" or "neighbors:levenshtein"
+        bins : Dict[str, Sequence[int]]
+            Edges of the bins of numeric features (e.g., {"length": [4, 7]}
+            gives the strata length < 4, 4 <= length < 7 and length >= 7)
+            (the default is None, each value is a stratum)
+        allocation : str
+            "proportional" (the quota of each stratum is proportional to its
+            size) or "fixed" (n words per stratum) (Default=proportional)
+        reproducible : bool
+            Specifies whether the sample obtained should be reproducible
+            (Default=True)
+        seed : int
+            Seed of the sample (the default is None, use the default seed if
+            the sample is reproducible; otherwise, fresh entropy)
+
+        Raises
+        ------
+        ValueError
+            If a feature or the allocation is not valid, or a stratum doesn't
+            have enough words.
+        """
+
+        if len(by) == 0:
+            raise ValueError("At least one feature has to be specified")
+        for name in by:
+            if name not in STRATA_FEATURES:
+                raise ValueError(
+                    f"feature must be one of {STRATA_FEATURES}, not {name!r}"
+                )
+        if bins is None:
+            bins = {}
+
+        self._evaluate_plan()
+        with self._stage("sample_stratified", len(self._positions)) as stage:
+            codes = []
+            for name in by:
+                values = self._compute_feature(name)
+                if name in bins:
+                    values = np.digitize(values, bins[name])
+                codes.append(values)
+            values_strata, strata = np.unique(
+                np.stack(codes, axis=1), axis=0, return_inverse=True
+            )
+            labels = [
+                ", ".join(f"{name}={value}" for name, value in zip(by, values))
+                for values in values_strata.tolist()
+            ]
+            sizes = np.bincount(strata.ravel(), minlength=len(values_strata))
+            quotas = allocate_quotas(sizes, n, allocation, labels)
+            positions = draw_stratified(
+                strata.ravel(), quotas, self._get_seed(reproducible, seed)
+            )
+            self._keep(positions)
+            stage.n_out = len(self._positions)
+
+    def _compute_feature(self, name: str) -> np.ndarray:
+        """Compute a feature of each word of the pool (see STRATA_FEATURES)."""
+
+        if self._features is not None:
+            if name == "accented":
+                return self._features.flags(name)[self._positions]
+            return np.asarray(self._features.numeric[name])[self._positions]
+
+        words = self._words.tolist()
+        if name == "length":
+            return word_lengths(words)
+        if name == "syllables":
+            return load_hyphenator().count_syllables_pool(words)
+        if name == "accented":
+            return flag_characters(words, ACCENTED_CHARACTERS)
+
+        neighbors = self._get_neighbors(name.partition(":")[2])
+
+        return np.fromiter(
+            map(neighbors.__getitem__, words), dtype=np.int64, count=len(words)
+        )
+
+    def match_lists(
+        self,
+        k: int,
+        n: Optional[int] = None,
+        by: Sequence[str] = ("length", "syllables"),
+        covariates: Optional[Dict[str, Sequence[float]]] = None,
+        time_budget: Optional[float] = 1.0,
+        max_iterations: Optional[int] = None,
+        seed: Optional[int] = DEFAULT_SEED,
+    ) -> MatchedLists:
+        """Split the word pool into lists matched on the means of word features.
+
+        The pool is not changed. The features are computed once, and the words
+        are assigned to the lists with a search that swaps words between the
+        lists until their means are equal, or the time budget or the maximum
+        number of iterations is exhausted (see :mod:`stimpool.matching`).
+
+        Parameters
+        ----------
+        k : int
+            Number of lists (e.g., one per condition)
+        n : int
+            Number of words of each list (the default is None, split all the
+            words of the pool)
+        by : Sequence[str]
+            features that are matched: "length", "syllables", "accented",
+            "neighbors:substitution" or "neighbors:levenshtein"
+            (Default=("length", "syllables"))
+        covariates : Dict[str, Sequence[float]]
+            Other features that are matched (e.g., {"frequency": [...]}), with
+            one value per word, in the order of :attr:`words` (the default is
+            None, only match the features in by)
+        time_budget : float
+            Maximum duration of the search in seconds (Default=1.0). None has
+            no time limit.
+        max_iterations : int
+            Maximum number of iterations (the default is None, no limit).
+            Lists are reproducible for a seed when the search is only limited
+            by max_iterations.
+        seed : int
+            Seed of the search (Default=1). None gives different lists every
+            run.
+
+        Returns
+        -------
+        MatchedLists
+            Words of each list and the balance achieved.
+
+        Raises
+        ------
+        ValueError
+            If a feature is not valid, a covariate doesn't have one value per
+            word, or the pool doesn't have k * n words.
+        """
+
+        if covariates is None:
+            covariates = {}
+        for name in by:
+            if name not in STRATA_FEATURES:
+                raise ValueError(
+                    f"feature must be one of {STRATA_FEATURES}, not {name!r}"
+                )
+        names = list(by) + list(covariates)
+        if len(names) == 0:
+            raise ValueError("At least one feature has to be specified")
+
+        self._evaluate_plan()
+        n_words = len(self._positions)
+        if n is None:
+            n = n_words // k if k > 0 else 0
+        with self._stage("match_lists", n_words) as stage:
+            columns = [self._compute_feature(name) for name in by]
+            for name, covariate in covariates.items():
+                column = np.asarray(covariate, dtype=np.float64)
+                if column.shape != (n_words,):
+                    raise ValueError(
+                        f"covariate {name!r} has to have one value per word "
+                        f"({n_words})"
+                    )
+                columns.append(column)
+            values = np.stack(columns, axis=1).astype(np.float64)
+            result = match_lists(values, k, n, time_budget, max_iterations, seed)
+
+            words = self._words
+            index = self._index
+            pd = _import_pandas()
+            lists = [
+                pd.Series(words[positions], index=index[positions], name="words")
+                for positions in result.lists
+            ]
+            balance = pd.DataFrame(
+                {
+                    f"{name}_{statistic}": values[:, i]
+                    for i, name in enumerate(names)
+                    for statistic, values in (
+                        ("mean", result.means),
+                        ("std", result.stds),
+                    )
+                }
+            )
+            balance.index.name = "list"
+            stage.n_out = result.lists.size
+
+        return MatchedLists(
+            lists=lists,
+            balance=balance,
+            max_difference=dict(zip(names, result.max_difference.tolist())),
+            objective=result.objective,
+            iterations=result.iterations,
+            seconds=result.seconds,
+        )
+
+    def sample_dissimilar_pool(
+        self,
+        n: int,
+        min_distance: int = 2,
+        reproducible: bool = True,
+        seed: Optional[int] = None,
+    ) -> None:
+        """Sample words whose edit distance to each other is at least min_distance.
+
+        Words are visited in random order and each one is kept unless it is
+        closer than min_distance to a word kept before. The words close to each
+        kept word are found in a BK-tree of the base pool (see
+        :mod:`stimpool.similarity`), so the distances between every pair of
+        words are never computed.
+
+        Parameters
+        ----------
+        n : int
+            sample size
+        min_distance : int
+            Minimum Levenshtein distance between the words (Default=2)
+        reproducible : bool
+            Specifies whether the sample obtained should be reproducible
+            (Default=True)
+        seed : int
+            Seed of the sample (the default is None, use the default seed if
+            the sample is reproducible; otherwise, fresh entropy)
+
+        Raises
+        ------
+        ValueError
+            If min_distance is less than 1 or fewer than n words are far
+            enough from each other.
+        """
+
+        if min_distance < 1:
+            raise ValueError("min_distance has to be at least 1")
+
+        self._evaluate_plan()
+        similarity = self._get_similarity()
+        words = self._words
+
+        with self._stage("sample_dissimilar_pool", len(words)) as stage:
+            generator = get_generator(self._get_seed(reproducible, seed))
+            similar: Set[str] = set()
+            positions: List[int] = []
+            for position in generator.permutation(len(words)):
+                if len(positions) == n:
+                    break
+                word = words[position]
+                if word in similar:
+                    continue
+                positions.append(position)
+                similar.update(similarity.find_similar([word], min_distance - 1))
+
+            if len(positions) < n:
+                raise ValueError(
+                    f"Only {len(positions)} words are at least {min_distance} "
+                    "edits apart"
+                )
+            self._keep(np.asarray(positions, dtype=np.int64))
+            stage.n_out = len(self._positions)
+
+    def save_pool(
+        self,
+        filename: str = "word pool",
+        file_format: str = "csv",
+        features: Sequence[str] = (),
+        chunksize: int = CHUNKSIZE,
+    ) -> None:
+        """Save the word pool to a file.
+
+        The words (column "word") and their features are written one chunk at
+        a time (see :mod:`stimpool.export`). Parquet and Arrow files can be
+        memory-mapped or partially read.
+
+        Parameters
+        ----------
+        filename : str
+            Name of the file without the extension, which is the format.
+            (Default=word pool)
+        file_format : str
+            csv, csv.gz, csv.zst, jsonl, jsonl.gz, jsonl.zst, parquet, arrow or
+            feather (Default=csv)
+        features : Sequence[str]
+            feature columns to save with the words: length, syllables or
+            accented (the default is (), only the words)
+        chunksize : int
+            Number of words written at once (Default=100000)
+        """
+
+        self._evaluate_plan()
+        path = f"{filename}.{file_format}"
+        words = self._words
+        with self._stage("save_pool", len(words)) as stage:
+            write_pool(words, Path(path), file_format, features, chunksize)
+            stage.n_out = len(words)
+
+    def _stage(self, name: str, n_in: Optional[int] = None) -> Any:
+        """Measure a stage if the pool has instrumentation.
+
+        Parameters
+        ----------
+        name : str
+            name of the stage
+        n_in : int
+            Number of words the stage receives (the default is None, not
+            applicable)
+
+        Returns
+        -------
+        Stage
+            Context manager whose n_out has to be set before it ends.
+        """
+
+        if self.instrumentation is None:
+            return NULL_STAGE
+
+        return self.instrumentation.stage(name, n_in)
+
+    @property
+    def _size_base(self) -> int:
+        """Number of words in the base pool, before any selection."""
+
+        if self._column is not None:
+            return len(self._column)
+
+        return len(self._base_words)  # type: ignore
+
+    def _get_base_words(self) -> List[str]:
+        """Get the words of the base pool, before any selection."""
+
+        if self._column is not None:
+            return self._column.to_list()
+
+        return self._base_words.tolist()  # type: ignore
+
+    @property
+    def _index(self) -> np.ndarray:
+        """Label of each word of the pool."""
+
+        if self._index_base is None:
+            return self._positions
+
+        return self._index_base[self._positions]
+
+    @property
+    def _words(self) -> np.ndarray:
+        """Words of the pool, decoded from the buffer if the pool is compact."""
+
+        if self._column is not None:
+            return self._column.take(self._positions)
+
+        return self._words_view
+
+    @property
+    def _words_view(self) -> Any:
+        """Words of the pool that compact pools only decode when taken."""
+
+        if self._view is None:
+            if self._column is None:
+                self._view = self._base_words[self._positions]  # type: ignore
+            else:
+                self._view = StringColumnView(self._column, self._positions)
+
+        return self._view
+
+    def _set_words(self, words: np.ndarray, index: np.ndarray) -> None:
+        """Replace the base pool with the words and their labels."""
+
+        self._history = []
+        self._provenance = {}
+        self._deduplicator = None
+        self._neighbors = {}
+        self._similarity = None
+        self._fingerprint = None
+        self._set_positions(np.arange(len(words)))
+        self._index_base = None
+        if not np.array_equal(index, self._positions):
+            self._index_base = index
+        if self._compact:
+            self._column = StringColumn.from_words(words)
+            self._base_words = None
+        else:
+            self._column = None
+            self._base_words = words
+
+    def _set_words_original(self, words: Optional[np.ndarray]) -> None:
+        """Replace the original version of the words (None if not stored)."""
+
+        self._words_original = None
+        self._column_original = None
+        if words is not None and self._compact:
+            self._column_original = StringColumn.from_words(words)
+        else:
+            self._words_original = words
+
+    def _set_positions(self, positions: np.ndarray) -> None:
+        """Select the words at the positions of the base pool."""
+
+        self._positions = positions
+        self._series = None
+        self._view = None
+        self._state_key = None
+
+    def _keep(self, selection: np.ndarray) -> None:
+        """Keep only the words selected by flags or positions.
+
+        Only the positions of the words in the base pool are selected, and the
+        previous positions are kept so the selection can be undone.
+        """
+
+        self._history.append(self._positions)
+        self._set_positions(self._positions[selection])
+
+    def reset(self) -> None:
+        """Undo every selection and sample of the pool.
+
+        The base pool is not loaded again. The reset can be undone.
+        """
+
+        self._plan.clear()
+        self._history.append(self._positions)
+        self._set_positions(np.arange(self._size_base))
+
+    def undo(self) -> None:
+        """Undo the last selection or sample of the pool.
+
+        Selections that were not evaluated yet (i.e., in lazy pools) are
+        undone first, one at a time. Selections that were evaluated together
+        are undone together.
+
+        Raises
+        ------
+        ValueError
+            If there are no selections to undo.
+        """
+
+        if len(self._plan) > 0:
+            self._plan.pop()
+        elif self._history:
+            self._set_positions(self._history.pop())
+        else:
+            raise ValueError("There are no selections to undo")
+
+    def fork(self) -> "WordPool":
+        """Create a copy of the pool that can be selected independently.
+
+        The copy shares the base pool, so only the positions of the selected
+        words (and the selections not evaluated yet) are copied.
+
+        Returns
+        -------
+        WordPool
+        """
+
+        word_pool = copy.copy(self)
+        word_pool._plan = self._plan.copy()
+        word_pool._history = list(self._history)
+        word_pool._set_positions(self._positions)
+        word_pool._state_key = self._state_key
+
+        return word_pool
+
+    def memory_usage(self) -> int:
+        """Get the number of bytes used by the words of the pool.
+
+        It includes the words (cleaned and original), their labels and the
+        positions of the selections that can be undone, like
+        pandas.Series.memory_usage(deep=True). Memory-mapped buffers (i.e.,
+        the default pool of compact pools) are shared by every pool and are
+        not counted.
+
+        Returns
+        -------
+        int
+        """
+
+        arrays = {id(positions): positions for positions in self._history}
+        arrays[id(self._positions)] = self._positions
+        if self._index_base is not None:
+            arrays[id(self._index_base)] = self._index_base
+        if isinstance(self._view, np.ndarray):
+            arrays[id(self._view)] = self._view
+        sizes_words: Dict[int, int] = {}
+        for words in (self._base_words, self._words_original):
+            if words is not None:
+                arrays[id(words)] = words
+                sizes_words.update((id(word), sys.getsizeof(word)) for word in words)
+        for column in (self._column, self._column_original):
+            if column is not None and not isinstance(column.buffer, np.memmap):
+                arrays[id(column.buffer)] = column.buffer
+                arrays[id(column.offsets)] = column.offsets
+
+        return sum(array.nbytes for array in arrays.values()) + sum(
+            sizes_words.values()
+        )
+
+    @property
+    def _pool_cleaned(self) -> "pd.Series":
+        """Words of the pool as a pd.Series, created when first needed.
+
+        The Series of compact pools is not kept, as it holds the decoded words.
+        """
+
+        if self._series is not None:
+            return self._series
+
+        series = _import_pandas().Series(
+            self._words, index=self._index, dtype="object", name="words"
+        )
+        if not self._compact:
+            self._series = series
+
+        return series
+
+    def _load_default_original(self) -> None:
+        """Load the original words of the default pool if they are requested."""
+
+        if self._load_original:
+            self._words_original = to_object_array(
+                load_default_pool().original.to_list()
+            )
+            self._load_original = False
+
+    def _take_original(self, positions: np.ndarray) -> Optional[np.ndarray]:
+        """Get the original version of the words at positions of the base pool.
+
+        Returns None if the original words are not stored.
+        """
+
+        self._load_default_original()
+        if self._column_original is not None:
+            return self._column_original.take(positions)
+        if self._words_original is not None:
+            return self._words_original[positions]
+
+        return None
+
+    @property
+    def _pool_original(self) -> Optional["pd.Series"]:
+        """Original version of the words as a pd.Series (None if not stored)."""
+
+        self._load_default_original()
+        if self._column_original is not None:
+            words_original = to_object_array(self._column_original.to_list())
+        elif self._words_original is not None:
+            words_original = self._words_original
+        else:
+            return None
+
+        index = self._index_base
+        if index is None:
+            index = np.arange(len(words_original))
+
+        return _import_pandas().Series(
+            words_original,
+            index=index,
+            dtype="object",
+            name="words_original",
+        )
+
+    @property
+    def words(self) -> "pd.Series":
+        """Return the clean word pool."""
+
+        self._evaluate_plan()
+
+        return self._pool_cleaned
+
+    @property
+    def syllables(self) -> "pd.Series":
+        """Return the number of syllables of each word in the pool."""
+
+        self._evaluate_plan()
+        values = self._compute_feature("syllables")
+
+        return _import_pandas().Series(
+            values, index=self._index, name="syllables", dtype="int64"
+        )
+
+    def neighbors(self, neighborhood: str = "substitution") -> "pd.Series":
+        """Return the number of orthographic neighbors of each word in the pool.
+
+        Parameters
+        ----------
+        neighborhood : str
+            "substitution" (Coltheart's N) or "levenshtein" (Levenshtein
+            distance 1) (Default=substitution)
+
+        Returns
+        -------
+        pd.Series
+
+        Raises
+        ------
+        ValueError
+            If the neighborhood is not valid.
+        """
+
+        if neighborhood not in NEIGHBORHOODS:
+            raise ValueError(
+                f"neighborhood must be one of {NEIGHBORHOODS}, not {neighborhood!r}"
+            )
+
+        self._evaluate_plan()
+        values = self._compute_feature(f"neighbors:{neighborhood}")
+
+        return _import_pandas().Series(
+            values, index=self._index, name="neighbors", dtype="int64"
+        )
+
+    @property
+    def synonyms(self) -> "pd.Series":
+        """Return the synonyms of each word in the pool."""
+
+        self._evaluate_plan()
+        synonyms = load_thesaurus().get_synonyms_pool(self._words.tolist())
+
+        return _import_pandas().Series(
+            synonyms, index=self._index, name="synonyms", dtype="object"
+        )
@@ -20,9 +20,11 @@ COVERAGE_DIR = ROOT_DIR.joinpath("htmlcov")
 COVERAGE_REPORT = COVERAGE_DIR.joinpath("index.html")
 SOURCE_DIR = ROOT_DIR.joinpath("src/stimpool")
 TEST_DIR = ROOT_DIR.joinpath("tests")
+BENCHMARK_DIR = ROOT_DIR.joinpath("benchmarks")
 PYTHON_TARGETS = [
     SOURCE_DIR,
     TEST_DIR,
+    BENCHMARK_DIR,
     ROOT_DIR.joinpath("noxfile.py"),
     Path(__file__),
 ]
@@ -142,6 +144,21 @@ def tests(c):
     _run(c, f"poetry run pytest {' '.join(pytest_options)} {TEST_DIR} {SOURCE_DIR}")
 
 
+@task(
+    help={
+        "sizes": "Comma separated pool sizes: 55k, 1M, 10M (Default=55k)",
+        "compare": "Compare with the last saved run (Default=False)",
+    }
+)
+def benchmarks(c, sizes="55k", compare=False):
+    # type: (Context, str, bool) -> None
+    """Run the benchmarks and save their results."""
+    pytest_options = [f"--pool-sizes={sizes}", "--benchmark-autosave"]
+    if compare:
+        pytest_options.append("--benchmark-compare")
+    _run(c, f"poetry run pytest {' '.join(pytest_options)} {BENCHMARK_DIR}")
+
+
 @task(
     help={
         "fmt": "Build a local report: report, html, json, annotate, html, xml.",
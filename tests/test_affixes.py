@@ -0,0 +1,154 @@
+"""Tests for `affixes` module."""
+
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from stimpool import WordPool, words
+from stimpool.affixes import (
+    AffixRules,
+    compile_condition,
+    expand_dictionary,
+    load_affix_rules,
+    read_dictionary,
+)
+
+AFFIX_FILE = """SET UTF-8
+FLAG UTF-8
+
+PFX p Y 1
+PFX p 0 re .
+
+SFX S Y 2
+SFX S 0 s [aeo]
+SFX S 0 es [^aeo]
+
+SFX A Y 1
+SFX A r ción/S ar
+
+SFX N N 1
+SFX N o ito o
+"""
+
+
+@pytest.fixture
+def rules(tmp_path: Path) -> AffixRules:
+    """Compile a small set of affix rules."""
+
+    path = tmp_path / "test.aff"
+    path.write_text(AFFIX_FILE, encoding="utf-8")
+
+    return AffixRules.from_file(path)
+
+
+@pytest.mark.parametrize(
+    ("condition", "word", "exp"),
+    [
+        ("[aeo]", "casa", True),
+        ("[aeo]", "sol", False),
+        ("[^aeo]", "sol", True),
+        ("[^a]er", "comer", True),
+        ("[^a]er", "caer", False),
+        (".", "sol", True),
+    ],
+)
+def test_compile_condition(condition: str, word: str, exp: bool) -> None:
+    """Test that conditions match the end of the word."""
+
+    pattern, length, _ = compile_condition(condition)
+    obs = pattern.match(word, len(word) - length) is not None
+
+    assert obs == exp
+
+
+@pytest.mark.parametrize(
+    ("word", "flags", "exp"),
+    [
+        ("sol", "", ["sol"]),
+        ("casa", "S", ["casa", "casas"]),
+        ("sol", "S", ["sol", "soles"]),
+        # continuation flags
+        ("actuar", "A", ["actuar", "actuación", "actuaciónes"]),
+        # cross product
+        ("casa", "Sp", ["casa", "casas", "recasa", "recasas"]),
+        # no cross product
+        ("gato", "Np", ["gato", "gatito", "regato"]),
+    ],
+)
+def test_expand(rules: AffixRules, word: str, flags: str, exp: List[str]) -> None:
+    """Test that every form of a word is generated."""
+
+    obs = list(rules.expand(word, flags))
+
+    assert sorted(obs) == sorted(exp)
+
+
+def test_expand_default_rules() -> None:
+    """Test the forms generated with the rules of es_PR.aff."""
+
+    rules = load_affix_rules()
+
+    assert list(rules.expand("perro", "GS")) == ["perro", "perra", "perras", "perros"]
+    assert "cantábamos" in set(rules.expand("cantar", "RED"))
+
+
+def test_read_dictionary(tmp_path: Path) -> None:
+    """Test that stems and flags are read from the dictionary."""
+
+    path = tmp_path / "test.dic"
+    path.write_text("3\nsol/S\ncasa/Sp\nya\n", encoding="utf-8")
+
+    assert list(read_dictionary(path)) == [("sol", "S"), ("casa", "Sp"), ("ya", "")]
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_expand_dictionary(rules: AffixRules, tmp_path: Path, processes: int) -> None:
+    """Test that the forms of every entry are streamed in order."""
+
+    path = tmp_path / "test.dic"
+    path.write_text("3\nsol/S\ncasa/Sp\nya\n", encoding="utf-8")
+
+    obs = list(expand_dictionary(path, rules, processes=processes, chunksize=1))
+
+    assert obs == ["sol", "soles", "casa", "casas", "recasa", "recasas", "ya"]
+
+
+def test_from_inflected_forms() -> None:
+    """Test that a pool with the inflected forms of the default pool is created."""
+
+    word_pool = WordPool.from_inflected_forms()
+    words = set(word_pool.words)
+
+    assert len(word_pool.words) > 500000
+    assert {"perros", "cantábamos", "acciones"} <= words
+
+
+@pytest.mark.parametrize("chunksize", [1, 3, 100])
+def test_from_inflected_forms_chunks(
+    rules: AffixRules,
+    tmp_path: Path,
+    chunksize: int,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that forms streamed in chunks smaller than the lexicon are kept."""
+
+    path = tmp_path / "test.dic"
+    path.write_text("3\nsol/S\ncasa/Sp\nya\n", encoding="utf-8")
+    monkeypatch.setattr(
+        words,
+        "expand_dictionary",
+        lambda processes: expand_dictionary(path, rules, processes=processes),
+    )
+    word_pool = WordPool.from_inflected_forms(chunksize=chunksize)
+
+    assert word_pool.words.tolist() == [
+        "sol",
+        "soles",
+        "casa",
+        "casas",
+        "recasa",
+        "recasas",
+        "ya",
+    ]
+    assert word_pool.words.index.tolist() == list(range(7))
@@ -0,0 +1,100 @@
+"""Tests for `batch` module."""
+
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from stimpool import WordPool
+from stimpool.batch import SubpoolSpec, create_subpools
+from stimpool.cache import ResultCache
+
+WORDS = ["sol", "gato", "canción", "periódico", "árbol", "mesa"]
+
+
+def test_create_subpools() -> None:
+    """Test that each subpool has the words meeting its selections."""
+
+    specs = [
+        SubpoolSpec("short", [("select_words_of_length", {"max_len": 4})]),
+        SubpoolSpec(
+            "short_plain",
+            [
+                ("select_words_of_length", {"max_len": 4}),
+                ("select_words_without_accented_characters", {}),
+            ],
+        ),
+        SubpoolSpec("all"),
+    ]
+    subpools = create_subpools(specs, WORDS)
+
+    assert list(subpools) == ["short", "short_plain", "all"]
+    assert subpools["short"].tolist() == ["sol", "gato", "mesa"]
+    assert subpools["short_plain"].tolist() == ["sol", "gato", "mesa"]
+    assert subpools["all"].tolist() == WORDS
+    assert subpools["short"].name == "short"
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_create_subpools_matches_word_pool(processes: int) -> None:
+    """Test that subpools match applying the selections to a WordPool."""
+
+    criteria = [
+        ("select_words_of_length", {"min_len": 4, "max_len": 6}),
+        ("select_words_of_syllables", {"max_syl": 2}),
+    ]
+    specs = [
+        SubpoolSpec("a", criteria, n=20, seed=1),
+        SubpoolSpec("b", criteria[:1], n=20, seed=2),
+    ]
+    subpools = create_subpools(specs, processes=processes)
+
+    for spec in specs:
+        word_pool = WordPool()
+        for method, kwargs in spec.criteria:
+            getattr(word_pool, method)(**kwargs)
+        word_pool.sample_pool(n=20, seed=spec.seed)
+        assert subpools[spec.name].tolist() == word_pool.words.tolist()
+
+
+def test_create_subpools_cache(tmp_path: Path) -> None:
+    """Test that the masks of the selections are stored and read back."""
+
+    specs = [
+        SubpoolSpec("short", [("select_words_of_length", {"max_len": 4})]),
+        SubpoolSpec(
+            "short_plain",
+            [
+                ("select_words_of_length", {"max_len": 4}),
+                ("select_words_without_accented_characters", {}),
+            ],
+        ),
+    ]
+    subpools = create_subpools(specs, WORDS, cache=ResultCache(tmp_path))
+    cache = ResultCache(tmp_path)
+    subpools_cached = create_subpools(specs, WORDS, cache=cache)
+
+    assert {name: words.tolist() for name, words in subpools_cached.items()} == {
+        name: words.tolist() for name, words in subpools.items()
+    }
+    assert (cache.hits, cache.misses) == (2, 0)
+
+    # the masks are shared with pools that make the same selection
+    word_pool = WordPool(WORDS, cache=cache)
+    word_pool.select_words_of_length(max_len=4)
+    assert cache.hits == 3
+
+
+@pytest.mark.parametrize(
+    "specs",
+    [
+        [SubpoolSpec("a"), SubpoolSpec("a")],
+        [SubpoolSpec("a", [("save_pool", {})])],
+        [SubpoolSpec("a", [("select_words_of_length", {})])],
+    ],
+)
+def test_create_subpools_exception(specs: List[SubpoolSpec]) -> None:
+    """Test that invalid specs raise an exception."""
+
+    with pytest.raises(ValueError):
+        create_subpools(specs, WORDS)
@@ -0,0 +1,101 @@
+"""Tests for `cache` module."""
+
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+
+from stimpool.cache import ResultCache, get_key, hash_words
+from stimpool.compiled import StringColumn
+
+
+def test_get_key() -> None:
+    """Test that keys only depend on the values of the parts."""
+
+    key = get_key("pool", [["select_words_of_length", {"min_len": 2, "max_len": 4}]])
+
+    assert key == get_key(
+        "pool", [["select_words_of_length", {"max_len": 4, "min_len": 2}]]
+    )
+    assert key != get_key(
+        "pool", [["select_words_of_length", {"min_len": 2, "max_len": 5}]]
+    )
+    assert get_key({"a", "b"}, re.compile("^a")) == get_key(
+        {"b", "a"}, re.compile("^a")
+    )
+    assert get_key(re.compile("^a")) != get_key(re.compile("^a", re.IGNORECASE))
+
+
+def test_get_key_exception() -> None:
+    """Test that values that can't identify a result raise a TypeError."""
+
+    with pytest.raises(TypeError):
+        get_key(object())
+
+
+@pytest.mark.parametrize("words", [[], ["sol"], ["gato", "canción", "ñame"]])
+def test_hash_words(words: List[str]) -> None:
+    """Test that the hash of the words matches the hash of their column."""
+
+    column = StringColumn.from_words(words)
+
+    assert hash_words(words) == hashlib.sha256(column.buffer.tobytes()).hexdigest()
+
+
+@pytest.mark.parametrize("n_words", [0, 5, 8, 13])
+def test_result_cache_roundtrip(n_words: int, tmp_path: Path) -> None:
+    """Test that stored results are read back and others are misses."""
+
+    cache = ResultCache(tmp_path)
+    flags = np.arange(n_words) % 3 == 0
+    cache.put("a", flags)
+
+    assert (cache.get("a", n_words) == flags).all()
+    assert cache.get("b", n_words) is None
+    assert cache.get("a", n_words + 8) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert len(cache) == 1
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    """Test that the oldest results are removed when the cache is full."""
+
+    flags = np.ones(8000, dtype=bool)
+    cache = ResultCache(tmp_path)
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.put(key, flags)
+        os.utime(tmp_path / f"{key}.npy", ns=(i * 10**9, i * 10**9))
+    size = (tmp_path / "a.npy").stat().st_size
+
+    # reading "a" makes "b" the least recently used result
+    assert cache.get("a", len(flags)) is not None
+    cache.max_bytes = 3 * size
+    cache.put("d", flags)
+
+    assert sorted(path.stem for path in tmp_path.glob("*.npy")) == ["a", "c", "d"]
+
+
+def test_result_cache_clear(tmp_path: Path) -> None:
+    """Test that clearing the cache removes every result."""
+
+    cache = ResultCache(tmp_path)
+    cache.put("a", np.ones(3, dtype=bool))
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.get("a", 3) is None
+
+
+def test_result_cache_not_writable(tmp_path: Path) -> None:
+    """Test that results that can't be stored are ignored."""
+
+    path = tmp_path / "file"
+    path.write_text("", encoding="utf-8")
+    cache = ResultCache(path / "results")
+    cache.put("a", np.ones(3, dtype=bool))
+
+    assert cache.get("a", 3) is None
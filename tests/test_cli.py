@@ -0,0 +1,127 @@
+"""Tests for `cli` module."""
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from stimpool.cli import main, parse_specs, read_spec_file
+from stimpool.export import read_pool
+
+SPEC = {
+    "pool": "words.txt",
+    "features": ["length"],
+    "pools": [
+        {
+            "name": "short",
+            "select": [{"select_words_of_length": {"max_len": 4}}],
+        },
+        {
+            "name": "plain",
+            "n": 1,
+            "select": ["select_words_without_accented_characters"],
+        },
+    ],
+}
+
+
+@pytest.fixture
+def spec_path(tmp_path: Path) -> Path:
+    """Create a JSON spec with its word pool."""
+
+    (tmp_path / "words.txt").write_text("sol\ngato\ncanción\nárbol\n", "utf-8")
+    path = tmp_path / "spec.json"
+    path.write_text(json.dumps(SPEC), encoding="utf-8")
+
+    return path
+
+
+def test_parse_specs() -> None:
+    """Test that pools are converted to subpool specs."""
+
+    specs = parse_specs(SPEC)
+
+    assert [spec.name for spec in specs] == ["short", "plain"]
+    assert specs[0].criteria == [("select_words_of_length", {"max_len": 4})]
+    assert specs[1].criteria == [("select_words_without_accented_characters", {})]
+    assert specs[1].n == 1
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        {},
+        {"pools": []},
+        {"pools": [{"n": 2}]},
+        {"pools": [{"name": "a", "select": [1]}]},
+    ],
+)
+def test_parse_specs_exception(spec: dict) -> None:
+    """Test that invalid specs raise an exception."""
+
+    with pytest.raises(ValueError):
+        parse_specs(spec)
+
+
+@pytest.mark.parametrize(
+    ("suffix", "content"),
+    [
+        (".yaml", "pools:\n  - name: a\n    n: 2\n"),
+        (".toml", '[[pools]]\nname = "a"\nn = 2\n'),
+        (".json", '{"pools": [{"name": "a", "n": 2}]}'),
+    ],
+)
+def test_read_spec_file(suffix: str, content: str, tmp_path: Path) -> None:
+    """Test that YAML, TOML and JSON specs are read."""
+
+    if suffix == ".yaml":
+        pytest.importorskip("yaml")
+    path = tmp_path / f"spec{suffix}"
+    path.write_text(content, encoding="utf-8")
+
+    assert read_spec_file(path) == {"pools": [{"name": "a", "n": 2}]}
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_build(spec_path: Path, jobs: str, tmp_path: Path) -> None:
+    """Test that every pool of the spec is saved."""
+
+    output_dir = tmp_path / "pools"
+    result = CliRunner().invoke(
+        main,
+        ["build", str(spec_path), "-o", str(output_dir), "-f", "jsonl", "-j", jobs],
+    )
+
+    assert result.exit_code == 0, result.output
+    short = read_pool(output_dir / "short.jsonl", "jsonl")
+    assert short.to_dict("list") == {"word": ["sol", "gato"], "length": [3, 4]}
+    assert len(read_pool(output_dir / "plain.jsonl", "jsonl")) == 1
+
+
+def test_build_cache(
+    spec_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that builds with --cache store the results of the selections."""
+
+    monkeypatch.setenv("STIMPOOL_CACHE_DIR", str(tmp_path / "cache"))
+    output_dir = tmp_path / "pools"
+    for _ in range(2):
+        result = CliRunner().invoke(
+            main, ["build", str(spec_path), "-o", str(output_dir), "--cache"]
+        )
+        assert result.exit_code == 0, result.output
+
+    assert len(list((tmp_path / "cache" / "results").glob("*.npy"))) > 0
+    assert len(read_pool(output_dir / "short.csv")) == 2
+
+
+def test_build_invalid_spec(tmp_path: Path) -> None:
+    """Test that invalid specs are reported without a traceback."""
+
+    path = tmp_path / "spec.json"
+    path.write_text('{"pools": []}', encoding="utf-8")
+    result = CliRunner().invoke(main, ["build", str(path)])
+
+    assert result.exit_code == 1
+    assert "list of pools" in result.output
@@ -0,0 +1,182 @@
+"""Tests for `compiled` module."""
+
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+
+from stimpool import WordPool, compiled
+from stimpool.compiled import (
+    DEFAULT_POOL_PATH,
+    FORMAT_VERSION,
+    CompiledPool,
+    StringColumn,
+    StringColumnView,
+    load_default_pool,
+)
+
+
+@pytest.fixture
+def dictionary(tmp_path: Path) -> Path:
+    """Create a small hunspell dictionary."""
+
+    path = tmp_path / "test.dic"
+    path.write_text("3\nAna\ncanción/S\nperro/GS\n", encoding="utf-8")
+
+    return path
+
+
+@pytest.mark.parametrize(
+    "words",
+    [
+        [],
+        ["perro"],
+        ["al", "gato", "cabeza", "periódico", "ñame"],
+    ],
+)
+def test_string_column_roundtrip(words: List[str], tmp_path: Path) -> None:
+    """Test that words saved to a string column are recovered."""
+
+    column = StringColumn.from_words(words)
+    column.save(tmp_path, "test")
+    column_loaded = StringColumn.load(tmp_path, "test")
+
+    assert len(column_loaded) == len(words)
+    assert column_loaded.to_list() == words
+    assert [column_loaded[i] for i in range(len(words))] == words
+
+
+@pytest.mark.parametrize(
+    "positions",
+    [[], [0], [4, 0, 2], [1, 1, 3], list(range(5))],
+)
+def test_string_column_take(
+    positions: List[int], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the words at the positions are decoded, also in chunks."""
+
+    words = ["al", "gato", "", "periódico", "ñame"]
+    column = StringColumn.from_words(words)
+    exp = [words[i] for i in positions]
+
+    assert column.take(np.array(positions, dtype=np.int64)).tolist() == exp
+    monkeypatch.setattr(compiled, "TAKE_CHUNK_SIZE", 2)
+    assert column.take(np.array(positions, dtype=np.int64)).tolist() == exp
+
+
+def test_string_column_view() -> None:
+    """Test that a view takes the words at its own positions."""
+
+    column = StringColumn.from_words(["al", "gato", "cabeza", "ñame"])
+    view = StringColumnView(column, np.array([3, 1, 2]))
+
+    assert len(view) == 3
+    assert view.take(np.array([0, 2])).tolist() == ["ñame", "cabeza"]
+
+
+def test_compiled_pool_from_dictionary(dictionary: Path) -> None:
+    """Test that compiled columns are normalized and cleaned."""
+
+    compiled_pool = CompiledPool.from_dictionary(dictionary)
+
+    assert compiled_pool.original.to_list() == ["ana", "canción/s", "perro/gs"]
+    assert compiled_pool.cleaned.to_list() == ["ana", "canción", "perro"]
+    assert compiled_pool.affix_flags.to_list() == ["", "S", "GS"]
+
+
+def test_load_default_pool_is_saved(dictionary: Path, tmp_path: Path) -> None:
+    """Test that the compiled pool is saved and memory-mapped."""
+
+    cache_dir = tmp_path / "cache"
+    compiled_pool = load_default_pool(dictionary, cache_dir)
+
+    assert (cache_dir / f"test-v{FORMAT_VERSION}" / "metadata.json").exists()
+    assert compiled_pool.cleaned.buffer.filename is not None
+
+
+def test_load_default_pool_recompiles_on_change(
+    dictionary: Path, tmp_path: Path
+) -> None:
+    """Test that the compiled pool is rebuilt if the source changes."""
+
+    cache_dir = tmp_path / "cache"
+    load_default_pool(dictionary, cache_dir)
+    dictionary.write_text("1\ngato/S\n", encoding="utf-8")
+    compiled_pool = load_default_pool(dictionary, cache_dir)
+
+    assert compiled_pool.cleaned.to_list() == ["gato"]
+
+
+def test_load_default_pool_recompiles_on_new_patterns(
+    dictionary: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the pool is rebuilt if the hyphenation patterns change."""
+
+    cache_dir = tmp_path / "cache"
+    load_default_pool(dictionary, cache_dir)
+    patterns = tmp_path / "hyph_test.dic"
+    patterns.write_text("UTF-8\n1a\n", encoding="utf-8")
+    monkeypatch.setattr(compiled, "_LOADED", {})
+    monkeypatch.setattr(compiled, "DEFAULT_PATTERNS_PATH", patterns)
+    compiled_pool = load_default_pool(dictionary, cache_dir)
+
+    assert compiled_pool.metadata["patterns_sha256"] == compiled.hash_file(patterns)
+
+
+def test_load_default_pool_recompiles_on_new_version(
+    dictionary: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a pool compiled by another version of stimpool is rebuilt."""
+
+    cache_dir = tmp_path / "cache"
+    load_default_pool(dictionary, cache_dir)
+    monkeypatch.setattr(compiled, "_LOADED", {})
+    monkeypatch.setattr(compiled, "__version__", "0.0.0")
+    compiled_pool = load_default_pool(dictionary, cache_dir)
+
+    compiled_pool_saved = CompiledPool.load(cache_dir / f"test-v{FORMAT_VERSION}")
+
+    assert compiled_pool.metadata["stimpool_version"] == "0.0.0"
+    assert compiled_pool_saved.metadata["stimpool_version"] == "0.0.0"
+
+
+@pytest.mark.parametrize("clean_conjugation_suffix", [True, False])
+def test_default_pool_matches_source(
+    clean_conjugation_suffix: bool, tmp_path: Path
+) -> None:
+    """Test that the compiled default pool matches parsing es_PR.dic."""
+
+    word_pool = WordPool(clean_conjugation_suffix=clean_conjugation_suffix)
+    pool_exp = word_pool._format_pool(word_pool._get_default_pool())
+    if clean_conjugation_suffix:
+        pool_exp = word_pool._clean_conjugation_suffixes(pool_exp)
+
+    compiled_pool = CompiledPool.from_dictionary(DEFAULT_POOL_PATH)
+
+    assert word_pool.words.tolist() == pool_exp.tolist()
+    assert compiled_pool.original.to_list() == word_pool._pool_original.tolist()
+
+
+@pytest.mark.parametrize("positions", [[], [0], [4, 0, 2], [1, 1, 3]])
+def test_string_column_subset(positions: List[int]) -> None:
+    """Test that a subset has the words at the positions."""
+
+    words = ["al", "gato", "", "periódico", "ñame"]
+    column = StringColumn.from_words(words).subset(np.array(positions))
+
+    assert column.to_list() == [words[i] for i in positions]
+
+
+def test_string_column_concatenate() -> None:
+    """Test that concatenated columns have the words of every column."""
+
+    columns = [
+        StringColumn.from_words(["al", "gato"]),
+        StringColumn.from_words([]),
+        StringColumn.from_words(["", "ñame"]),
+    ]
+    column = StringColumn.concatenate(columns)
+
+    assert column.to_list() == ["al", "gato", "", "ñame"]
+    assert column[3] == "ñame"
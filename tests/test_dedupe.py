@@ -0,0 +1,81 @@
+"""Tests for `dedupe` module."""
+
+from typing import List
+
+import pytest
+
+from stimpool.dedupe import Deduplicator, group_words
+
+
+@pytest.mark.parametrize(
+    ("words", "exp"),
+    [
+        ([], []),
+        (["ana"], [0]),
+        (["ana", "sol", "ana", "mar", "sol"], [0, 1, 0, 2, 1]),
+    ],
+)
+def test_group_words(words: List[str], exp: List[int]) -> None:
+    """Test that equal words get the same code, in order of appearance."""
+
+    assert group_words(words).tolist() == exp
+
+
+def test_deduplicator_chunks() -> None:
+    """Test that duplicates are found across chunks with their provenance."""
+
+    deduplicator = Deduplicator(["first", "all", "count"])
+    positions_1 = deduplicator.add(["ana", "sol", "ana"], ["ana", "sol/s", "ana/a"])
+    positions_2 = deduplicator.add(["mar", "sol", "mar"], ["mar", "sol", "mar/s"])
+    provenance = deduplicator.get_provenance()
+
+    assert positions_1.tolist() == [0, 1]
+    assert positions_2.tolist() == [0]
+    assert len(deduplicator) == 3
+    assert provenance["count"].tolist() == [2, 2, 2]
+    assert provenance["first"].tolist() == ["ana", "sol/s", "mar"]
+    assert provenance["all"].tolist() == [
+        ("ana", "ana/a"),
+        ("sol/s", "sol"),
+        ("mar", "mar/s"),
+    ]
+
+
+def test_deduplicator_empty_chunk() -> None:
+    """Test that empty chunks don't change the words seen."""
+
+    deduplicator = Deduplicator()
+    deduplicator.add(["ana"])
+
+    assert deduplicator.add([]).tolist() == []
+    assert deduplicator.get_provenance()["count"].tolist() == [1]
+
+
+@pytest.mark.parametrize("provenance", [["other"], ["count", "last"]])
+def test_deduplicator_invalid_provenance(provenance: List[str]) -> None:
+    """Test that invalid provenance raises an exception."""
+
+    with pytest.raises(ValueError):
+        Deduplicator(provenance)
+
+
+def test_deduplicator_needs_original() -> None:
+    """Test that the original forms are required for their provenance."""
+
+    with pytest.raises(ValueError):
+        Deduplicator(["first"]).add(["ana"])
+
+
+def test_deduplicator_discard() -> None:
+    """Test that discarded words are seen again as new words."""
+
+    deduplicator = Deduplicator(["first", "count"])
+    deduplicator.add(["ana", "sol", "ana", "mar"], ["ana", "sol/s", "ana/a", "mar"])
+    deduplicator_copy = deduplicator.copy()
+    kept = deduplicator.discard(["sol", "luz"])
+
+    assert kept.tolist() == [True, False, True]
+    assert deduplicator.add(["sol", "mar"], ["sol", "mar"]).tolist() == [0]
+    assert deduplicator.get_provenance()["count"].tolist() == [2, 2, 1]
+    assert deduplicator.get_provenance()["first"].tolist() == ["ana", "mar", "sol"]
+    assert len(deduplicator_copy) == 3
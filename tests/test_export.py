@@ -0,0 +1,69 @@
+"""Tests for `export` module."""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from stimpool import WordPool
+from stimpool.export import compute_features, read_pool, write_pool
+
+WORDS = pd.Series(["sol", "gato", "canción", "periódico", "nan"], dtype="object")
+
+
+def test_compute_features() -> None:
+    """Test that the feature columns follow the words."""
+
+    data = compute_features(WORDS, ["length", "syllables", "accented"])
+
+    assert data.columns.tolist() == ["word", "length", "syllables", "accented"]
+    assert data["length"].tolist() == [3, 4, 7, 9, 3]
+    assert data["syllables"].tolist() == [1, 2, 2, 4, 1]
+    assert data["accented"].tolist() == [False, False, True, True, False]
+
+
+@pytest.mark.parametrize(
+    "file_format", ["csv", "csv.gz", "csv.zst", "jsonl", "jsonl.gz", "parquet", "arrow"]
+)
+@pytest.mark.parametrize("chunksize", [2, 100])
+def test_write_read_roundtrip(file_format: str, chunksize: int, tmp_path: Path) -> None:
+    """Test that pools written in chunks are read back with their features."""
+
+    if file_format.endswith("zst"):
+        pytest.importorskip("zstandard")
+    if file_format in ("parquet", "arrow"):
+        pytest.importorskip("pyarrow")
+
+    path = tmp_path / f"pool.{file_format}"
+    write_pool(WORDS, path, file_format, ["length", "accented"], chunksize)
+    data = read_pool(path, file_format)
+
+    assert data["word"].tolist() == WORDS.tolist()
+    assert data["length"].tolist() == [3, 4, 7, 9, 3]
+    assert data["accented"].tolist() == [False, False, True, True, False]
+
+
+@pytest.mark.parametrize(
+    ("file_format", "features"), [("xlsx", []), ("csv", ["frequency"])]
+)
+def test_write_pool_exception(file_format: str, features: list, tmp_path: Path) -> None:
+    """Test that invalid formats and features raise an exception."""
+
+    with pytest.raises(ValueError):
+        write_pool(WORDS, tmp_path / "pool", file_format, features)
+
+
+def test_save_pool(tmp_path: Path) -> None:
+    """Test that save_pool writes the words without renaming the pool."""
+
+    word_pool = WordPool(["gato", "canción"])
+    filename = tmp_path / "word pool"
+    word_pool.save_pool(str(filename))
+
+    assert (tmp_path / "word pool.csv").read_text() == "word\ngato\ncanción\n"
+    assert word_pool.words.name == "words"
+
+    word_pool.save_pool(str(filename), "jsonl.gz", features=["syllables"])
+    data = read_pool(tmp_path / "word pool.jsonl.gz", "jsonl.gz")
+
+    assert data.to_dict("list") == {"word": ["gato", "canción"], "syllables": [2, 2]}
@@ -0,0 +1,164 @@
+"""Tests for `features` module."""
+
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pytest
+
+from stimpool.features import (
+    FeatureIndex,
+    pack_flags,
+    pack_positions,
+    popcount,
+    unpack_flags,
+)
+
+WORDS = ["al", "gato", "canción", "así", "periódico", "ñame"]
+AFFIX_FLAGS = ["", "S", "S", "", "GS", "S"]
+
+
+def test_bitmaps_roundtrip() -> None:
+    """Test that flags are recovered from their bitmap."""
+
+    flags = np.array([True, False, True, True, False, False, False, True, True])
+    bitmap = pack_flags(flags)
+
+    assert popcount(bitmap) == 5
+    assert unpack_flags(bitmap, len(flags)).tolist() == flags.tolist()
+
+
+@pytest.mark.parametrize("positions", [[], [0], [8, 3, 0], [9, 1, 16, 15]])
+def test_pack_positions(positions: List[int]) -> None:
+    """Test that packing positions matches packing their flags."""
+
+    flags = np.zeros(17, dtype=bool)
+    flags[positions] = True
+
+    assert pack_positions(np.array(positions), 17).tolist() == (
+        pack_flags(flags).tolist()
+    )
+
+
+@pytest.mark.parametrize(
+    ("min_value", "max_value", "exp"),
+    [
+        (None, None, WORDS),
+        (4, None, ["gato", "canción", "periódico", "ñame"]),
+        (None, 3, ["al", "así"]),
+        (3, 4, ["gato", "así", "ñame"]),
+        (10, None, []),
+    ],
+)
+def test_positions_in_range(
+    min_value: Optional[int], max_value: Optional[int], exp: List[str]
+) -> None:
+    """Test that ranges of a numeric feature are found."""
+
+    features = FeatureIndex.from_words(WORDS)
+    positions = features.positions_in_range("length", min_value, max_value)
+    bitmap = features.bitmap_in_range("length", min_value, max_value)
+
+    assert sorted(WORDS[i] for i in positions) == sorted(exp)
+    assert popcount(bitmap) == len(exp)
+
+
+def test_boolean_features() -> None:
+    """Test the accented and affix flag bitmaps."""
+
+    features = FeatureIndex.from_words(WORDS, AFFIX_FLAGS)
+
+    assert features.flags("accented").tolist() == [
+        False,
+        False,
+        True,
+        True,
+        True,
+        True,
+    ]
+    assert features.flags("affix:G").tolist() == [
+        False,
+        False,
+        False,
+        False,
+        True,
+        False,
+    ]
+    assert popcount(features.bitmap("affix:S")) == 4
+
+
+def test_save_load(tmp_path: Path) -> None:
+    """Test that a saved feature index is loaded with the same features."""
+
+    features = FeatureIndex.from_words(WORDS, AFFIX_FLAGS)
+    features.save(tmp_path)
+    features_loaded = FeatureIndex.load(tmp_path)
+
+    assert features_loaded.n_words == len(WORDS)
+    assert set(features_loaded.bitmaps) == set(features.bitmaps)
+    assert features_loaded.numeric["syllables"].tolist() == [1, 2, 2, 2, 4, 2]
+    assert features_loaded.positions_in_range("length", 4, 4).tolist() == [1, 5]
+
+
+def test_neighbors_features() -> None:
+    """Test that the neighbors of each word are indexed by neighborhood."""
+
+    features = FeatureIndex.from_words(["casa", "cama", "cas", "sol"])
+    positions = features.positions_in_range("neighbors:levenshtein", min_value=2)
+
+    assert features.numeric["neighbors:substitution"].tolist() == [1, 1, 0, 0]
+    assert features.numeric["neighbors:levenshtein"].tolist() == [2, 1, 1, 0]
+    assert positions.tolist() == [0]
+
+
+def _assert_same_index(obs: FeatureIndex, exp: FeatureIndex) -> None:
+    """Assert that two feature indexes have the same features."""
+
+    assert obs.n_words == exp.n_words
+    for name in exp.numeric:
+        assert np.asarray(obs.numeric[name]).tolist() == exp.numeric[name].tolist()
+        assert np.asarray(obs.orders[name]).tolist() == exp.orders[name].tolist()
+    assert set(obs.bitmaps) == set(exp.bitmaps)
+    for name in exp.bitmaps:
+        assert obs.flags(name).tolist() == exp.flags(name).tolist()
+
+
+@pytest.mark.parametrize("n_words", [0, 2, 6])
+def test_append(n_words: int) -> None:
+    """Test that appending words matches indexing all the words."""
+
+    words = WORDS + ["ala", "gatos", "ñu"]
+    affix_flags = AFFIX_FLAGS + ["", "X", "S"]
+    features = FeatureIndex.from_words(WORDS[:n_words], AFFIX_FLAGS[:n_words])
+    exp = FeatureIndex.from_words(words, affix_flags)
+    neighbors = {name: exp.numeric[name] for name in exp.numeric if ":" in name}
+    obs = features.append(words[n_words:], affix_flags[n_words:], neighbors)
+
+    _assert_same_index(obs, exp)
+
+
+def test_keep() -> None:
+    """Test that keeping some words matches indexing only them."""
+
+    flags = np.array([True, False, True, True, False, True])
+    words = [word for word, flag in zip(WORDS, flags) if flag]
+    affix_flags = [flags_word for flags_word, flag in zip(AFFIX_FLAGS, flags) if flag]
+    exp = FeatureIndex.from_words(words, affix_flags)
+    neighbors = {name: exp.numeric[name] for name in exp.numeric if ":" in name}
+    obs = FeatureIndex.from_words(WORDS, AFFIX_FLAGS).keep(flags, neighbors)
+
+    # flags of words that are not kept are still indexed, without words
+    assert obs.flags("affix:G").tolist() == [False] * len(words)
+    del obs.bitmaps["affix:G"]
+    _assert_same_index(obs, exp)
+
+
+def test_append_exception() -> None:
+    """Test that the values of features that depend on every word are required."""
+
+    features = FeatureIndex.from_words(WORDS)
+
+    with pytest.raises(ValueError):
+        features.append(["ala"])
+    with pytest.raises(ValueError):
+        features.append(["ala"], numeric={"neighbors:substitution": [0]})
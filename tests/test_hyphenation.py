@@ -0,0 +1,98 @@
+"""Tests for `hyphenation` module."""
+
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+from stimpool.hyphenation import Hyphenator, load_hyphenator
+
+
+@pytest.fixture
+def patterns(tmp_path: Path) -> Path:
+    """Create a small hyphenation dictionary."""
+
+    path = tmp_path / "hyph_test.dic"
+    path.write_text(
+        "UTF-8\nLEFTHYPHENMIN 1\nRIGHTHYPHENMIN 2\n% comment\n1ba\n1ca\n1ta\n",
+        encoding="utf-8",
+    )
+
+    return path
+
+
+def test_from_file(patterns: Path) -> None:
+    """Test that the settings and patterns of the dictionary are read."""
+
+    hyphenator = Hyphenator.from_file(patterns)
+
+    assert hyphenator.left_min == 1
+    assert hyphenator.right_min == 2
+    assert hyphenator.get_points("abacata") == (1, 3, 5)
+    assert hyphenator.hyphenate("abacata") == ["a", "ba", "ca", "ta"]
+
+
+def test_hyphenate_respects_min(patterns: Path) -> None:
+    """Test that hyphenate doesn't leave fewer characters than the minimum."""
+
+    hyphenator = Hyphenator(["1ba", "1ca"], left_min=2, right_min=2)
+
+    assert hyphenator.hyphenate("abacaba") == ["aba", "ca", "ba"]
+
+
+@pytest.mark.parametrize(
+    ("word", "exp"),
+    [
+        ("gato", ("ga", "to")),
+        ("perro", ("pe", "rro")),
+        ("canción", ("can", "ción")),
+        ("periódico", ("pe", "rió", "di", "co")),
+        ("leer", ("le", "er")),
+        ("aéreo", ("a", "é", "re", "o")),
+        ("ahí", ("a", "hí")),
+        ("cuidado", ("cui", "da", "do")),
+        ("antiautoritario", ("an", "ti", "au", "to", "ri", "ta", "rio")),
+    ],
+)
+def test_syllabify(word: str, exp: Tuple[str, ...]) -> None:
+    """Test syllabify with diphthongs, hiatus and consonant clusters."""
+
+    assert load_hyphenator().syllabify(word) == exp
+
+
+@pytest.mark.parametrize(
+    ("word", "exp"),
+    [
+        ("", 0),
+        ("y", 1),
+        ("sol", 1),
+        ("rey", 1),
+        ("muy", 1),
+        ("guerra", 2),
+        ("ciudad", 2),
+        ("país", 2),
+        ("día", 2),
+        ("leer", 2),
+        ("aéreo", 4),
+        ("cuidado", 3),
+        ("paraguay", 3),
+        ("periódico", 4),
+    ],
+)
+def test_count_syllables(word: str, exp: int) -> None:
+    """Test count_syllables with diphthongs, triphthongs and hiatus."""
+
+    assert load_hyphenator().count_syllables(word) == exp
+
+
+@pytest.mark.parametrize(
+    ("words", "exp"),
+    [
+        ([], []),
+        (["al", "gato", "canción", "así", "periódico"], [1, 2, 2, 2, 4]),
+    ],
+)
+def test_count_syllables_pool(words: List[str], exp: List[int]) -> None:
+    """Test that the syllables of all the words are counted."""
+
+    assert load_hyphenator().count_syllables_pool(words).tolist() == exp
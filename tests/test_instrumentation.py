@@ -0,0 +1,107 @@
+"""Tests for `instrumentation` module."""
+
+import tracemalloc
+from typing import List
+
+from stimpool import WordPool
+from stimpool.instrumentation import NULL_STAGE, Instrumentation, StageEvent
+
+
+def test_stage_records_event() -> None:
+    """Test that a stage is recorded in the history and sent to the hooks."""
+
+    events: List[StageEvent] = []
+    with Instrumentation(hooks=[events.append], trace_memory=True) as instrumentation:
+        with instrumentation.stage("test", 10) as stage:
+            data = list(range(10_000))
+            stage.n_out = 5
+
+    event = instrumentation.history[0]
+    assert events == [event]
+    assert (event.stage, event.n_in, event.n_out) == ("test", 10, 5)
+    assert event.seconds >= 0
+    assert event.memory_delta is not None and event.memory_delta > 0
+    assert len(data) == 10_000
+
+
+def test_close_stops_tracing() -> None:
+    """Test that tracemalloc is only stopped by the instrumentation that started it."""
+
+    with Instrumentation(trace_memory=True) as instrumentation:
+        assert tracemalloc.is_tracing()
+    with instrumentation.stage("test") as stage:
+        stage.n_out = 0
+
+    assert not tracemalloc.is_tracing()
+    assert instrumentation.history[0].memory_delta is None
+
+    tracemalloc.start()
+    try:
+        with Instrumentation(trace_memory=True):
+            pass
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_disabled() -> None:
+    """Test that disabled instrumentation records nothing."""
+
+    instrumentation = Instrumentation(enabled=False)
+
+    assert instrumentation.stage("test") is NULL_STAGE
+    with instrumentation.stage("test") as stage:
+        stage.n_out = 1
+    assert instrumentation.history == []
+
+
+def test_hooks() -> None:
+    """Test that hooks can be added and removed."""
+
+    events: List[StageEvent] = []
+    instrumentation = Instrumentation()
+    instrumentation.add_hook(events.append)
+    with instrumentation.stage("first"):
+        pass
+    instrumentation.remove_hook(events.append)
+    with instrumentation.stage("second"):
+        pass
+
+    assert [event.stage for event in events] == ["first"]
+    assert len(instrumentation.history) == 2
+
+
+def test_word_pool_stages() -> None:
+    """Test that the stages of a word pool are recorded with their counts."""
+
+    instrumentation = Instrumentation()
+    word_pool = WordPool(
+        ["gato/S", "canción", "sol"], lazy=True, instrumentation=instrumentation
+    )
+    word_pool.select_words_of_length(min_len=4)
+    word_pool.select_words_without_accented_characters()
+    word_pool.sample_pool(1)
+
+    history = instrumentation.to_frame()
+    assert history["stage"].tolist() == [
+        "format_pool",
+        "clean_conjugation_suffixes",
+        "select:select_words_of_length",
+        "select:select_words_without_accented_characters",
+        "sample_pool",
+    ]
+    assert history["n_in"].tolist()[1:] == [3, 3, 2, 1]
+    assert history["n_out"].tolist() == [3, 3, 2, 1, 1]
+    assert instrumentation.summary()["calls"].sum() == 5
+
+
+def test_default_pool_stages() -> None:
+    """Test that the selections answered from the index are recorded."""
+
+    instrumentation = Instrumentation()
+    word_pool = WordPool(instrumentation=instrumentation)
+    word_pool.select_words_of_length(4, 6)
+
+    stages = [event.stage for event in instrumentation.history]
+    assert stages == ["load_default_pool", "select:select_words_of_length"]
+    assert instrumentation.history[-1].n_out == len(word_pool.words)
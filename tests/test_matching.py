@@ -0,0 +1,67 @@
+"""Tests for `matching` module."""
+
+from typing import Any, Dict
+
+import numpy as np
+import pytest
+
+from stimpool.matching import match_lists
+
+
+def test_match_lists() -> None:
+    """Test that the lists have n different words and equal means."""
+
+    generator = np.random.default_rng(0)
+    values = np.stack(
+        [generator.integers(3, 12, 2000), generator.integers(1, 5, 2000)], axis=1
+    )
+
+    result = match_lists(values, k=4, n=50, time_budget=5)
+
+    assert result.lists.shape == (4, 50)
+    assert len(set(result.lists.ravel())) == 200
+    assert (result.max_difference == 0).all()
+    assert np.allclose(result.means, values[result.lists].mean(axis=1))
+    assert result.objective < 1e-12
+
+
+def test_match_lists_is_reproducible() -> None:
+    """Test that the same seed and iterations give the same lists."""
+
+    values = np.random.default_rng(1).normal(size=(300, 3))
+    results = [
+        match_lists(values, k=3, n=20, time_budget=None, max_iterations=50, seed=5)
+        for _ in range(2)
+    ]
+
+    assert (results[0].lists == results[1].lists).all()
+    assert results[0].iterations == 50
+
+
+def test_match_lists_improves_balance() -> None:
+    """Test that the search balances lists better than the first assignment."""
+
+    values = np.arange(40, dtype=np.float64)
+
+    result = match_lists(values, k=2, n=20, time_budget=None, max_iterations=0)
+    result_searched = match_lists(values, k=2, n=20, time_budget=5)
+
+    assert result.iterations == 0
+    assert result_searched.objective <= result.objective
+    assert result_searched.max_difference[0] == 0
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"k": 0, "n": 1},
+        {"k": 2, "n": 0},
+        {"k": 3, "n": 4},
+        {"k": 2, "n": 2, "time_budget": None},
+    ],
+)
+def test_match_lists_exception(kwargs: Dict[str, Any]) -> None:
+    """Test that invalid lists or searches raise a ValueError."""
+
+    with pytest.raises(ValueError):
+        match_lists(np.arange(10), **kwargs)
@@ -0,0 +1,87 @@
+"""Tests for `neighbors` module."""
+
+from typing import List
+
+import pytest
+
+from stimpool.neighbors import count_neighbors, find_neighbors, update_neighbor_counts
+
+WORDS = ["casa", "cama", "caso", "masa", "cas", "casas", "gato", "pato", "casa", ""]
+
+
+def _count_pairs(words: List[str], neighborhood: str) -> List[int]:
+    """Count the neighbors of each word by comparing every pair of words."""
+
+    def _is_neighbor(word: str, other: str) -> bool:
+        if len(word) == len(other):
+            return sum(a != b for a, b in zip(word, other)) == 1
+        if neighborhood == "substitution" or abs(len(word) - len(other)) != 1:
+            return False
+        short, long = sorted((word, other), key=len)
+        return any(long[:i] + long[i + 1 :] == short for i in range(len(long)))
+
+    distinct = list(dict.fromkeys(words))
+
+    return [sum(_is_neighbor(word, other) for other in distinct) for word in words]
+
+
+@pytest.mark.parametrize("neighborhood", ["substitution", "levenshtein"])
+@pytest.mark.parametrize("processes", [1, 2])
+def test_count_neighbors(neighborhood: str, processes: int) -> None:
+    """Test that the neighbors match comparing every pair of words."""
+
+    obs = count_neighbors(WORDS, neighborhood, processes=processes)
+
+    assert obs.tolist() == _count_pairs(WORDS, neighborhood)
+
+
+@pytest.mark.parametrize(
+    ("neighborhood", "exp"),
+    [
+        ("substitution", ["cama", "caso", "masa"]),
+        ("levenshtein", ["cama", "caso", "masa", "cas", "casas"]),
+    ],
+)
+def test_find_neighbors(neighborhood: str, exp: List[str]) -> None:
+    """Test that the neighbors of a word are found."""
+
+    assert find_neighbors("casa", WORDS, neighborhood) == exp
+
+
+def test_neighborhood_exception() -> None:
+    """Test that invalid neighborhoods raise a ValueError."""
+
+    with pytest.raises(ValueError):
+        count_neighbors(WORDS, "hamming")
+    with pytest.raises(ValueError):
+        find_neighbors("casa", WORDS, "hamming")
+
+
+@pytest.mark.parametrize("neighborhood", ["substitution", "levenshtein"])
+@pytest.mark.parametrize(
+    ("added", "removed"),
+    [
+        (["casa", "pasa", "caza", "cazas"], []),
+        ([], ["casa", "cas", "perro"]),
+        (["pasa", "ca"], ["cama", "pasa", "perro"]),
+    ],
+)
+def test_update_neighbor_counts(
+    neighborhood: str, added: List[str], removed: List[str]
+) -> None:
+    """Test that updated counts match counting the new lexicon again."""
+
+    counts = dict(zip(WORDS, count_neighbors(WORDS, neighborhood).tolist()))
+    update_neighbor_counts(counts, added, removed, neighborhood)
+    # removed words are removed before the words are added
+    words = [word for word in WORDS if word not in removed] + added
+    counts_exp = dict(zip(words, count_neighbors(words, neighborhood).tolist()))
+
+    assert counts == counts_exp
+
+
+def test_update_neighbor_counts_exception() -> None:
+    """Test that invalid neighborhoods raise a ValueError."""
+
+    with pytest.raises(ValueError):
+        update_neighbor_counts({"casa": 0}, ["cama"], neighborhood="hamming")
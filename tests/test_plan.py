@@ -0,0 +1,109 @@
+"""Tests for `plan` module."""
+
+from typing import List
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stimpool.plan import Criterion, QueryPlan
+
+POOL = pd.Series(["al", "gato", "canción", "oso", "periódico"], dtype="object")
+
+
+def _is_long(word: str) -> bool:
+    return len(word) > 3
+
+
+def _has_a(pool: pd.Series) -> np.ndarray:
+    return np.array(["a" in word for word in pool])
+
+
+@pytest.mark.parametrize(
+    ("how", "vectorized", "exp"),
+    [
+        ("keep", False, [False, True, True, False, True]),
+        ("remove", False, [True, False, False, True, False]),
+        ("keep", True, [True, True, True, False, False]),
+        ("remove", True, [False, False, False, True, True]),
+    ],
+)
+def test_criterion_evaluate(how: str, vectorized: bool, exp: List[bool]) -> None:
+    """Test Criterion.evaluate with different cases."""
+
+    func = _has_a if vectorized else _is_long
+    criterion = Criterion("test", func, how=how, vectorized=vectorized)
+
+    assert criterion.evaluate(POOL).tolist() == exp
+
+
+def test_criterion_evaluate_exception() -> None:
+    """Test that Criterion.evaluate rejects unknown values of how."""
+
+    criterion = Criterion("test", _is_long, how="other")
+    with pytest.raises(ValueError):
+        criterion.evaluate(POOL)
+
+
+def test_optimize_orders_by_cost() -> None:
+    """Test that cheaper criteria are evaluated first."""
+
+    plan = QueryPlan()
+    plan.add(Criterion("expensive", _is_long, cost=10))
+    plan.add(Criterion("cheap", _has_a, vectorized=True, cost=1))
+    plan.add(Criterion("expensive_2", _is_long, cost=10))
+
+    obs = [criterion.name for criterion in plan.optimize()]
+
+    assert obs == ["cheap", "expensive", "expensive_2"]
+
+
+def test_pop_and_copy() -> None:
+    """Test that the last criterion is removed and copies are independent."""
+
+    plan = QueryPlan()
+    plan.add(Criterion("is_long", _is_long))
+    plan.add(Criterion("has_a", _has_a, vectorized=True))
+    plan_copy = plan.copy()
+
+    assert plan.pop().name == "has_a"
+    assert [criterion.name for criterion in plan.criteria] == ["is_long"]
+    assert [criterion.name for criterion in plan_copy.criteria] == [
+        "is_long",
+        "has_a",
+    ]
+
+
+def test_evaluate_only_checks_survivors() -> None:
+    """Test that each criterion only analyzes the words that survived."""
+
+    analyzed: List[str] = []
+
+    def _record(word: str) -> bool:
+        analyzed.append(word)
+        return True
+
+    plan = QueryPlan()
+    plan.add(Criterion("record", _record, cost=10))
+    plan.add(Criterion("has_a", _has_a, vectorized=True, cost=1))
+    flags, steps = plan.evaluate(POOL)
+
+    assert flags.tolist() == [True, True, True, False, False]
+    assert analyzed == ["al", "gato", "canción"]
+    assert [(step.n_in, step.n_out) for step in steps] == [(5, 3), (3, 3)]
+
+
+def test_explain() -> None:
+    """Test that explain shows each step with its selectivity."""
+
+    plan = QueryPlan()
+    plan.add(Criterion("select_long", _is_long, kwargs={}, cost=10))
+    plan.add(Criterion("select_a", _has_a, vectorized=True, cost=1))
+
+    obs = plan.explain(POOL).splitlines()
+
+    assert obs[0] == "QueryPlan over 5 words"
+    assert obs[1].startswith("  1. select_a()")
+    assert obs[1].endswith("5 -> 3 words (60.0%)")
+    assert obs[2].startswith("  2. select_long()")
+    assert obs[3] == "Result: 2 words"
@@ -0,0 +1,87 @@
+"""Tests for `prefixes` module."""
+
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+
+from stimpool.compiled import StringColumn
+from stimpool.features import unpack_flags
+from stimpool.prefixes import PrefixIndex
+
+WORDS = ["casa", "cas", "perro", "casas", "ca", "gato", "ratón", "", "arroz", "pato"]
+
+
+@pytest.mark.parametrize("prefix", ["", "c", "ca", "cas", "casas", "casass", "z", "p"])
+def test_positions_with_prefix(prefix: str) -> None:
+    """Test that the words starting with a prefix are found."""
+
+    prefixes = PrefixIndex.from_column(StringColumn.from_words(WORDS))
+    exp = [i for i, word in enumerate(WORDS) if word.startswith(prefix)]
+
+    assert prefixes.positions_with_prefix(prefix).tolist() == exp
+    assert unpack_flags(prefixes.bitmap_with_prefix(prefix), len(WORDS)).tolist() == [
+        i in exp for i in range(len(WORDS))
+    ]
+
+
+@pytest.mark.parametrize("suffix", ["", "o", "to", "as", "sas", "ón", "x"])
+def test_positions_with_suffix(suffix: str) -> None:
+    """Test that the words ending with a suffix are found."""
+
+    prefixes = PrefixIndex.from_column(StringColumn.from_words(WORDS))
+    exp = [i for i, word in enumerate(WORDS) if word.endswith(suffix)]
+
+    assert prefixes.positions_with_suffix(suffix).tolist() == exp
+    assert unpack_flags(prefixes.bitmap_with_suffix(suffix), len(WORDS)).tolist() == [
+        i in exp for i in range(len(WORDS))
+    ]
+
+
+def test_prefix_index_roundtrip(tmp_path: Path) -> None:
+    """Test that a saved index finds the same words."""
+
+    column = StringColumn.from_words(WORDS)
+    PrefixIndex.from_column(column).save(tmp_path)
+    prefixes = PrefixIndex.load(tmp_path, column)
+
+    assert prefixes.positions_with_prefix("cas").tolist() == [0, 1, 3]
+    assert prefixes.positions_with_suffix("to").tolist() == [5, 9]
+
+
+@pytest.mark.parametrize("words", [WORDS[:3], WORDS + ["gato"]])
+def test_prefix_index_load_exception(words: List[str], tmp_path: Path) -> None:
+    """Test that an index saved for other words is not loaded."""
+
+    PrefixIndex.from_column(StringColumn.from_words(WORDS)).save(tmp_path)
+
+    with pytest.raises(ValueError):
+        PrefixIndex.load(tmp_path, StringColumn.from_words(words))
+
+
+@pytest.mark.parametrize("n_words", [0, 4, len(WORDS)])
+def test_append(n_words: int) -> None:
+    """Test that appending words matches indexing all the words."""
+
+    words = WORDS + ["casa", "ca", "zorro", "c"]
+    column = StringColumn.from_words(words)
+    prefixes = PrefixIndex.from_column(StringColumn.from_words(words[:n_words]))
+    obs = prefixes.append(column)
+    exp = PrefixIndex.from_column(column)
+
+    assert obs.order.tolist() == exp.order.tolist()
+    assert obs.order_reversed.tolist() == exp.order_reversed.tolist()
+
+
+def test_keep() -> None:
+    """Test that keeping some words matches indexing only them."""
+
+    flags = np.array([word != "cas" and not word.endswith("o") for word in WORDS])
+    column = StringColumn.from_words(WORDS).subset(np.flatnonzero(flags))
+    prefixes = PrefixIndex.from_column(StringColumn.from_words(WORDS))
+    obs = prefixes.keep(flags, column)
+    exp = PrefixIndex.from_column(column)
+
+    assert obs.order.tolist() == exp.order.tolist()
+    assert obs.positions_with_prefix("cas").tolist() == [0, 1]
@@ -0,0 +1,114 @@
+"""Tests for `sampling` module."""
+
+from typing import Dict, List
+
+import numpy as np
+import pytest
+
+from stimpool import sampling
+from stimpool.sampling import (
+    allocate_quotas,
+    draw_samples,
+    draw_stratified,
+    get_generator,
+)
+
+
+@pytest.mark.parametrize("overlap", [True, False])
+def test_draw_samples(overlap: bool) -> None:
+    """Test that samples have n different positions of the pool."""
+
+    samples = draw_samples(100, 5, n_samples=20, overlap=overlap)
+
+    assert samples.shape == (20, 5)
+    assert samples.dtype == np.int64
+    assert ((samples >= 0) & (samples < 100)).all()
+    assert all(len(set(sample)) == 5 for sample in samples)
+    if not overlap:
+        assert len(set(samples.ravel())) == 100
+
+
+def test_draw_samples_is_reproducible() -> None:
+    """Test that the same seed gives the same samples and others don't."""
+
+    samples = draw_samples(1000, 10, n_samples=3, seed=7)
+
+    assert (draw_samples(1000, 10, n_samples=3, seed=7) == samples).all()
+    assert (draw_samples(1000, 10, n_samples=3, seed=8) != samples).any()
+    assert (draw_samples(1000, 10, n_samples=3, seed=None) != samples).any()
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_draw_samples_in_shards(
+    processes: int, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that samples don't depend on the shards or on how many are drawn."""
+
+    samples = draw_samples(1000, 10, n_samples=10, seed=3)
+    monkeypatch.setattr(sampling, "SHARD_SIZE", 3)
+
+    assert (draw_samples(1000, 10, 10, seed=3, processes=processes) == samples).all()
+    assert (draw_samples(1000, 10, 4, seed=3) == samples[:4]).all()
+
+
+def test_substreams() -> None:
+    """Test that sample i is drawn from substream i."""
+
+    samples = draw_samples(1000, 10, n_samples=3, seed=5)
+    exp = get_generator(5, stream=2).choice(1000, size=10, replace=False)
+
+    assert samples[2].tolist() == exp.tolist()
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"n_population": 5, "n": 6},
+        {"n_population": 5, "n": -1},
+        {"n_population": 10, "n": 3, "n_samples": 4, "overlap": False},
+    ],
+)
+def test_draw_samples_exception(kwargs: Dict) -> None:
+    """Test that samples larger than the pool raise a ValueError."""
+
+    with pytest.raises(ValueError):
+        draw_samples(**kwargs)
+
+
+@pytest.mark.parametrize(
+    ("sizes", "n", "allocation", "exp"),
+    [
+        ([10, 20, 70], 10, "proportional", [1, 2, 7]),
+        ([1, 1, 1], 2, "proportional", [1, 1, 0]),
+        ([5, 3, 2], 7, "proportional", [4, 2, 1]),
+        ([5, 3, 2], 0, "proportional", [0, 0, 0]),
+        ([5, 3, 2], 2, "fixed", [2, 2, 2]),
+    ],
+)
+def test_allocate_quotas(
+    sizes: List[int], n: int, allocation: str, exp: List[int]
+) -> None:
+    """Test that the sample size is allocated among the strata."""
+
+    assert allocate_quotas(np.array(sizes), n, allocation).tolist() == exp
+
+
+@pytest.mark.parametrize(
+    ("n", "allocation"), [(11, "proportional"), (3, "fixed"), (1, "random")]
+)
+def test_allocate_quotas_exception(n: int, allocation: str) -> None:
+    """Test that invalid allocations or small strata raise a ValueError."""
+
+    with pytest.raises(ValueError):
+        allocate_quotas(np.array([5, 3, 2]), n, allocation)
+
+
+def test_draw_stratified() -> None:
+    """Test that the quota of each stratum is drawn."""
+
+    strata = np.array([2, 0, 1, 0, 2, 2, 1, 0, 2, 0])
+    positions = draw_stratified(strata, [2, 0, 3])
+
+    assert len(set(positions)) == 5
+    assert strata[positions].tolist() == [0, 0, 2, 2, 2]
+    assert (draw_stratified(strata, [2, 0, 3]) == positions).all()
@@ -0,0 +1,94 @@
+"""Tests for `similarity` module."""
+
+from typing import List
+
+import numpy as np
+import pytest
+
+from stimpool.similarity import BKTree, encode_words, levenshtein, levenshtein_to_many
+
+WORDS = ["casa", "cama", "caso", "masa", "cas", "casas", "gato", "pato", "", "ñu"]
+
+
+@pytest.mark.parametrize(
+    ("word", "other", "exp"),
+    [
+        ("casa", "casa", 0),
+        ("casa", "cama", 1),
+        ("casa", "cas", 1),
+        ("casa", "casas", 1),
+        ("gato", "pato", 1),
+        ("casa", "gato", 3),
+        ("", "ñu", 2),
+        ("kitten", "sitting", 3),
+    ],
+)
+def test_levenshtein(word: str, other: str, exp: int) -> None:
+    """Test the edit distance between two words."""
+
+    assert levenshtein(word, other) == exp
+    assert levenshtein(other, word) == exp
+
+
+@pytest.mark.parametrize("word", ["casa", "", "sitting", "ñame"])
+def test_levenshtein_to_many(word: str) -> None:
+    """Test that the vectorized distances match comparing each word."""
+
+    lengths = np.array([len(other) for other in WORDS])
+    obs = levenshtein_to_many(word, encode_words(WORDS), lengths)
+
+    assert obs.tolist() == [levenshtein(word, other) for other in WORDS]
+
+
+@pytest.mark.parametrize("leaf_size", [1, 2, 64])
+@pytest.mark.parametrize("max_distance", [0, 1, 2])
+@pytest.mark.parametrize("word", ["casa", "pata", "xyz"])
+def test_bktree_search(leaf_size: int, max_distance: int, word: str) -> None:
+    """Test that the tree finds the same words as comparing every word."""
+
+    tree = BKTree(WORDS + ["casa"], leaf_size=leaf_size)
+    exp = [
+        i for i, other in enumerate(WORDS) if levenshtein(word, other) <= max_distance
+    ]
+
+    assert len(tree) == len(WORDS)
+    assert tree.search(word, max_distance).tolist() == exp
+
+
+@pytest.mark.parametrize(
+    ("words", "exp"),
+    [
+        (["casa"], ["casa", "cama", "caso", "masa", "cas", "casas"]),
+        (["gato", "ñ"], ["gato", "pato", "", "ñu"]),
+        ([], []),
+    ],
+)
+def test_find_similar(words: List[str], exp: List[str]) -> None:
+    """Test that the words similar to any of the words are found."""
+
+    assert BKTree(WORDS, leaf_size=2).find_similar(words, 1) == set(exp)
+
+
+def test_bktree_empty() -> None:
+    """Test searching a tree without words."""
+
+    assert BKTree([]).search("casa", 2).tolist() == []
+
+
+@pytest.mark.parametrize("leaf_size", [1, 2, 64])
+@pytest.mark.parametrize("word", ["casa", "pata", "xyz"])
+def test_bktree_add_discard(leaf_size: int, word: str) -> None:
+    """Test that added and removed words match building the tree again."""
+
+    tree = BKTree(WORDS[:4], leaf_size=leaf_size)
+    tree_copy = tree.copy()
+    tree.add(WORDS[2:] + ["pata"])
+    tree.discard(["pato", "caso", "zzz"])
+    tree.add(["caso"])
+    words = [other for other in WORDS + ["pata"] if other != "pato"]
+
+    assert len(tree) == len(words)
+    assert tree.find_similar([word], 2) == {
+        other for other in words if levenshtein(word, other) <= 2
+    }
+    assert len(tree_copy) == 4
@@ -0,0 +1,77 @@
+"""Tests for `thesaurus` module."""
+
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from stimpool.thesaurus import Meaning, Thesaurus, load_thesaurus
+
+
+@pytest.fixture
+def thesaurus(tmp_path: Path) -> Thesaurus:
+    """Create a small thesaurus."""
+
+    data = (
+        "ISO8859-1\n"
+        "can|1\n"
+        "-|perro|chucho\n"
+        "perro|2\n"
+        "-|can|chucho|Perro (fig.)\n"
+        "(adj)|tozudo|terco\n"
+    )
+    data_path = tmp_path / "th_test.dat"
+    data_path.write_bytes(data.encode("latin-1"))
+    offset_perro = data.index("perro|2")
+
+    index = f"ISO8859-1\n2\nperro|{offset_perro}\ncan|10\n"
+    index_path = tmp_path / "th_test.idx"
+    index_path.write_bytes(index.encode("latin-1"))
+
+    return Thesaurus(data_path, index_path)
+
+
+def test_get_meanings(thesaurus: Thesaurus) -> None:
+    """Test that the meanings are read from the offset of the word."""
+
+    assert len(thesaurus) == 2
+    assert "perro" in thesaurus
+    assert "gato" not in thesaurus
+    assert thesaurus.get_meanings("perro") == [
+        Meaning("-", ["can", "chucho", "Perro (fig.)"]),
+        Meaning("(adj)", ["tozudo", "terco"]),
+    ]
+    assert thesaurus.get_meanings("gato") == []
+
+
+@pytest.mark.parametrize(
+    ("word", "exp"),
+    [
+        ("perro", ["can", "chucho", "tozudo", "terco"]),
+        ("can", ["perro", "chucho"]),
+        ("gato", []),
+    ],
+)
+def test_get_synonyms(thesaurus: Thesaurus, word: str, exp: List[str]) -> None:
+    """Test that synonyms are normalized, without duplicates or the word."""
+
+    assert thesaurus.get_synonyms(word) == exp
+
+
+def test_pool_lookups(thesaurus: Thesaurus) -> None:
+    """Test the lookups of several words at once."""
+
+    words = ["can", "gato", "perro"]
+
+    assert thesaurus.count_synonyms_pool(words).tolist() == [2, 0, 4]
+    assert thesaurus.get_synonyms_pool(words)[0] == ["perro", "chucho"]
+    assert thesaurus.get_synonyms_of_targets(["can", "gato"]) == {"perro", "chucho"}
+
+
+def test_default_thesaurus() -> None:
+    """Test lookups in the default thesaurus, whose entries are ISO-8859-1."""
+
+    thesaurus = load_thesaurus()
+
+    assert "a excepción de" in thesaurus
+    assert thesaurus.get_synonyms("perro") == ["can", "chucho", "gozque"]
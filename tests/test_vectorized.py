@@ -0,0 +1,155 @@
+"""Tests for `vectorized` module."""
+
+import re
+from typing import Callable, List, Optional
+
+import numpy as np
+import pytest
+
+from stimpool import vectorized
+from stimpool.vectorized import (
+    ACCENTED_CHARACTERS,
+    flag_characters,
+    flag_pattern,
+    flag_prefix,
+    flag_substring,
+    flag_suffix,
+    flag_word_length,
+    normalize_words,
+    remove_conjugation_suffixes,
+    to_object_array,
+    word_lengths,
+)
+
+WORDS = ["al", "gato", "canción", "así", "güiro", "ñame", "periódico", "carro "]
+
+
+def test_normalize_words() -> None:
+    """Test that normalize_words strips and lowercases every word."""
+
+    obs = normalize_words(["perro", "PErrO", "   perro   ", "  PErrO", "\tÑame\n"])
+
+    assert obs == ["perro", "perro", "perro", "perro", "ñame"]
+
+
+def test_remove_conjugation_suffixes() -> None:
+    """Test that remove_conjugation_suffixes cleans every word."""
+
+    obs = remove_conjugation_suffixes(["acantio/S", "acantarar/RED", "acaso"])
+
+    assert obs == ["acantio", "acantarar", "acaso"]
+
+
+def test_word_lengths() -> None:
+    """Test that word_lengths counts characters, not bytes."""
+
+    obs = word_lengths(["al", "canción", ""])
+
+    assert obs.tolist() == [2, 7, 0]
+
+
+@pytest.mark.parametrize(
+    ("min_len", "max_len", "exp"),
+    [
+        (None, None, [True, True, True]),
+        (3, None, [False, True, True]),
+        (None, 4, [True, True, False]),
+        (3, 4, [False, True, False]),
+    ],
+)
+def test_flag_word_length(
+    min_len: Optional[int], max_len: Optional[int], exp: List[bool]
+) -> None:
+    """Test flag_word_length with different limits."""
+
+    obs = flag_word_length(["al", "gato", "canción"], min_len, max_len)
+
+    assert obs.tolist() == exp
+
+
+@pytest.mark.parametrize(
+    "words",
+    [
+        [],
+        ["perro"],
+        ["canción"],
+        WORDS,
+        # newlines inside words use the per-word fallback
+        ["can\nción", "perro", "ñ\n"],
+    ],
+)
+def test_flag_characters(words: List[str]) -> None:
+    """Test that flag_characters matches checking each word."""
+
+    exp = [any(char in word for char in ACCENTED_CHARACTERS) for word in words]
+    obs = flag_characters(words, ACCENTED_CHARACTERS)
+
+    assert obs.dtype == np.bool_
+    assert obs.tolist() == exp
+
+
+def test_flag_characters_in_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that flag_characters gives the same result when chunked."""
+
+    monkeypatch.setattr(vectorized, "CHUNK_SIZE", 3)
+    exp = [any(char in word for char in ACCENTED_CHARACTERS) for word in WORDS]
+    obs = flag_characters(WORDS, ACCENTED_CHARACTERS)
+
+    assert obs.tolist() == exp
+
+
+@pytest.mark.parametrize("words", [[], ["perro"], WORDS, iter(WORDS)])
+def test_to_object_array(words: List[str]) -> None:
+    """Test that the words are stored in a 1-D object array."""
+
+    exp = list(words)
+    obs = to_object_array(exp)
+
+    assert obs.dtype == object
+    assert obs.shape == (len(exp),)
+    assert obs.tolist() == exp
+
+
+def test_to_object_array_no_copy() -> None:
+    """Test that object arrays are not copied."""
+
+    words = to_object_array(WORDS)
+
+    assert to_object_array(words) is words
+
+
+@pytest.mark.parametrize(
+    ("func", "text", "exp"),
+    [
+        (flag_prefix, "ca", ["canción", "carro "]),
+        (flag_prefix, "", WORDS),
+        (flag_suffix, "o", ["gato", "güiro", "periódico"]),
+        (flag_suffix, "ción", ["canción"]),
+        (flag_substring, "rr", ["carro "]),
+        (flag_substring, "xyz", []),
+    ],
+)
+def test_flag_text(func: Callable, text: str, exp: List[str]) -> None:
+    """Test that prefixes, suffixes and substrings are flagged."""
+
+    obs = func(WORDS, text)
+
+    assert obs.dtype == np.bool_
+    assert [word for word, flag in zip(WORDS, obs) if flag] == exp
+
+
+@pytest.mark.parametrize(
+    ("pattern", "exp"),
+    [
+        ("^[aeiou]", ["al", "así"]),
+        ("i.o$", ["güiro", "periódico"]),
+        ("^.{4}$", ["gato", "ñame"]),
+    ],
+)
+def test_flag_pattern(pattern: str, exp: List[str]) -> None:
+    """Test that the words where a compiled pattern matches are flagged."""
+
+    obs = flag_pattern(WORDS, re.compile(pattern))
+
+    assert obs.dtype == np.bool_
+    assert [word for word, flag in zip(WORDS, obs) if flag] == exp
@@ -1,11 +1,18 @@
 """Tests for `words` module."""
 
-from typing import List, Optional
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 import pandas as pd
 import pytest
 
 from stimpool import WordPool
+from stimpool.cache import ResultCache
+from stimpool.features import FeatureIndex
+from stimpool.similarity import levenshtein
+from stimpool.words import POOL_DEPENDENT_SELECTIONS
 
 
 def test_get_default_pool() -> None:
@@ -84,6 +91,55 @@ def test_get_words_meeting_criteria(words: List[str], exp: pd.Series, how: str)
     assert obs.equals(exp)
 
 
+@pytest.mark.parametrize(
+    ("words", "exp", "how"),
+    [
+        (["yes", "no", "yes", "no"], pd.Series(["yes", "yes"], dtype="object"), "keep"),
+        (["yes", "no", "yes", "no"], pd.Series(["no", "no"], dtype="object"), "remove"),
+    ],
+)
+def test_get_words_meeting_criteria_vectorized(
+    words: List[str], exp: pd.Series, how: str
+) -> None:
+    """Test _get_words_meeting_criteria with vectorized criteria."""
+    word_pool = WordPool(words)
+    obs: pd.Series = word_pool._get_words_meeting_criteria(
+        func_checks_criteria=lambda pool: pool == "yes",
+        how=how,
+        vectorized=True,
+    )
+
+    obs = obs.reset_index(drop=True)
+    assert obs.equals(exp)
+
+
+def test_get_words_meeting_criteria_exception() -> None:
+    """Test that _get_words_meeting_criteria rejects unknown values of how."""
+
+    word_pool = WordPool(["yes", "no"])
+    with pytest.raises(ValueError):
+        word_pool._get_words_meeting_criteria(lambda x: "yes" == x, how="other")
+
+
+@pytest.mark.parametrize(
+    ("words", "exp"),
+    [
+        (["perro", "canción", "así", "güiro", "ñame"], ["perro"]),
+        (["canción"], []),
+        (["gato", "oso"], ["gato", "oso"]),
+    ],
+)
+def test_select_words_without_accented_characters(
+    words: List[str], exp: List[str]
+) -> None:
+    """Test select_words_without_accented_characters with different cases."""
+
+    word_pool = WordPool(words)
+    word_pool.select_words_without_accented_characters()
+
+    assert word_pool.words.tolist() == exp
+
+
 @pytest.mark.parametrize(
     ("word", "min_len", "max_len", "exp"),
     [
@@ -202,6 +258,77 @@ def test_select_words_of_length_exception() -> None:
         word_pool.select_words_of_length()
 
 
+@pytest.mark.parametrize(
+    ("min_syl", "max_syl", "exp"),
+    [
+        (2, None, ["gato", "canción", "periódico"]),
+        (None, 2, ["sol", "gato", "canción"]),
+        (2, 2, ["gato", "canción"]),
+    ],
+)
+def test_select_words_of_syllables(
+    min_syl: Optional[int], max_syl: Optional[int], exp: List[str]
+) -> None:
+    """Test select_words_of_syllables with different limits."""
+
+    word_pool = WordPool(["sol", "gato", "canción", "periódico"])
+    word_pool.select_words_of_syllables(min_syl, max_syl)
+
+    assert word_pool.words.tolist() == exp
+
+
+def test_select_words_of_syllables_exception() -> None:
+    """Test that select_words_of_syllables raises exception without limits."""
+
+    word_pool = WordPool()
+    with pytest.raises(ValueError):
+        word_pool.select_words_of_syllables()
+
+
+def test_syllables() -> None:
+    """Test that the syllables column is aligned with the words."""
+
+    word_pool = WordPool(["sol", "gato", "canción", "periódico"])
+    word_pool.select_words_of_length(min_len=4)
+
+    assert word_pool.syllables.tolist() == [2, 2, 4]
+    assert word_pool.syllables.index.tolist() == word_pool.words.index.tolist()
+
+
+@pytest.mark.parametrize(
+    ("min_synonyms", "exp"),
+    [
+        (1, ["perro", "abad", "gato"]),
+        (4, ["abad", "gato"]),
+        (100, []),
+    ],
+)
+def test_select_words_with_synonyms(min_synonyms: int, exp: List[str]) -> None:
+    """Test select_words_with_synonyms with different minimums."""
+
+    word_pool = WordPool(["perro", "abad", "zzz", "gato"])
+    word_pool.select_words_with_synonyms(min_synonyms)
+
+    assert word_pool.words.tolist() == exp
+
+
+def test_select_words_not_synonyms_of() -> None:
+    """Test that the synonyms of the targets are removed."""
+
+    word_pool = WordPool(["can", "chucho", "perro", "prior", "gato"])
+    word_pool.select_words_not_synonyms_of(["Perro", "abad"])
+
+    assert word_pool.words.tolist() == ["perro", "gato"]
+
+
+def test_synonyms() -> None:
+    """Test that the synonyms column is aligned with the words."""
+
+    word_pool = WordPool(["perro", "zzz"])
+
+    assert word_pool.synonyms.tolist() == [["can", "chucho", "gozque"], []]
+
+
 @pytest.mark.parametrize(
     ("word", "exp"),
     [
@@ -281,3 +408,888 @@ def test_sample_pool_is_reproducible(words: List[str]) -> None:
     word_pool2.sample_pool(n=3)
 
     word_pool1.words.equals(word_pool2.words)
+
+
+def test_lazy_selection_matches_eager() -> None:
+    """Test that a lazy pool selects the same words as an eager one."""
+
+    words = ["al", "gato", "cabeza", "periódico", "ratón", "oso"]
+    word_pool_eager = WordPool(words)
+    word_pool_lazy = WordPool(words, lazy=True)
+    for word_pool in (word_pool_eager, word_pool_lazy):
+        word_pool.select_words_without_accented_characters()
+        word_pool.select_words_of_length(3, 5)
+
+    assert len(word_pool_lazy._plan) == 2
+    assert word_pool_lazy.words.equals(word_pool_eager.words)
+    assert len(word_pool_lazy._plan) == 0
+
+
+def test_explain() -> None:
+    """Test that explain shows pending selections without applying them."""
+
+    word_pool = WordPool(["al", "gato", "cabeza", "periódico", "ratón"], lazy=True)
+    word_pool.select_words_without_accented_characters()
+    word_pool.select_words_of_length(min_len=3)
+
+    obs = word_pool.explain().splitlines()
+
+    assert "select_words_of_length" in obs[1]
+    assert "select_words_without_accented_characters" in obs[2]
+    assert obs[-1] == "Result: 2 words"
+    assert len(word_pool._pool_cleaned) == 5
+
+
+@pytest.mark.parametrize("lazy", [True, False])
+def test_default_pool_selection_uses_index(lazy: bool) -> None:
+    """Test that selections on the default pool are answered from its index."""
+
+    word_pool = WordPool(lazy=lazy)
+    word_pool_scanned = WordPool(word_pool.words.tolist())
+    for pool in (word_pool, word_pool_scanned):
+        pool.select_words_of_length(4, 6)
+        pool.select_words_without_accented_characters()
+        pool.select_words_of_syllables(max_syl=2)
+
+    assert word_pool._features is not None
+    assert word_pool.words.tolist() == word_pool_scanned.words.tolist()
+    assert word_pool.syllables.tolist() == word_pool_scanned.syllables.tolist()
+
+
+def test_explain_index() -> None:
+    """Test that explain shows the selections answered from the index."""
+
+    word_pool = WordPool(lazy=True)
+    word_pool.select_words_of_length(4, 6)
+
+    assert "[index, cost=1]" in word_pool.explain()
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 100])
+def test_from_iterable(chunksize: int) -> None:
+    """Test that streamed chunks are filtered like a whole pool."""
+
+    words = ["Sol ", "gato/S", "canción", "periódico", "árbol", "mesa"]
+    selections = [
+        ("select_words_of_length", {"min_len": 4}),
+        ("select_words_without_accented_characters", {}),
+    ]
+    word_pool = WordPool.from_iterable(
+        iter(words), selections, chunksize=chunksize, keep_original=True
+    )
+
+    assert word_pool.words.tolist() == ["gato", "mesa"]
+    assert word_pool.words.index.tolist() == [1, 5]
+    assert word_pool._pool_original.tolist() == ["gato/s", "mesa"]
+
+
+def test_from_iterable_without_original() -> None:
+    """Test that the original words are not stored unless requested."""
+
+    word_pool = WordPool.from_iterable(["gato", "mesa"], chunksize=1)
+
+    assert word_pool.words.tolist() == ["gato", "mesa"]
+    assert word_pool._pool_original is None
+
+
+def test_from_iterable_exception() -> None:
+    """Test that invalid selections raise an exception."""
+
+    with pytest.raises(ValueError):
+        WordPool.from_iterable(["gato"], [("save_pool", {})])
+
+
+STREAMED_SELECTIONS: Dict[str, Dict[str, Any]] = {
+    "select_words_without_accented_characters": {},
+    "select_words_of_length": {"max_len": 3},
+    "select_words_of_syllables": {"max_syl": 1},
+    "select_words_with_synonyms": {},
+    "select_words_not_synonyms_of": {"targets": ["hogar"]},
+    "select_words_starting_with": {"prefix": "ma"},
+    "select_words_ending_with": {"suffix": "to"},
+    "select_words_containing": {"substring": "s"},
+    "select_words_matching": {"pattern": "^[cm]"},
+    "select_words_dissimilar_to": {"targets": ["pata"], "min_distance": 2},
+}
+
+
+@pytest.mark.parametrize("method", sorted(STREAMED_SELECTIONS))
+def test_from_iterable_matches_pool(method: str) -> None:
+    """Test that every selection accepted when streaming matches the whole pool."""
+
+    pool = ["casa", "cama", "cara", "mesa", "masa", "pasa", "gato", "pato", "ratón"]
+    pool += ["pez", "sal"]
+    kwargs = STREAMED_SELECTIONS[method]
+    word_pool = WordPool(pool)
+    getattr(word_pool, method)(**kwargs)
+    word_pool_streamed = WordPool.from_iterable(pool, [(method, kwargs)], chunksize=3)
+
+    assert word_pool_streamed.words.to_dict() == word_pool.words.to_dict()
+
+
+def test_from_iterable_selections_covered() -> None:
+    """Test that every selection is either streamed or rejected."""
+
+    methods = {method for method in dir(WordPool) if method.startswith("select_")}
+
+    assert methods == set(STREAMED_SELECTIONS) | set(POOL_DEPENDENT_SELECTIONS)
+
+
+@pytest.mark.parametrize("method", POOL_DEPENDENT_SELECTIONS)
+def test_from_iterable_pool_dependent_exception(method: str) -> None:
+    """Test that selections that depend on the whole pool are not streamed."""
+
+    with pytest.raises(ValueError):
+        WordPool.from_iterable(["casa", "cama"], [(method, {})], chunksize=1)
+
+
+def test_from_file(tmp_path: Path) -> None:
+    """Test that a word pool is streamed from a file with one word per line."""
+
+    path = tmp_path / "words.txt"
+    path.write_text("gato\n\nperro/S\nsol\n", encoding="utf-8")
+    word_pool = WordPool.from_file(
+        path, [("select_words_of_length", {"min_len": 4})], chunksize=2
+    )
+    word_pool.select_words_of_length(max_len=4)
+
+    assert word_pool.words.tolist() == ["gato"]
+
+
+def test_import_is_lazy() -> None:
+    """Test that pools are built and filtered without importing pandas."""
+
+    code = (
+        "import sys\n"
+        "import stimpool\n"
+        "assert 'numpy' not in sys.modules\n"
+        "word_pool = stimpool.WordPool(['gato', 'canción', 'sol'])\n"
+        "word_pool.select_words_of_length(min_len=4)\n"
+        "word_pool.select_words_without_accented_characters()\n"
+        "word_pool.sample_pool(1)\n"
+        "assert 'pandas' not in sys.modules\n"
+        "assert word_pool.words.tolist() == ['gato']\n"
+    )
+
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_pool_original_default() -> None:
+    """Test that the original words of the default pool are loaded on request."""
+
+    word_pool = WordPool()
+
+    assert word_pool._words_original is None
+    assert len(word_pool._pool_original) == len(word_pool.words)
+
+
+SELECTIONS_COMPACT = [
+    ("select_words_of_length", {"min_len": 4, "max_len": 6}),
+    ("select_words_without_accented_characters", {}),
+    ("select_words_of_syllables", {"min_syl": 2, "max_syl": 2}),
+]
+
+
+@pytest.mark.parametrize("pool", [None, ["Gato/S", "perro", "canción", "ratón", "sol"]])
+@pytest.mark.parametrize("lazy", [False, True])
+def test_compact_pool(pool: Optional[List[str]], lazy: bool) -> None:
+    """Test that compact pools select the same words as regular pools."""
+
+    word_pool = WordPool(pool, lazy=lazy)
+    word_pool_compact = WordPool(pool, lazy=lazy, compact=True)
+    for method, kwargs in SELECTIONS_COMPACT:
+        getattr(word_pool, method)(**kwargs)
+        getattr(word_pool_compact, method)(**kwargs)
+
+    assert word_pool_compact._base_words is None
+    assert word_pool_compact.words.equals(word_pool.words)
+    assert word_pool_compact._pool_original.equals(word_pool._pool_original)
+
+    word_pool.sample_pool(1)
+    word_pool_compact.sample_pool(1)
+
+    assert word_pool_compact.words.equals(word_pool.words)
+
+
+def test_compact_pool_memory() -> None:
+    """Test that compact pools use several times less memory."""
+
+    word_pool = WordPool(["gato/S", "perro", "canción"] * 1000)
+    word_pool_compact = WordPool(["gato/S", "perro", "canción"] * 1000, compact=True)
+
+    assert word_pool_compact.memory_usage() * 2 < word_pool.memory_usage()
+    assert WordPool(compact=True).memory_usage() * 3 < WordPool().memory_usage()
+
+
+def test_compact_from_iterable() -> None:
+    """Test that streamed pools can store the words that are kept compactly."""
+
+    word_pool = WordPool.from_iterable(
+        ["gato/S", "sol", "mesa"],
+        [("select_words_of_length", {"min_len": 4})],
+        chunksize=2,
+        keep_original=True,
+        compact=True,
+    )
+
+    assert word_pool._base_words is None
+    assert word_pool.words.tolist() == ["gato", "mesa"]
+    assert word_pool.words.index.tolist() == [0, 2]
+    assert word_pool._pool_original.tolist() == ["gato/s", "mesa"]
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_undo(lazy: bool) -> None:
+    """Test that selections are undone one at a time."""
+
+    word_pool = WordPool(["gato", "canción", "sol", "ratón"], lazy=lazy)
+    word_pool.select_words_of_length(min_len=4)
+    word_pool.words
+    word_pool.select_words_without_accented_characters()
+
+    assert word_pool.words.tolist() == ["gato"]
+
+    word_pool.undo()
+
+    assert word_pool.words.tolist() == ["gato", "canción", "ratón"]
+
+    word_pool.undo()
+
+    assert word_pool.words.tolist() == ["gato", "canción", "sol", "ratón"]
+    with pytest.raises(ValueError):
+        word_pool.undo()
+
+
+def test_undo_pending_selection() -> None:
+    """Test that selections that were not evaluated are undone first."""
+
+    word_pool = WordPool(["gato", "canción", "sol"], lazy=True)
+    word_pool.select_words_of_length(min_len=4)
+    word_pool.select_words_without_accented_characters()
+    word_pool.undo()
+
+    assert word_pool.words.tolist() == ["gato", "canción"]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_reset(compact: bool) -> None:
+    """Test that resetting undoes every selection and can be undone."""
+
+    word_pool = WordPool(compact=compact)
+    n_words = len(word_pool.words)
+    word_pool.select_words_of_length(min_len=4, max_len=6)
+    word_pool.sample_pool(5)
+    sample = word_pool.words
+    word_pool.reset()
+
+    assert len(word_pool.words) == n_words
+
+    word_pool.undo()
+
+    assert word_pool.words.equals(sample)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_fork(compact: bool) -> None:
+    """Test that forks share the base pool and are selected independently."""
+
+    word_pool = WordPool(["gato", "canción", "sol", "ratón"], compact=compact)
+    word_pool.select_words_of_length(min_len=4)
+    word_pool_fork = word_pool.fork()
+    word_pool_fork.select_words_without_accented_characters()
+
+    assert word_pool_fork._column is word_pool._column
+    assert word_pool_fork._base_words is word_pool._base_words
+    assert word_pool_fork.words.tolist() == ["gato"]
+    assert word_pool.words.tolist() == ["gato", "canción", "ratón"]
+
+    word_pool_fork.undo()
+    word_pool.undo()
+
+    assert word_pool_fork.words.tolist() == ["gato", "canción", "ratón"]
+    assert word_pool.words.tolist() == ["gato", "canción", "sol", "ratón"]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_remove_duplicates(compact: bool) -> None:
+    """Test that only the first occurrence of each word is kept."""
+
+    word_pool = WordPool(["Ana", "sol/S", "ana/A", "mar", "SOL"], compact=compact)
+    word_pool.remove_duplicates(["first", "all", "count"])
+    provenance = word_pool.provenance
+
+    assert word_pool.words.tolist() == ["ana", "sol", "mar"]
+    assert word_pool.words.index.tolist() == [0, 1, 3]
+    assert provenance.index.tolist() == [0, 1, 3]
+    assert provenance["count"].tolist() == [2, 2, 1]
+    assert provenance["first"].tolist() == ["ana", "sol/s", "mar"]
+    assert provenance["all"].tolist() == [("ana", "ana/a"), ("sol/s", "sol"), ("mar",)]
+
+    word_pool.undo()
+
+    assert len(word_pool.words) == 5
+
+
+def test_remove_duplicates_without_original() -> None:
+    """Test that original forms can't be kept if the pool doesn't store them."""
+
+    word_pool = WordPool.from_iterable(["ana", "ana"])
+    word_pool.remove_duplicates()
+
+    assert word_pool.provenance["count"].tolist() == [2]
+    assert WordPool(["ana"]).provenance is None
+    with pytest.raises(ValueError):
+        word_pool.remove_duplicates(["first"])
+
+
+def test_from_iterable_remove_duplicates() -> None:
+    """Test that duplicates are removed across the chunks of a stream."""
+
+    word_pool = WordPool.from_iterable(
+        ["ana", "sol/S", "Ana", "gato", "sol", "ana/A"],
+        [("select_words_of_length", {"min_len": 3})],
+        chunksize=2,
+        remove_duplicates=True,
+        provenance=["all", "count"],
+    )
+
+    assert word_pool.words.tolist() == ["ana", "sol", "gato"]
+    assert word_pool.words.index.tolist() == [0, 1, 3]
+    assert word_pool.provenance["count"].tolist() == [3, 2, 1]
+    assert word_pool.provenance["all"].tolist() == [
+        ("ana", "ana", "ana/a"),
+        ("sol/s", "sol"),
+        ("gato",),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("method", "text", "exp"),
+    [
+        ("select_words_starting_with", "Ca", ["canción", "carro", "casa"]),
+        ("select_words_ending_with", "ción", ["canción"]),
+        ("select_words_containing", "rr", ["carro", "perro"]),
+        ("select_words_matching", r"^\w+/\w$", ["sol/s"]),
+    ],
+)
+@pytest.mark.parametrize("lazy", [False, True])
+def test_select_words_by_text(
+    method: str, text: str, exp: List[str], lazy: bool
+) -> None:
+    """Test selecting words by their prefix, suffix, substring or pattern."""
+
+    word_pool = WordPool(
+        ["Canción", "carro", "perro", "casa", "Sol/S", "ola"],
+        clean_conjugation_suffix=False,
+        lazy=lazy,
+    )
+    getattr(word_pool, method)(text)
+
+    assert word_pool.words.tolist() == exp
+
+
+def test_select_words_matching_exception() -> None:
+    """Test that invalid patterns raise a ValueError."""
+
+    word_pool = WordPool(["gato"])
+
+    with pytest.raises(ValueError):
+        word_pool.select_words_matching("[a-")
+
+
+@pytest.mark.parametrize("lazy", [True, False])
+def test_default_pool_text_selection_uses_index(lazy: bool) -> None:
+    """Test that prefixes and suffixes of the default pool use its index."""
+
+    word_pool = WordPool(lazy=lazy)
+    word_pool_scanned = WordPool(word_pool.words.tolist())
+    for pool in (word_pool, word_pool_scanned):
+        pool.select_words_starting_with("des")
+        pool.select_words_ending_with("r")
+
+    assert word_pool._prefixes is not None
+    assert len(word_pool.words) > 0
+    assert word_pool.words.tolist() == word_pool_scanned.words.tolist()
+
+
+@pytest.mark.parametrize(
+    ("min_neighbors", "max_neighbors", "neighborhood", "exp"),
+    [
+        (2, None, "substitution", ["casa", "cama", "cara"]),
+        (None, 0, "substitution", ["casas", "sol"]),
+        (2, None, "levenshtein", ["casa", "cama", "cara"]),
+    ],
+)
+@pytest.mark.parametrize("compact", [False, True])
+def test_select_words_of_neighbors(
+    min_neighbors: Optional[int],
+    max_neighbors: Optional[int],
+    neighborhood: str,
+    exp: List[str],
+    compact: bool,
+) -> None:
+    """Test selecting words by their number of orthographic neighbors."""
+
+    word_pool = WordPool(["casa", "cama", "cara/S", "casas", "sol"], compact=compact)
+    word_pool.select_words_of_neighbors(min_neighbors, max_neighbors, neighborhood)
+
+    assert word_pool.words.tolist() == exp
+
+
+def test_neighbors_are_counted_in_base_pool() -> None:
+    """Test that neighbors are counted among all the words, once per pool."""
+
+    word_pool = WordPool(["casa", "cama", "cara", "casas", "sol"])
+    word_pool.select_words_of_length(max_len=4)
+    word_pool.select_words_of_neighbors(min_neighbors=1)
+    word_pool.select_words_of_neighbors(max_neighbors=2)
+
+    assert word_pool.words.tolist() == ["casa", "cama", "cara"]
+    assert word_pool.neighbors("levenshtein").tolist() == [3, 2, 2]
+    assert list(word_pool._neighbors) == ["substitution", "levenshtein"]
+
+
+@pytest.mark.parametrize(
+    ("kwargs"),
+    [{}, {"min_neighbors": 1, "neighborhood": "hamming"}],
+)
+def test_select_words_of_neighbors_exception(kwargs: Dict[str, Any]) -> None:
+    """Test that missing limits or invalid neighborhoods raise a ValueError."""
+
+    word_pool = WordPool(["casa"])
+
+    with pytest.raises(ValueError):
+        word_pool.select_words_of_neighbors(**kwargs)
+
+
+@pytest.mark.parametrize("lazy", [True, False])
+def test_default_pool_neighbors_use_index(lazy: bool) -> None:
+    """Test that neighbors of the default pool are answered from its index."""
+
+    word_pool = WordPool(lazy=lazy)
+    word_pool_scanned = WordPool(word_pool.words.tolist())
+    for pool in (word_pool, word_pool_scanned):
+        pool.select_words_of_length(5, 5)
+        pool.select_words_of_neighbors(min_neighbors=8, neighborhood="levenshtein")
+
+    assert word_pool.words.tolist() == word_pool_scanned.words.tolist()
+    assert word_pool.neighbors().tolist() == word_pool_scanned.neighbors().tolist()
+    assert word_pool_scanned._neighbors
+    assert not word_pool._neighbors
+
+
+@pytest.mark.parametrize(
+    ("targets", "min_distance", "exp"),
+    [
+        (["Casa"], 2, ["perro", "sol"]),
+        (["casa"], 1, ["cama", "casas", "perro", "sol"]),
+        (["casa", "sal"], 2, ["perro"]),
+    ],
+)
+@pytest.mark.parametrize("lazy", [False, True])
+def test_select_words_dissimilar_to(
+    targets: List[str], min_distance: int, exp: List[str], lazy: bool
+) -> None:
+    """Test selecting words that are not confusable with the targets."""
+
+    word_pool = WordPool(["casa", "cama", "casas", "perro", "sol"], lazy=lazy)
+    word_pool.select_words_dissimilar_to(targets, min_distance)
+
+    assert word_pool.words.tolist() == exp
+
+
+def test_select_words_dissimilar_to_exception() -> None:
+    """Test that min_distance has to be at least 1."""
+
+    word_pool = WordPool(["casa"])
+
+    with pytest.raises(ValueError):
+        word_pool.select_words_dissimilar_to(["casa"], min_distance=0)
+
+
+@pytest.mark.parametrize("reproducible", [True, False])
+def test_sample_dissimilar_pool(reproducible: bool) -> None:
+    """Test that the sampled words are far enough from each other."""
+
+    words = ["casa", "cama", "cara", "casas", "perro", "gato", "pato", "sol"]
+    word_pool = WordPool(words)
+    word_pool.sample_dissimilar_pool(3, min_distance=2, reproducible=reproducible)
+    sample = word_pool.words.tolist()
+
+    assert len(sample) == 3
+    assert all(
+        levenshtein(word, other) >= 2
+        for i, word in enumerate(sample)
+        for other in sample[i + 1 :]
+    )
+
+
+def test_sample_dissimilar_pool_is_reproducible() -> None:
+    """Test that the dissimilar sample is reproducible."""
+
+    samples = []
+    for _ in range(2):
+        word_pool = WordPool(lazy=True)
+        word_pool.select_words_of_length(5, 5)
+        word_pool.sample_dissimilar_pool(10, min_distance=3)
+        samples.append(word_pool.words.tolist())
+
+    assert samples[0] == samples[1]
+
+
+@pytest.mark.parametrize(("n", "min_distance"), [(4, 2), (1, 0)])
+def test_sample_dissimilar_pool_exception(n: int, min_distance: int) -> None:
+    """Test that impossible samples raise a ValueError and keep the pool."""
+
+    word_pool = WordPool(["casa", "cama", "cara", "perro"])
+
+    with pytest.raises(ValueError):
+        word_pool.sample_dissimilar_pool(n, min_distance)
+    assert len(word_pool.words) == 4
+
+
+def test_sample_pool_seed() -> None:
+    """Test the seed of sample_pool and that non-reproducible samples differ."""
+
+    words = [f"palabra{i}" for i in range(1000)]
+    samples = []
+    for kwargs in ({}, {"seed": 1}, {"seed": 2}, {"reproducible": False}):
+        word_pool = WordPool(words)
+        word_pool.sample_pool(n=10, **kwargs)
+        samples.append(word_pool.words.tolist())
+
+    assert samples[0] == samples[1]
+    assert samples[0] != samples[2]
+    assert samples[0] != samples[3]
+
+
+@pytest.mark.parametrize("overlap", [True, False])
+def test_draw_samples(overlap: bool) -> None:
+    """Test drawing many samples at once without changing the pool."""
+
+    word_pool = WordPool(
+        pd.Series(["gato", "perro", "sol", "ratón"], index=[5, 6, 7, 8])
+    )
+    samples = word_pool.draw_samples(2, n_samples=2, overlap=overlap, seed=3)
+    words = word_pool.words
+
+    assert len(words) == 4
+    assert [len(sample) for sample in samples] == [2, 2]
+    for sample in samples:
+        assert sample.tolist() == words[sample.index].tolist()
+    if overlap:
+        word_pool.sample_pool(2, seed=3)
+        assert word_pool.words.tolist() == samples[0].tolist()
+    else:
+        assert set(samples[0]).isdisjoint(samples[1])
+
+
+@pytest.mark.parametrize(
+    ("n", "kwargs", "exp"),
+    [
+        (5, {"by": ["length"]}, {3: 2, 4: 2, 7: 1}),
+        (2, {"by": ["length"], "allocation": "fixed"}, {3: 2, 4: 2, 7: 2}),
+        (5, {"by": ["length"], "bins": {"length": [4]}}, {3: 2, 4: 3}),
+    ],
+)
+def test_sample_stratified(n: int, kwargs: Dict[str, Any], exp: Dict[int, int]) -> None:
+    """Test that each stratum gets its quota of words."""
+
+    words = ["sol", "mar", "sal", "pan", "gato", "casa", "mesa", "pato"]
+    word_pool = WordPool(words + ["palmera", "ventana"])
+    word_pool.sample_stratified(n, **kwargs)
+
+    # length of the words, or the lowest length of their bin
+    lengths = word_pool.words.str.len().clip(upper=max(exp))
+
+    assert lengths.value_counts().to_dict() == exp
+
+
+def test_sample_stratified_accented() -> None:
+    """Test balancing accented and plain words, reproducibly."""
+
+    words = ["ratón", "camión", "árbol", "sol", "mar", "gato", "casa", "pan"]
+    samples = []
+    for _ in range(2):
+        word_pool = WordPool(words)
+        word_pool.sample_stratified(2, by=["accented"], allocation="fixed")
+        samples.append(word_pool.words.tolist())
+
+    assert samples[0] == samples[1]
+    assert sum(word in ("ratón", "camión", "árbol") for word in samples[0]) == 2
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_sample_stratified_default_pool(lazy: bool) -> None:
+    """Test that the default pool strata match computing the features."""
+
+    word_pool = WordPool(lazy=lazy)
+    word_pool_scanned = WordPool(word_pool.words.tolist())
+    for pool in (word_pool, word_pool_scanned):
+        pool.select_words_of_length(4, 8)
+        pool.sample_stratified(
+            500, by=["syllables", "accented"], bins={"syllables": [2, 3]}, seed=4
+        )
+
+    assert word_pool.words.tolist() == word_pool_scanned.words.tolist()
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"n": 1, "by": []},
+        {"n": 1, "by": ["vowels"]},
+        {"n": 3, "by": ["length"], "allocation": "fixed"},
+        {"n": 1, "by": ["length"], "allocation": "random"},
+    ],
+)
+def test_sample_stratified_exception(kwargs: Dict[str, Any]) -> None:
+    """Test that invalid strata or allocations raise a ValueError."""
+
+    word_pool = WordPool(["sol", "mar", "gato"])
+
+    with pytest.raises(ValueError):
+        word_pool.sample_stratified(**kwargs)
+
+
+def test_match_lists() -> None:
+    """Test that the pool is split into lists with the same mean length."""
+
+    words = ["sol", "mar", "sal", "pan", "gato", "casa", "palmera", "ventana"]
+    word_pool = WordPool(words)
+
+    matched = word_pool.match_lists(2, by=["length"], time_budget=5)
+
+    assert word_pool.words.tolist() == words
+    assert sorted(word for words in matched.lists for word in words) == sorted(words)
+    assert [words.str.len().mean() for words in matched.lists] == [4.25, 4.25]
+    assert matched.balance["length_mean"].tolist() == [4.25, 4.25]
+    assert matched.max_difference == {"length": 0}
+
+
+def test_match_lists_covariates() -> None:
+    """Test matching features given by the user (e.g., frequencies)."""
+
+    words = ["sol", "mar", "sal", "gato", "casa", "mesa"]
+    frequencies = [1, 5, 3, 3, 2, 4]
+    word_pool = WordPool(words)
+
+    matched = word_pool.match_lists(
+        3, by=[], covariates={"frequency": frequencies}, time_budget=5
+    )
+
+    assert [len(words) for words in matched.lists] == [2, 2, 2]
+    assert list(matched.balance.columns) == ["frequency_mean", "frequency_std"]
+    assert matched.max_difference["frequency"] == 0
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"k": 2, "by": []},
+        {"k": 2, "by": ["vowels"]},
+        {"k": 2, "covariates": {"frequency": [1, 2]}},
+        {"k": 2, "n": 3},
+    ],
+)
+def test_match_lists_exception(kwargs: Dict[str, Any]) -> None:
+    """Test that invalid features or list sizes raise a ValueError."""
+
+    word_pool = WordPool(["sol", "mar", "gato"])
+
+    with pytest.raises(ValueError):
+        word_pool.match_lists(**kwargs)
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_cache(lazy: bool, tmp_path: Path) -> None:
+    """Test that rebuilding the same subpool reads the results of the cache."""
+
+    words = ["sol", "gato", "canción", "periódico", "árbol", "mesa"]
+    subpools = []
+    for _ in range(2):
+        cache = ResultCache(tmp_path)
+        word_pool = WordPool(words, lazy=lazy, cache=cache)
+        word_pool.select_words_of_length(max_len=5)
+        word_pool.select_words_without_accented_characters()
+        subpools.append(word_pool.words.tolist())
+
+    assert subpools == [["sol", "gato", "mesa"]] * 2
+    assert cache.misses == 0
+    assert cache.hits == (1 if lazy else 2)
+
+
+@pytest.mark.parametrize(
+    "pool, clean_conjugation_suffix, selections",
+    [
+        (["sol", "gato", "mar", "pan"], True, [{"max_len": 3}]),
+        (["sol", "gato", "mar"], False, [{"max_len": 3}]),
+        (["sol", "gato", "mar"], True, [{"max_len": 4}]),
+        (["sol", "gato", "mar"], True, [{"min_len": 4}, {"max_len": 3}]),
+    ],
+)
+def test_cache_miss(
+    pool: List[str],
+    clean_conjugation_suffix: bool,
+    selections: List[Dict[str, int]],
+    tmp_path: Path,
+) -> None:
+    """Test that other pools or chains of selections don't read the result."""
+
+    word_pool = WordPool(["sol", "gato", "mar"], cache=ResultCache(tmp_path))
+    word_pool.select_words_of_length(max_len=3)
+
+    cache = ResultCache(tmp_path)
+    word_pool = WordPool(pool, clean_conjugation_suffix, cache=cache)
+    for kwargs in selections:
+        word_pool.select_words_of_length(**kwargs)
+
+    assert cache.hits == 0
+    assert cache.misses == len(selections)
+
+
+def test_cache_default_pool(tmp_path: Path) -> None:
+    """Test that compact and regular default pools share cached results."""
+
+    cache = ResultCache(tmp_path)
+    word_pool = WordPool(cache=cache)
+    word_pool.select_words_of_length(4, 6)
+    word_pool.select_words_matching("^ca")
+    word_pool_compact = WordPool(compact=True, cache=cache)
+    word_pool_compact.select_words_of_length(4, 6)
+    word_pool_compact.select_words_matching("^ca")
+
+    assert word_pool_compact.words.tolist() == word_pool.words.tolist()
+    assert cache.hits == 2
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("clean_conjugation_suffix", [True, False])
+def test_add_words(compact: bool, clean_conjugation_suffix: bool) -> None:
+    """Test that adding words matches creating the pool with them."""
+
+    pool = ["casa", "cama", "gato/S", "sol"]
+    words_added = ["  Rato", "mesa/G", "casa"]
+    word_pool = WordPool(pool, clean_conjugation_suffix, compact=compact)
+    word_pool.neighbors()
+    word_pool.select_words_dissimilar_to(["perro"], 1)
+    word_pool_fork = word_pool.fork()
+    word_pool.add_words(words_added)
+    word_pool_exp = WordPool(pool + words_added, clean_conjugation_suffix)
+
+    assert word_pool.words.tolist() == word_pool_exp.words.tolist()
+    assert word_pool.words.index.tolist() == word_pool_exp.words.index.tolist()
+    assert word_pool.neighbors().tolist() == word_pool_exp.neighbors().tolist()
+    assert word_pool._pool_original.tolist() == word_pool_exp._pool_original.tolist()
+    assert word_pool_fork.words.tolist() == word_pool_exp.words.tolist()[:4]
+    assert word_pool_fork.neighbors().tolist()[:2] == [1, 1]
+
+    word_pool.select_words_dissimilar_to(["cosa"], 2)
+    word_pool_exp.select_words_dissimilar_to(["cosa"], 2)
+
+    assert word_pool.words.tolist() == word_pool_exp.words.tolist()
+
+
+def test_add_words_selections() -> None:
+    """Test that added words are selected, but applied selections are kept."""
+
+    word_pool = WordPool(pd.Series(["sol", "gato", "mar"], index=[5, 7, 9]))
+    word_pool.select_words_of_length(max_len=3)
+    word_pool.add_words(["perro", "luz"])
+
+    assert word_pool.words.to_dict() == {5: "sol", 9: "mar", 10: "perro", 11: "luz"}
+
+    word_pool.undo()
+
+    assert word_pool.words.tolist() == ["sol", "gato", "mar", "perro", "luz"]
+
+    word_pool.select_words_of_length(max_len=3)
+    word_pool.add_words(pd.Series(["casa"], index=["nueva"]))
+
+    assert word_pool.words.index.tolist() == [5, 9, 11, "nueva"]
+
+
+def test_add_words_lazy(tmp_path: Path) -> None:
+    """Test that pending selections are applied to the added words."""
+
+    cache = ResultCache(tmp_path)
+    word_pool = WordPool(["sol", "gato", "mar"], lazy=True, cache=cache)
+    word_pool.select_words_of_length(max_len=3)
+    word_pool.add_words(["perro", "luz"])
+
+    assert word_pool.words.tolist() == ["sol", "mar", "luz"]
+
+    word_pool = WordPool(["sol", "gato", "mar"], cache=cache)
+    word_pool.add_words(["perro", "luz"])
+    word_pool.select_words_of_length(max_len=3)
+
+    assert word_pool.words.tolist() == ["sol", "mar", "luz"]
+    assert cache.hits == 1
+
+
+def test_remove_words() -> None:
+    """Test that removed words are removed from the pool and its selections."""
+
+    word_pool = WordPool(["casa", "cama", "gato/S", "masa", "gato", "sol"])
+    word_pool.neighbors()
+    word_pool.select_words_of_length(min_len=4)
+    word_pool_fork = word_pool.fork()
+    word_pool.remove_words(["  CAMA", "gato/G", "luz"])
+
+    assert word_pool.words.to_dict() == {0: "casa", 3: "masa"}
+    assert word_pool.neighbors().tolist() == [1, 1]
+
+    word_pool.undo()
+
+    assert word_pool.words.tolist() == ["casa", "masa", "sol"]
+    assert word_pool_fork.words.tolist() == ["casa", "cama", "gato", "masa", "gato"]
+
+    word_pool.add_words(["cama"])
+
+    assert word_pool.words.to_dict() == {0: "casa", 3: "masa", 5: "sol", 6: "cama"}
+
+
+def test_add_remove_words_default_pool() -> None:
+    """Test that the indexes of the default pool are updated."""
+
+    word_pool = WordPool()
+    n_words = len(word_pool.words)
+    word_pool.add_words(["zzgato/S", "zzzq", "casa"])
+    word_pool.remove_words(["perro", "zzzq"])
+    words = word_pool.words.tolist()
+    features = FeatureIndex.from_words(words)
+
+    assert len(words) == n_words + 2 - WordPool().words.eq("perro").sum()
+    assert word_pool._features.flags("affix:S")[-2:].tolist() == [True, False]
+    for name in features.numeric:
+        assert (
+            word_pool._features.numeric[name].tolist()
+            == features.numeric[name].tolist()
+        )
+        assert (
+            word_pool._features.orders[name].tolist() == features.orders[name].tolist()
+        )
+
+    word_pool.select_words_starting_with("zz")
+
+    assert word_pool.words.tolist() == ["zzgato"]
+
+
+def test_add_words_remove_duplicates() -> None:
+    """Test that words already in a deduplicated pool are only counted."""
+
+    word_pool = WordPool.from_iterable(
+        ["ana", "sol", "ana", "mar"],
+        remove_duplicates=True,
+        provenance=["count", "first"],
+    )
+    word_pool.add_words(["sol/S", "luz"])
+
+    assert word_pool.words.to_dict() == {0: "ana", 1: "sol", 3: "mar", 4: "luz"}
+    assert word_pool.provenance["count"].tolist() == [2, 2, 1, 1]
+
+    word_pool.remove_words(["sol"])
+    word_pool.add_words(["sol"])
+
+    assert word_pool.words.tolist() == ["ana", "mar", "luz", "sol"]
+    assert word_pool.provenance["first"].tolist() == ["ana", "mar", "luz", "sol"]